@@ -3,7 +3,7 @@
 Handles logging and querying of user actions and unsubscribe attempts.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from .base_repository import BaseRepository
 
 
@@ -35,6 +35,29 @@ class ActionHistoryRepository(BaseRepository):
         self._execute_query(sql, (sender_email, action_type, 1 if success else 0, details))
         self.logger.debug(f"Logged action: {action_type} for {sender_email}")
     
+    def log_actions_bulk(self, rows: List[Tuple[str, str, bool, str]]) -> None:
+        """Log many actions in a single transaction.
+        
+        Args:
+            rows: (sender_email, action_type, success, details) tuples, as
+                for log_action
+                
+        Example:
+            >>> repo.log_actions_bulk([('a@x.com', 'delete', True, 'Deleted 3 emails')])
+        """
+        if not rows:
+            return
+        sql = """
+            INSERT INTO action_history 
+            (sender_email, action_type, success, details)
+            VALUES (?, ?, ?, ?)
+        """
+        self._execute_many(sql, [
+            (sender_email, action_type, 1 if success else 0, details)
+            for sender_email, action_type, success, details in rows
+        ])
+        self.logger.debug(f"Logged {len(rows)} actions")
+    
     def log_unsubscribe_attempt(self, sender: str, strategy: str, 
                                success: bool, message: str) -> bool:
         """Log an unsubscribe attempt with strategy information.
@@ -198,6 +221,73 @@ class ActionHistoryRepository(BaseRepository):
         
         return results
     
+    def get_top_failure_senders(self, limit: int = 10) -> List[Dict]:
+        """Get senders with the most failed unsubscribe attempts.
+        
+        Args:
+            limit: Maximum number of senders to return
+            
+        Returns:
+            List of dictionaries with keys sender_email and count,
+            ordered by most failures first
+            
+        Example:
+            >>> repo.get_top_failure_senders(limit=1)
+            [{'sender_email': 'spam@example.com', 'count': 4}]
+        """
+        sql = """
+            SELECT sender_email, COUNT(*) as count
+            FROM action_history
+            WHERE action_type = 'unsubscribe' AND success = 0
+            GROUP BY sender_email
+            ORDER BY count DESC
+            LIMIT ?
+        """
+        rows = self._fetch_all(sql, (limit,))
+        
+        return [{'sender_email': row[0], 'count': row[1]} for row in rows]
+    
+    def get_failure_reasons_for(self, senders: List[str], per_sender: int = 3) -> Dict[str, List[str]]:
+        """Get the most recent failure details for each of the given senders.
+        
+        Args:
+            senders: Sender email addresses to query
+            per_sender: Maximum number of details per sender
+            
+        Returns:
+            Dictionary mapping each sender with failures to its details,
+            most recent first (empty details are skipped)
+            
+        Example:
+            >>> repo.get_failure_reasons_for(['spam@example.com'])
+            {'spam@example.com': ['Strategy: HTTP - Network timeout']}
+        """
+        if not senders:
+            return {}
+        
+        placeholders = ','.join('?' * len(senders))
+        sql = f"""
+            SELECT sender_email, details
+            FROM (
+                SELECT sender_email, details,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY sender_email ORDER BY timestamp DESC, id DESC
+                       ) as rank
+                FROM action_history
+                WHERE action_type = 'unsubscribe' AND success = 0
+                  AND details IS NOT NULL AND details != ''
+                  AND sender_email IN ({placeholders})
+            )
+            WHERE rank <= ?
+            ORDER BY sender_email, rank
+        """
+        rows = self._fetch_all(sql, (*senders, per_sender))
+        
+        reasons: Dict[str, List[str]] = {}
+        for sender, details in rows:
+            reasons.setdefault(sender, []).append(details)
+        return reasons
+    
     def get_actions_for_sender(self, email: str) -> List[Dict]:
         """Get all actions for a specific sender.
         
@@ -18,6 +18,10 @@ class BaseRepository:
     All methods use parameterized queries to prevent SQL injection.
     """
     
+    # Values per IN (...) lookup; SQLite's default limit on host parameters
+    # per statement is 999
+    LOOKUP_CHUNK_SIZE = 900
+    
     def __init__(self, db_path: str):
         """Initialize the repository with database path.
         
@@ -44,6 +48,9 @@ class BaseRepository:
             sqlite3.Error: If database operation fails
         """
         conn = sqlite3.connect(self.db_path)
+        # synchronous is per connection; NORMAL is safe under WAL and
+        # avoids an fsync on every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
         try:
             yield conn
             conn.commit()
@@ -7,7 +7,7 @@ appropriate repository classes.
 
 import sqlite3
 from contextlib import contextmanager
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Set, Tuple
 import logging
 
 from .whitelist_repository import WhitelistRepository
@@ -15,13 +15,15 @@ from .account_repository import AccountRepository
 from .action_history_repository import ActionHistoryRepository
 from .unwanted_senders_repository import UnwantedSendersRepository
 from .config_repository import ConfigRepository
+from .header_cache_repository import HeaderCacheRepository
 
 
 class DBManager:
     """Facade over repository classes for database operations.
     
     Maintains backward compatibility while delegating operations to specialized repositories.
-    Direct repository access available via properties: whitelist, accounts, history, unwanted, config
+    Direct repository access available via properties: whitelist, accounts, history, unwanted,
+    config, header_cache
     """
     
     def __init__(self, db_path: str):
@@ -39,6 +41,7 @@ class DBManager:
         self._history_repo = ActionHistoryRepository(db_path)
         self._unwanted_repo = UnwantedSendersRepository(db_path)
         self._config_repo = ConfigRepository(db_path)
+        self._header_cache_repo = HeaderCacheRepository(db_path)
     
     # Property access to repositories for direct use
     @property
@@ -66,6 +69,11 @@ class DBManager:
         """Direct access to ConfigRepository."""
         return self._config_repo
     
+    @property
+    def header_cache(self) -> HeaderCacheRepository:
+        """Direct access to HeaderCacheRepository."""
+        return self._header_cache_repo
+    
     def initialize_db(self, schema_path: str):
         """Initialize database from schema file.
         
@@ -79,6 +87,9 @@ class DBManager:
             with open(schema_path, 'r') as f:
                 schema = f.read()
             with self.get_connection() as conn:
+                # WAL lets readers proceed while a writer holds the lock;
+                # the mode is persistent, so setting it once here suffices
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.executescript(schema)
             self.logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
@@ -95,6 +106,8 @@ class DBManager:
             sqlite3.Connection: Database connection
         """
         conn = sqlite3.connect(self.db_path)
+        # Safe under WAL and avoids an fsync on every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
         try:
             yield conn
             conn.commit()
@@ -114,6 +127,10 @@ class DBManager:
         """Check if email is whitelisted. Delegates to WhitelistRepository."""
         return self._whitelist_repo.check_whitelist(email)
     
+    def get_whitelist_set(self, emails: List[str]) -> Set[str]:
+        """Get whitelisted emails among many. Delegates to WhitelistRepository."""
+        return self._whitelist_repo.get_whitelist_set(emails)
+    
     def remove_from_whitelist(self, entry: str) -> bool:
         """Remove entry from whitelist. Delegates to WhitelistRepository."""
         return self._whitelist_repo.remove_from_whitelist(entry)
@@ -148,6 +165,10 @@ class DBManager:
         """Log action. Delegates to ActionHistoryRepository."""
         self._history_repo.log_action(sender_email, action_type, success, details)
     
+    def log_actions_bulk(self, rows: List[Tuple[str, str, bool, str]]):
+        """Log many actions in one transaction. Delegates to ActionHistoryRepository."""
+        self._history_repo.log_actions_bulk(rows)
+    
     def log_unsubscribe_attempt(self, sender: str, strategy: str, success: bool, message: str) -> bool:
         """Log unsubscribe attempt. Delegates to ActionHistoryRepository."""
         return self._history_repo.log_unsubscribe_attempt(sender, strategy, success, message)
@@ -164,6 +185,14 @@ class DBManager:
         """Get failure reasons. Delegates to ActionHistoryRepository."""
         return self._history_repo.get_failure_reasons()
     
+    def get_top_failure_senders(self, limit: int = 10) -> List[Dict]:
+        """Get top failing senders. Delegates to ActionHistoryRepository."""
+        return self._history_repo.get_top_failure_senders(limit)
+    
+    def get_failure_reasons_for(self, senders: List[str], per_sender: int = 3) -> Dict[str, List[str]]:
+        """Get recent failure details per sender. Delegates to ActionHistoryRepository."""
+        return self._history_repo.get_failure_reasons_for(senders, per_sender)
+    
     # Unwanted Senders methods - delegate to UnwantedSendersRepository
     def add_unwanted_sender(self, email: str, reason: str, failed_unsubscribe: bool = False):
         """Add unwanted sender. Delegates to UnwantedSendersRepository."""
@@ -173,6 +202,10 @@ class DBManager:
         """Check if sender is unwanted. Delegates to UnwantedSendersRepository."""
         return self._unwanted_repo.check_unwanted(email)
     
+    def get_unwanted_set(self, emails: List[str]) -> Set[str]:
+        """Get unwanted emails among many. Delegates to UnwantedSendersRepository."""
+        return self._unwanted_repo.get_unwanted_set(emails)
+    
     def add_to_must_delete(self, sender: str, reason: str):
         """Add to must-delete list. Delegates to UnwantedSendersRepository."""
         self._unwanted_repo.add_to_must_delete(sender, reason)
@@ -0,0 +1,102 @@
+"""Repository for cached IMAP message headers.
+
+Stores decoded From/Subject/Date per message UID so repeated scans only
+download headers for messages that arrived since the last one.
+"""
+
+from typing import Dict, List, Tuple
+from .base_repository import BaseRepository
+
+
+class HeaderCacheRepository(BaseRepository):
+    """Repository for the per-account IMAP header cache.
+
+    Rows are keyed by (account, uid) and tagged with the mailbox
+    UIDVALIDITY they were fetched under; a UIDVALIDITY change means the
+    server renumbered the mailbox, so every row for the account is dropped.
+    """
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with database path.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        # UIDVALIDITY each account's rows were last purged against
+        self._uidvalidity: Dict[str, int] = {}
+
+    def get_headers(self, account: str, uidvalidity: int,
+                    uids: List[int]) -> Dict[int, Tuple[str, str, str]]:
+        """Get cached headers for the given UIDs.
+
+        Args:
+            account: Email address of the mailbox owner
+            uidvalidity: Current UIDVALIDITY of the mailbox
+            uids: Message UIDs to look up
+
+        Returns:
+            Dictionary mapping UID to (from, subject, date) for cache hits
+
+        Example:
+            >>> repo.get_headers('me@gmail.com', 7, [101, 102])
+            {101: ('News <news@example.com>', 'Weekly deals', 'Mon, 1 Jan 2024 ...')}
+        """
+        if self._uidvalidity.get(account) != uidvalidity:
+            self._purge_stale(account, uidvalidity)
+            self._uidvalidity[account] = uidvalidity
+
+        headers = {}
+        for start in range(0, len(uids), self.LOOKUP_CHUNK_SIZE):
+            chunk = uids[start:start + self.LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"""
+                SELECT uid, sender, subject, date
+                FROM header_cache
+                WHERE account = ? AND uid IN ({placeholders})
+            """
+            for uid, sender, subject, date in self._fetch_all(sql, (account, *chunk)):
+                headers[uid] = (sender, subject, date)
+        return headers
+
+    def store_headers(self, account: str, uidvalidity: int,
+                      rows: List[Tuple[int, str, str, str]]) -> None:
+        """Cache decoded headers.
+
+        Args:
+            account: Email address of the mailbox owner
+            uidvalidity: UIDVALIDITY the UIDs belong to
+            rows: (uid, from, subject, date) tuples
+        """
+        if not rows:
+            return
+        sql = """
+            INSERT OR REPLACE INTO header_cache
+            (account, uid, uidvalidity, sender, subject, date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        self._execute_many(sql, [(account, uid, uidvalidity, *fields) for uid, *fields in rows])
+        self.logger.debug(f"Cached {len(rows)} headers for {account}")
+
+    def delete_headers(self, account: str, uids: List[int]) -> None:
+        """Remove cached headers, e.g. after the messages are expunged.
+
+        Args:
+            account: Email address of the mailbox owner
+            uids: Message UIDs to remove
+        """
+        sql = "DELETE FROM header_cache WHERE account = ? AND uid = ?"
+        self._execute_many(sql, [(account, uid) for uid in uids])
+
+    def clear(self, account: str) -> None:
+        """Remove every cached header for an account.
+
+        Args:
+            account: Email address of the mailbox owner
+        """
+        self._execute_query("DELETE FROM header_cache WHERE account = ?", (account,))
+
+    def _purge_stale(self, account: str, uidvalidity: int) -> None:
+        """Drop rows cached under a previous UIDVALIDITY."""
+        sql = "DELETE FROM header_cache WHERE account = ? AND uidvalidity != ?"
+        self._execute_query(sql, (account, uidvalidity))
@@ -63,6 +63,18 @@ CREATE TABLE IF NOT EXISTS oauth_tokens (
     updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Table 7: Header Cache
+-- Decoded IMAP headers per message UID, so rescans only fetch new messages
+CREATE TABLE IF NOT EXISTS header_cache (
+    account TEXT NOT NULL,
+    uid INTEGER NOT NULL,
+    uidvalidity INTEGER NOT NULL,
+    sender TEXT,
+    subject TEXT,
+    date TEXT,
+    PRIMARY KEY (account, uid)
+);
+
 -- Performance Indexes
 -- Optimize query performance for common lookup patterns
 
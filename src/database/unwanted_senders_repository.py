@@ -3,7 +3,7 @@
 Handles tracking of unwanted senders and must-delete list for failed unsubscribes.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Set
 from .base_repository import BaseRepository
 
 
@@ -149,4 +149,26 @@ class UnwantedSendersRepository(BaseRepository):
         """
         result = self._fetch_one(sql, (email,))
         return result is not None
+    
+    def get_unwanted_set(self, emails: List[str]) -> Set[str]:
+        """Check many emails against the unwanted senders list at once.
+        
+        Args:
+            emails: Email addresses to check
+            
+        Returns:
+            Set of the given emails that are in the unwanted list
+            
+        Example:
+            >>> repo.get_unwanted_set(['spam@example.com', 'friend@example.com'])
+            {'spam@example.com'}
+        """
+        emails = list(set(emails))
+        unwanted = set()
+        for start in range(0, len(emails), self.LOOKUP_CHUNK_SIZE):
+            chunk = emails[start:start + self.LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"SELECT email FROM unwanted_senders WHERE email IN ({placeholders})"
+            unwanted.update(row[0] for row in self._fetch_all(sql, tuple(chunk)))
+        return unwanted
 
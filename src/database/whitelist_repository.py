@@ -3,7 +3,7 @@
 Handles CRUD operations for whitelisted emails and domains.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Set
 from .base_repository import BaseRepository
 
 
@@ -78,6 +78,39 @@ class WhitelistRepository(BaseRepository):
         result = self._fetch_one(sql, (email, email))
         return result is not None
     
+    def get_whitelist_set(self, emails: List[str]) -> Set[str]:
+        """Check many emails against the whitelist at once.
+        
+        Same matching as check_whitelist, with exact matches looked up in
+        chunked IN queries and domain patterns loaded once.
+        
+        Args:
+            emails: Email addresses to check
+            
+        Returns:
+            Set of the given emails that are whitelisted
+            
+        Example:
+            >>> repo.get_whitelist_set(['ceo@company.com', 'news@shop.com'])
+            {'ceo@company.com'}
+        """
+        emails = list(set(emails))
+        whitelisted = set()
+        for start in range(0, len(emails), self.LOOKUP_CHUNK_SIZE):
+            chunk = emails[start:start + self.LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"SELECT email FROM whitelist WHERE email IN ({placeholders})"
+            whitelisted.update(row[0] for row in self._fetch_all(sql, tuple(chunk)))
+        
+        # LIKE '%' || domain is a case-insensitive suffix match
+        domains = tuple(
+            row[0].lower() for row in
+            self._fetch_all("SELECT domain FROM whitelist WHERE domain IS NOT NULL")
+        )
+        if domains:
+            whitelisted.update(email for email in emails if email.lower().endswith(domains))
+        return whitelisted
+    
     def remove_from_whitelist(self, entry: str) -> bool:
         """Remove an entry from the whitelist.
         
@@ -8,17 +8,19 @@ import logging
 from typing import Union
 from .gmail_api_client import GmailAPIClient
 from .imap_client import IMAPClient
+from .imap_connection import detect_provider
 from .auth import AuthStrategyFactory
 
 
 def create_email_client(account: dict, auth_factory: AuthStrategyFactory, 
-                       oauth_manager) -> Union[GmailAPIClient, IMAPClient]:
+                       oauth_manager, header_cache=None) -> Union[GmailAPIClient, IMAPClient]:
     """Create appropriate email client based on account provider.
 
     Args:
         account: Account dictionary with 'email', 'provider', 'encrypted_password', etc.
         auth_factory: Authentication strategy factory
         oauth_manager: OAuth credential manager
+        header_cache: Optional HeaderCacheRepository for IMAP clients
 
     Returns:
         GmailAPIClient for Gmail accounts, IMAPClient for others
@@ -29,23 +31,17 @@ def create_email_client(account: dict, auth_factory: AuthStrategyFactory,
     logger = logging.getLogger(__name__)
     
     email = account.get('email')
-    provider = account.get('provider', '').lower()
-    encrypted_password = account.get('encrypted_password')
-    
     if not email:
         raise ValueError("Account email is required")
     
+    provider = (account.get('provider') or '').lower()
+    encrypted_password = account.get('encrypted_password')
+    
     # Detect provider from email if not specified
     if not provider:
-        email_lower = email.lower()
-        if email_lower.endswith(('@gmail.com', '@googlemail.com')):
-            provider = 'gmail'
-        elif email_lower.endswith(('@outlook.com', '@hotmail.com', '@live.com')):
-            provider = 'outlook'
-        elif email_lower.endswith('@yahoo.com'):
-            provider = 'yahoo'
-        else:
-            provider = 'generic'
+        provider = detect_provider(email)
+        if provider is None:
+            provider = 'yahoo' if email.lower().endswith('@yahoo.com') else 'generic'
     
     logger.debug(f"Creating email client for {email} (provider: {provider})")
     
@@ -61,5 +57,5 @@ def create_email_client(account: dict, auth_factory: AuthStrategyFactory,
     # Use IMAP for all other cases
     logger.info(f"Using IMAP for {email}")
     auth_strategy = auth_factory.create_strategy(email, provider, encrypted_password)
-    return IMAPClient(email, auth_strategy, provider)
+    return IMAPClient(email, auth_strategy, provider, header_cache=header_cache)
 
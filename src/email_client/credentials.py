@@ -1,19 +1,34 @@
 """Credential encryption manager for Email Unsubscriber
 
-Provides secure password encryption using Fernet symmetric encryption.
-Ensures email passwords are never stored in plaintext.
+Provides secure password encryption using AES-GCM authenticated encryption.
+Ensures email passwords are never stored in plaintext. Values written by
+older versions with Fernet are still decrypted transparently.
 """
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+import base64
+import binascii
 import os
 import logging
+from typing import List
+
+
+# Leading byte of every Fernet token; anything else is an AES-GCM token
+_FERNET_VERSION = 0x80
+_AEAD_VERSION = b'\x01'
+_NONCE_SIZE = 12
 
 
 class CredentialManager:
     """Manages encryption and decryption of email passwords.
     
-    Uses Fernet symmetric encryption from the cryptography library.
-    The encryption key is stored in a file and reused for all operations.
+    Uses AES-GCM from the cryptography library, with the AEAD key derived
+    from the stored key file via HKDF. The key file keeps the Fernet format
+    so tokens written by older versions can still be decrypted.
     """
     
     def __init__(self, key_path: str = 'data/key.key'):
@@ -26,6 +41,24 @@ class CredentialManager:
         self.logger = logging.getLogger(__name__)
         self.key = self._load_or_create_key()
         self.fernet = Fernet(self.key)
+        self.aead = AESGCM(self._derive_aead_key(self.key))
+    
+    @staticmethod
+    def _derive_aead_key(key: bytes) -> bytes:
+        """Derive the AES-256 key from the Fernet key file contents.
+        
+        Args:
+            key: Base64 Fernet key as stored in the key file
+            
+        Returns:
+            32-byte AES-GCM key
+        """
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'email-unsubscriber aes-gcm'
+        ).derive(base64.urlsafe_b64decode(key))
     
     def _load_or_create_key(self) -> bytes:
         """Load existing key or generate new one.
@@ -72,8 +105,9 @@ class CredentialManager:
             Exception: If encryption fails
         """
         try:
-            encrypted_bytes = self.fernet.encrypt(password.encode('utf-8'))
-            return encrypted_bytes.decode('utf-8')
+            nonce = os.urandom(_NONCE_SIZE)
+            ciphertext = self.aead.encrypt(nonce, password.encode('utf-8'), None)
+            return base64.urlsafe_b64encode(_AEAD_VERSION + nonce + ciphertext).decode('ascii')
         except Exception as e:
             self.logger.error(f"Error encrypting password: {e}")
             raise
@@ -88,12 +122,62 @@ class CredentialManager:
             Decrypted password as plain text
             
         Raises:
-            Exception: If decryption fails
+            InvalidToken: If the token is malformed or was not encrypted with this key
         """
         try:
-            decrypted_bytes = self.fernet.decrypt(encrypted_password.encode('utf-8'))
-            return decrypted_bytes.decode('utf-8')
-        except Exception as e:
-            self.logger.error(f"Error decrypting password: {e}")
+            return self._decrypt(encrypted_password)
+        except InvalidToken:
+            self.logger.error("Error decrypting password: invalid token")
             raise
-
+    
+    def decrypt_many(self, encrypted_passwords: List[str]) -> List[str]:
+        """Decrypt several passwords in one call.
+        
+        Callers that need multiple secrets at once (e.g. an OAuth
+        access/refresh token pair) avoid repeated per-call overhead and
+        logging.
+        
+        Args:
+            encrypted_passwords: Encrypted passwords as base64 strings
+            
+        Returns:
+            Decrypted passwords in the same order as the input
+            
+        Raises:
+            InvalidToken: If any token is malformed or was not encrypted with this key
+        """
+        decrypt = self._decrypt
+        try:
+            return [decrypt(token) for token in encrypted_passwords]
+        except InvalidToken:
+            self.logger.error("Error decrypting passwords: invalid token")
+            raise
+    
+    def _decrypt(self, token: str) -> str:
+        """Decrypt an AES-GCM token, falling back to Fernet for legacy values.
+        
+        Args:
+            token: Encrypted value as base64 string
+            
+        Returns:
+            Decrypted plain text
+            
+        Raises:
+            InvalidToken: If the token is malformed or was not encrypted with this key
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token.encode('ascii'))
+        except (binascii.Error, ValueError):
+            raise InvalidToken
+        
+        if raw[:1] == bytes([_FERNET_VERSION]):
+            return self.fernet.decrypt(token.encode('ascii')).decode('utf-8')
+        if raw[:1] != _AEAD_VERSION:
+            raise InvalidToken
+        
+        nonce = raw[1:1 + _NONCE_SIZE]
+        try:
+            plaintext = self.aead.decrypt(nonce, raw[1 + _NONCE_SIZE:], None)
+        except (InvalidTag, ValueError):
+            raise InvalidToken
+        return plaintext.decode('utf-8')
@@ -5,7 +5,8 @@ This allows polymorphic usage and easier testing with mock clients.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple, Any
+from typing import Callable, List, Dict, Tuple, Any, Optional, Union
+from .header_record import HeaderRecord
 
 
 class EmailClientInterface(ABC):
@@ -15,6 +16,14 @@ class EmailClientInterface(ABC):
     behavior across different providers (IMAP, Gmail API, etc.).
     """
     
+    # How many delete_emails_from_sender calls may run at once on one
+    # client instance; 1 means calls must not overlap
+    MAX_CONCURRENT_DELETES = 1
+    
+    # Message IDs worth passing to one fetch_headers call; clients that
+    # split a request across parallel connections raise it
+    HEADER_BATCH_SIZE = 100
+    
     @abstractmethod
     def connect(self) -> bool:
         """Connect to email server and authenticate.
@@ -54,14 +63,22 @@ class EmailClientInterface(ABC):
         pass
     
     @abstractmethod
-    def fetch_headers(self, message_ids: List[Any]) -> List[Dict]:
+    def fetch_headers(self, message_ids: List[Any],
+                      on_chunk: Optional[Callable[[int], bool]] = None
+                      ) -> List[Union[Dict, HeaderRecord]]:
         """Fetch email headers for given message IDs.
         
         Args:
             message_ids: List of message IDs to fetch
+            on_chunk: Optional callback(count) run after each server round
+                trip with the number of IDs it covered, possibly from a
+                worker thread. Returning False stops the remaining round
+                trips; headers fetched so far are still returned.
             
         Returns:
-            List of dictionaries containing email header information
+            List of header entries, one per message: HeaderRecord objects
+            (IMAP) or dictionaries in the provider's format (Gmail API);
+            EmailParser.parse_email accepts either
         """
         pass
     
@@ -11,7 +11,38 @@ from email.utils import parseaddr
 from typing import Dict, List, Union
 import logging
 import re
-from bs4 import BeautifulSoup
+import sys
+from .header_record import HeaderRecord
+
+
+# BeautifulSoup is imported on first HTML scan (see _get_beautifulsoup) so
+# header-only workflows don't pay bs4's import cost at startup.
+_BeautifulSoup = None
+
+# Keywords that mark an HTML anchor as an unsubscribe link (matched in href or text)
+_HTML_UNSUB_RE = re.compile(
+    r'unsubscribe|opt[- ]out|remove|stop receiving|cancel subscription',
+    re.IGNORECASE
+)
+
+# HTTP/HTTPS URLs or mailto: links containing unsubscribe keywords, in one pass
+_TEXT_UNSUB_RE = re.compile(
+    r'https?://[^\s<>"]+(?:unsubscribe|opt-out|optout|remove|stop)[^\s<>"]*'
+    r'|mailto:[^\s<>"]+(?:unsubscribe|opt-out|remove)[^\s<>"]*',
+    re.IGNORECASE
+)
+
+# String fields copied straight through from Gmail API message dicts
+_GMAIL_STRING_KEYS = ('sender', 'sender_name', 'subject', 'date', 'snippet', 'message_id')
+
+
+def _get_beautifulsoup():
+    """Return the BeautifulSoup class, importing bs4 on first use."""
+    global _BeautifulSoup
+    if _BeautifulSoup is None:
+        from bs4 import BeautifulSoup
+        _BeautifulSoup = BeautifulSoup
+    return _BeautifulSoup
 
 
 class EmailParser:
@@ -25,33 +56,47 @@ class EmailParser:
         """Initialize email parser."""
         self.logger = logging.getLogger(__name__)
     
-    def parse_email(self, raw_email: Union[bytes, Dict]) -> Dict:
+    def parse_email(self, raw_email: Union[bytes, Dict, HeaderRecord]) -> Dict:
         """Parse raw email data into structured format.
         
         Args:
-            raw_email: Raw email data as bytes (IMAP) or dict (Gmail API)
+            raw_email: Raw email data as bytes (IMAP), dict (Gmail API) or
+                HeaderRecord (IMAP fetch_headers)
             
         Returns:
-            Dictionary with keys: sender, subject, date, body_text, body_html
+            Dictionary with keys: sender, subject, date, body_text, body_html.
+            sender is interned: a sender repeats across many emails, so all
+            of them share one string and grouping compares by identity.
         """
         try:
             # Handle Gmail API dict format
             if isinstance(raw_email, dict):
+                get = raw_email.get
+                parsed = {key: get(key, '') for key in _GMAIL_STRING_KEYS}
+                parsed['sender'] = sys.intern(parsed['sender'])
+                parsed['body_text'] = ''  # Gmail API uses snippet initially
+                parsed['body_html'] = ''
                 # Parse List-Unsubscribe header into unsubscribe_links list
-                list_unsub_header = raw_email.get('list_unsubscribe', '')
-                unsubscribe_links = self._parse_list_unsubscribe_header(list_unsub_header)
-                
+                parsed['unsubscribe_links'] = self._parse_list_unsubscribe_header(
+                    get('list_unsubscribe', '')
+                )
+                parsed['is_unread'] = get('is_unread', False)
+                return parsed
+            
+            # Handle IMAP header records in the same shape as Gmail API dicts
+            if isinstance(raw_email, HeaderRecord):
+                name, email_addr = parseaddr(raw_email.sender)
                 return {
-                    'sender': raw_email.get('sender', ''),
-                    'sender_name': raw_email.get('sender_name', ''),
-                    'subject': raw_email.get('subject', ''),
-                    'date': raw_email.get('date', ''),
-                    'body_text': '',  # Gmail API uses snippet initially
+                    'sender': sys.intern(email_addr),
+                    'sender_name': name,
+                    'subject': raw_email.subject,
+                    'date': raw_email.date,
+                    'snippet': '',
+                    'message_id': raw_email.id,
+                    'body_text': '',
                     'body_html': '',
-                    'snippet': raw_email.get('snippet', ''),
-                    'message_id': raw_email.get('message_id', ''),
-                    'unsubscribe_links': unsubscribe_links,
-                    'is_unread': raw_email.get('is_unread', False)
+                    'unsubscribe_links': [],
+                    'is_unread': not raw_email.is_read
                 }
             
             # Handle IMAP bytes format
@@ -85,7 +130,7 @@ class EmailParser:
         """
         from_header = msg.get('From', '')
         name, email_addr = parseaddr(from_header)
-        return email_addr
+        return sys.intern(email_addr)
     
     def _extract_subject(self, msg: Message) -> str:
         """Extract and decode subject line.
@@ -129,6 +174,9 @@ class EmailParser:
                     body_text = self._decode_payload(part)
                 elif content_type == 'text/html' and not body_html:
                     body_html = self._decode_payload(part)
+                if body_text and body_html:
+                    # Remaining parts are attachments or alternatives we'd skip
+                    break
         else:
             content_type = msg.get_content_type()
             if content_type == 'text/plain':
@@ -149,12 +197,19 @@ class EmailParser:
         """
         try:
             payload = part.get_payload(decode=True)
-            if payload:
-                charset = part.get_content_charset() or 'utf-8'
-                return payload.decode(charset, errors='ignore')
         except Exception as e:
             self.logger.warning(f"Error decoding payload: {e}")
-        return ''
+            return ''
+        if not payload:
+            return ''
+        
+        # One decode with the declared charset; errors='ignore' never raises
+        # UnicodeDecodeError, so only an unknown charset name can fail
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return payload.decode(charset, errors='ignore')
+        except LookupError:
+            return payload.decode('utf-8', errors='ignore')
     
     def _decode_header_value(self, header: str) -> str:
         """Decode email header handling various encodings.
@@ -165,6 +220,10 @@ class EmailParser:
         Returns:
             Decoded header string
         """
+        # Most headers carry no RFC 2047 encoded-words and need no decoding
+        if isinstance(header, str) and '=?' not in header:
+            return header
+        
         try:
             decoded_parts = decode_header(header)
             result = []
@@ -205,8 +264,8 @@ class EmailParser:
         if email_data.get('body_text'):
             links.extend(self._extract_from_text(email_data['body_text']))
         
-        # Remove duplicates and return up to 5
-        unique_links = list(set(links))
+        # Remove duplicates (keeping header links first) and return up to 5
+        unique_links = list(dict.fromkeys(links))
         self.logger.info(f"Found {len(unique_links)} unsubscribe links")
         return unique_links[:5]
     
@@ -238,17 +297,14 @@ class EmailParser:
         """
         links = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            keywords = ['unsubscribe', 'opt-out', 'opt out', 'remove', 
-                       'stop receiving', 'cancel subscription']
+            soup = _get_beautifulsoup()(html, 'html.parser')
             
             for link in soup.find_all('a', href=True):
-                href = link['href'].lower()
-                text = link.get_text().lower()
+                href = link['href']
                 
                 # Check if keyword in URL or text
-                if any(kw in href or kw in text for kw in keywords):
-                    links.append(link['href'])
+                if _HTML_UNSUB_RE.search(href) or _HTML_UNSUB_RE.search(link.get_text()):
+                    links.append(href)
         except Exception as e:
             self.logger.warning(f"Error parsing HTML: {e}")
         return links
@@ -262,17 +318,7 @@ class EmailParser:
         Returns:
             List of unsubscribe URLs found in text
         """
-        links = []
-        
-        # HTTP/HTTPS URLs with unsubscribe keywords
-        url_pattern = r'https?://[^\s<>"]+(?:unsubscribe|opt-out|optout|remove|stop)[^\s<>"]*'
-        links.extend(re.findall(url_pattern, text, re.IGNORECASE))
-        
-        # mailto: links with unsubscribe keywords
-        mailto_pattern = r'mailto:[^\s<>"]+(?:unsubscribe|opt-out|remove)[^\s<>"]*'
-        links.extend(re.findall(mailto_pattern, text, re.IGNORECASE))
-        
-        return links
+        return _TEXT_UNSUB_RE.findall(text)
     
     def _parse_list_unsubscribe_header(self, header_value: str) -> List[str]:
         """Parse List-Unsubscribe header into list of URLs.
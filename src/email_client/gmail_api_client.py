@@ -7,9 +7,13 @@ better reliability and avoiding OAuth2 IMAP authentication issues.
 
 import logging
 import base64
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 from email.utils import parsedate_to_datetime
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -17,6 +21,66 @@ from .gmail_connection import GmailConnectionManager
 from .email_client_interface import EmailClientInterface
 
 
+def _parse_from(email_data: Dict[str, Any], value: str):
+    """Parse sender email from "Name <email@domain.com>" format."""
+    name_part, sep, rest = value.partition('<')
+    if sep and '>' in value:
+        email_data['sender'] = rest.partition('>')[0]
+        email_data['sender_name'] = name_part.strip().strip('"')
+    else:
+        email_data['sender'] = value
+        email_data['sender_name'] = value
+
+
+def _parse_subject(email_data: Dict[str, Any], value: str):
+    email_data['subject'] = value
+
+
+def _parse_date(email_data: Dict[str, Any], value: str):
+    email_data['date'] = value
+    try:
+        email_data['date_obj'] = parsedate_to_datetime(value)
+    except Exception:
+        email_data['date_obj'] = datetime.now()
+
+
+def _parse_list_unsubscribe(email_data: Dict[str, Any], value: str):
+    email_data['list_unsubscribe'] = value
+
+
+# Lowercased header name -> function storing it into the email dict
+_HEADER_PARSERS = {
+    'from': _parse_from,
+    'subject': _parse_subject,
+    'date': _parse_date,
+    'list-unsubscribe': _parse_list_unsubscribe,
+}
+
+
+# Body dict key for each MIME part type extracted from multipart messages
+_BODY_PART_KEYS = {'text/plain': 'text', 'text/html': 'html'}
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*"?([^";\s]+)', re.IGNORECASE)
+
+
+def _decode_part(part: Dict[str, Any], data: str) -> str:
+    """Decode a part's base64url body using the charset from its Content-Type."""
+    charset = 'utf-8'
+    for header in part.get('headers', ()):
+        if header.get('name', '').lower() == 'content-type':
+            match = _CHARSET_RE.search(header.get('value', ''))
+            if match:
+                charset = match.group(1)
+            break
+
+    raw = base64.urlsafe_b64decode(data)
+    try:
+        return raw.decode(charset, errors='replace')
+    except LookupError:
+        # Unknown charset label; fall back to UTF-8
+        return raw.decode('utf-8', errors='replace')
+
+
 class GmailAPIClient(EmailClientInterface):
     """Gmail API client that implements EmailClientInterface.
     
@@ -24,6 +88,24 @@ class GmailAPIClient(EmailClientInterface):
     better reliability and avoiding OAuth2 IMAP authentication issues.
     """
 
+    # Gmail accepts at most 100 calls in a single batch HTTP request
+    BATCH_SIZE = 100
+
+    # Gmail accepts at most 1000 message IDs per batchModify call
+    MODIFY_BATCH_SIZE = 1000
+
+    # Gmail returns at most 500 IDs per messages.list page
+    LIST_PAGE_SIZE = 500
+
+    # Every request runs on a per-thread Http, so sender deletions can overlap
+    MAX_CONCURRENT_DELETES = 8
+
+    # Headers requested when fetching message metadata
+    METADATA_HEADERS = ['From', 'Subject', 'Date', 'List-Unsubscribe']
+
+    # Partial-response mask: only the parts _parse_message_headers reads
+    METADATA_FIELDS = 'id,labelIds,snippet,payload/headers'
+
     def __init__(self, email: str, oauth_manager=None, connection_manager: GmailConnectionManager = None):
         """Initialize Gmail API client.
 
@@ -51,8 +133,21 @@ class GmailAPIClient(EmailClientInterface):
         self.oauth_manager = oauth_manager or (
             connection_manager.oauth_manager if connection_manager else None
         )
-        self.service = None
+        self._service = None
+        self._messages = None
         self.error_message = None
+        self._thread_local = threading.local()
+
+    @property
+    def service(self):
+        """Gmail API service object, or None if not connected."""
+        return self._service
+
+    @service.setter
+    def service(self, service):
+        # Resolve the users().messages() collection once per connection
+        self._service = service
+        self._messages = service.users().messages() if service is not None else None
 
     def connect(self) -> bool:
         """Connect to Gmail API using the connection manager.
@@ -68,9 +163,10 @@ class GmailAPIClient(EmailClientInterface):
         return success
 
     def disconnect(self):
-        """Close connection (no-op for Gmail API)."""
+        """Close connection and drop the per-thread Http objects."""
         self.connection_manager.disconnect()
         self.service = None
+        self._thread_local = threading.local()
 
     def is_connected(self) -> bool:
         """Check if connected to Gmail API."""
@@ -86,7 +182,9 @@ class GmailAPIClient(EmailClientInterface):
             return 0
 
         try:
-            profile = self.service.users().getProfile(userId='me').execute()
+            profile = self._execute(
+                self.service.users().getProfile(userId='me', fields='messagesTotal')
+            )
             return profile.get('messagesTotal', 0)
         except Exception as e:
             self.logger.error(f"Failed to get email count: {e}")
@@ -105,47 +203,108 @@ class GmailAPIClient(EmailClientInterface):
             return []
 
         try:
-            results = self.service.users().messages().list(
-                userId='me',
-                maxResults=limit
-            ).execute()
-
-            messages = results.get('messages', [])
-            return [msg['id'] for msg in messages]
+            return list(self._iter_message_ids(limit))
 
         except Exception as e:
             self.logger.error(f"Failed to fetch email IDs: {e}")
             return []
 
-    def fetch_headers(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+    def _iter_message_ids(self, limit: int, query: Optional[str] = None) -> Iterator[str]:
+        """Yield message IDs, following nextPageToken until limit is reached.
+
+        Args:
+            limit: Maximum number of IDs to yield
+            query: Optional Gmail search query
+
+        Yields:
+            Gmail message IDs
+        """
+        messages = self._messages
+        yielded = 0
+        page_token = None
+
+        while yielded < limit:
+            params = {
+                'userId': 'me',
+                'maxResults': min(self.LIST_PAGE_SIZE, limit - yielded),
+                'fields': 'messages/id,nextPageToken'
+            }
+            if query:
+                params['q'] = query
+            if page_token:
+                params['pageToken'] = page_token
+
+            results = self._execute(messages.list(**params))
+            for msg in results.get('messages', []):
+                yield msg['id']
+                yielded += 1
+                if yielded >= limit:
+                    return
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+    def fetch_headers(self, message_ids: List[str],
+                      on_chunk: Optional[Callable[[int], bool]] = None) -> List[Dict[str, Any]]:
         """Fetch email headers for given message IDs.
 
+        Requests are sent through the Gmail batch HTTP endpoint, up to
+        BATCH_SIZE message gets per round-trip.
+
         Args:
             message_ids: List of Gmail message IDs
+            on_chunk: Optional callback(count) run after each batch
+                round-trip; returning False skips the remaining batches
 
         Returns:
-            List of email dictionaries with header information
+            List of email dictionaries with header information, in the
+            same order as message_ids (failed messages are skipped)
         """
         if not self.service:
             return []
 
-        emails = []
-        for msg_id in message_ids:
-            try:
-                message = self.service.users().messages().get(
-                    userId='me',
-                    id=msg_id,
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date', 'List-Unsubscribe']
-                ).execute()
-
-                email_data = self._parse_message_headers(message)
-                if email_data:
-                    emails.append(email_data)
+        responses = {}
 
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                self.logger.warning(f"Failed to fetch message {request_id}: {exception}")
+            else:
+                responses[request_id] = response
+
+        # Batch request IDs must be unique, so fetch each message once
+        unique_ids = list(dict.fromkeys(message_ids))
+        messages = self._messages
+
+        for start in range(0, len(unique_ids), self.BATCH_SIZE):
+            batch_ids = unique_ids[start:start + self.BATCH_SIZE]
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for msg_id in batch_ids:
+                batch.add(
+                    messages.get(
+                        userId='me',
+                        id=msg_id,
+                        format='metadata',
+                        metadataHeaders=self.METADATA_HEADERS,
+                        fields=self.METADATA_FIELDS
+                    ),
+                    request_id=msg_id
+                )
+            try:
+                batch.execute(http=self._thread_http())
             except Exception as e:
-                self.logger.warning(f"Failed to fetch message {msg_id}: {e}")
+                self.logger.warning(f"Failed to fetch header batch: {e}")
+            if on_chunk is not None and not on_chunk(len(batch_ids)):
+                break
+
+        emails = []
+        for msg_id in message_ids:
+            message = responses.get(msg_id)
+            if message is None:
                 continue
+            email_data = self._parse_message_headers(message)
+            if email_data:
+                emails.append(email_data)
 
         return emails
 
@@ -153,7 +312,8 @@ class GmailAPIClient(EmailClientInterface):
         """Parse Gmail API message into email dictionary.
 
         Args:
-            message: Gmail API message object
+            message: Gmail API message object; only id, labelIds, snippet
+                and payload.headers are read (see METADATA_FIELDS)
 
         Returns:
             Email dictionary or None if parsing failed
@@ -163,28 +323,11 @@ class GmailAPIClient(EmailClientInterface):
             email_data = {'message_id': message['id']}
 
             # Extract headers
+            parsers = _HEADER_PARSERS
             for header in headers:
-                name = header['name'].lower()
-                value = header['value']
-
-                if name == 'from':
-                    # Parse sender email from "Name <email@domain.com>" format
-                    if '<' in value and '>' in value:
-                        email_data['sender'] = value.split('<')[1].split('>')[0]
-                        email_data['sender_name'] = value.split('<')[0].strip().strip('"')
-                    else:
-                        email_data['sender'] = value
-                        email_data['sender_name'] = value
-                elif name == 'subject':
-                    email_data['subject'] = value
-                elif name == 'date':
-                    email_data['date'] = value
-                    try:
-                        email_data['date_obj'] = parsedate_to_datetime(value)
-                    except:
-                        email_data['date_obj'] = datetime.now()
-                elif name == 'list-unsubscribe':
-                    email_data['list_unsubscribe'] = value
+                parse = parsers.get(header['name'].lower())
+                if parse:
+                    parse(email_data, header['value'])
 
             # Get snippet
             email_data['snippet'] = message.get('snippet', '')
@@ -212,11 +355,13 @@ class GmailAPIClient(EmailClientInterface):
             return None
 
         try:
-            message = self.service.users().messages().get(
+            request = self._messages.get(
                 userId='me',
                 id=message_id,
-                format='full'
-            ).execute()
+                format='full',
+                fields='payload'
+            )
+            message = self._execute(request)
 
             return self._extract_body(message['payload'])
 
@@ -224,33 +369,56 @@ class GmailAPIClient(EmailClientInterface):
             self.logger.error(f"Failed to get email body: {e}")
             return None
 
+    def _thread_http(self) -> Optional[AuthorizedHttp]:
+        """Get an authorized Http object private to the calling thread.
+
+        The service is shared between clients of the same account and
+        httplib2.Http is not thread-safe, so every request runs on a
+        per-thread Http. Each one keeps its TLS connection alive across
+        calls made from that thread.
+
+        Returns:
+            AuthorizedHttp for this thread, or None if there are no
+            credentials (the service's own transport is used instead)
+        """
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            credentials = self.connection_manager.get_credentials()
+            if credentials is None:
+                return None
+            http = AuthorizedHttp(credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+
+    def _execute(self, request):
+        """Execute an API request on the calling thread's Http object."""
+        return request.execute(http=self._thread_http())
+
     def _extract_body(self, payload: Dict[str, Any]) -> Dict[str, str]:
-        """Extract text and HTML body from message payload."""
-        body = {}
+        """Extract text and HTML body from message payload.
 
-        if 'body' in payload and payload['body'].get('data'):
+        Nested multipart trees are walked iteratively (depth-first, in
+        document order); the first text/plain and text/html parts win.
+        """
+        data = payload.get('body', {}).get('data')
+        if data:
             # Simple message with body data
-            content_type = payload.get('mimeType', '')
-            decoded = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
-            
-            if 'text/html' in content_type:
-                body['html'] = decoded
-            else:
-                body['text'] = decoded
-
-        elif 'parts' in payload:
-            # Multipart message
-            for part in payload['parts']:
-                mime_type = part.get('mimeType', '')
-                
-                if mime_type == 'text/plain' and part.get('body', {}).get('data'):
-                    body['text'] = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                elif mime_type == 'text/html' and part.get('body', {}).get('data'):
-                    body['html'] = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                elif 'parts' in part:
-                    # Nested parts
-                    nested_body = self._extract_body(part)
-                    body.update(nested_body)
+            key = 'html' if 'text/html' in payload.get('mimeType', '') else 'text'
+            return {key: _decode_part(payload, data)}
+
+        body = {}
+        stack = list(reversed(payload.get('parts', [])))
+        while stack and len(body) < 2:
+            part = stack.pop()
+            key = _BODY_PART_KEYS.get(part.get('mimeType', ''))
+            data = part.get('body', {}).get('data') if key else None
+
+            if data:
+                if key not in body:
+                    body[key] = _decode_part(part, data)
+            elif 'parts' in part:
+                # Nested parts
+                stack.extend(reversed(part['parts']))
 
         return body
 
@@ -267,13 +435,7 @@ class GmailAPIClient(EmailClientInterface):
             return False
 
         try:
-            for msg_id in message_ids:
-                self.service.users().messages().modify(
-                    userId='me',
-                    id=msg_id,
-                    body={'removeLabelIds': ['UNREAD']}
-                ).execute()
-
+            self._batch_modify(message_ids, remove_label_ids=['UNREAD'])
             self.logger.info(f"Marked {len(message_ids)} emails as read")
             return True
 
@@ -295,12 +457,9 @@ class GmailAPIClient(EmailClientInterface):
             return False
 
         try:
-            for msg_id in message_ids:
-                self.service.users().messages().trash(
-                    userId='me',
-                    id=msg_id
-                ).execute()
-
+            # batchDelete would delete permanently (and needs the full
+            # mail scope), so trash by label to keep messages recoverable
+            self._batch_modify(message_ids, add_label_ids=['TRASH'])
             self.logger.info(f"Deleted {len(message_ids)} emails")
             return True
 
@@ -309,6 +468,32 @@ class GmailAPIClient(EmailClientInterface):
             self.logger.error(self.error_message)
             return False
 
+    def _batch_modify(self, message_ids: List[str], add_label_ids: List[str] = None,
+                      remove_label_ids: List[str] = None):
+        """Apply label changes with one batchModify call per MODIFY_BATCH_SIZE IDs.
+
+        Args:
+            message_ids: List of Gmail message IDs
+            add_label_ids: Label IDs to add to every message
+            remove_label_ids: Label IDs to remove from every message
+
+        Raises:
+            Exception: If any batchModify request fails
+        """
+        body = {}
+        if add_label_ids:
+            body['addLabelIds'] = add_label_ids
+        if remove_label_ids:
+            body['removeLabelIds'] = remove_label_ids
+
+        messages = self._messages
+        for start in range(0, len(message_ids), self.MODIFY_BATCH_SIZE):
+            chunk = message_ids[start:start + self.MODIFY_BATCH_SIZE]
+            self._execute(messages.batchModify(
+                userId='me',
+                body=dict(body, ids=chunk)
+            ))
+
     def search_emails(self, query: str, limit: int = 250) -> List[str]:
         """Search for emails using Gmail query syntax.
 
@@ -323,14 +508,7 @@ class GmailAPIClient(EmailClientInterface):
             return []
 
         try:
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=limit
-            ).execute()
-
-            messages = results.get('messages', [])
-            return [msg['id'] for msg in messages]
+            return list(self._iter_message_ids(limit, query))
 
         except Exception as e:
             self.logger.error(f"Search failed: {e}")
@@ -6,9 +6,7 @@ operations for better testability and maintainability.
 
 import logging
 from typing import Optional
-from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 
 
 class GmailConnectionManager:
@@ -28,6 +26,7 @@ class GmailConnectionManager:
         self.email = email
         self.oauth_manager = oauth_manager
         self.service = None
+        self.credentials = None
         self.logger = logging.getLogger(__name__)
         self.error_message = None
     
@@ -38,42 +37,16 @@ class GmailConnectionManager:
             True if connection successful, False otherwise
         """
         try:
-            # Get OAuth tokens
-            tokens = self.oauth_manager.get_oauth_tokens(self.email)
-            if not tokens:
+            # Get cached credentials (refreshed only when expired)
+            credentials = self.oauth_manager.get_credentials(self.email)
+            if not credentials:
                 self.error_message = "No OAuth tokens found. Please re-authorize."
                 self.logger.error(self.error_message)
                 return False
             
-            # Get client credentials from gmail_oauth manager
-            gmail_oauth = self.oauth_manager.gmail_oauth
-            
-            # Create credentials object
-            credentials = Credentials(
-                token=tokens['access_token'],
-                refresh_token=tokens['refresh_token'],
-                token_uri='https://oauth2.googleapis.com/token',
-                client_id=gmail_oauth._get_client_id(),
-                client_secret=gmail_oauth._get_client_secret(),
-                scopes=['https://www.googleapis.com/auth/gmail.modify']
-            )
-            
-            # Check if token needs refresh
-            if gmail_oauth.is_token_expired(tokens.get('token_expiry')):
-                self.logger.info("Refreshing expired token...")
-                request = Request()
-                credentials.refresh(request)
-                
-                # Update stored tokens
-                self.oauth_manager.store_oauth_tokens(
-                    self.email,
-                    credentials.token,
-                    credentials.refresh_token,
-                    credentials.expiry.isoformat() if credentials.expiry else None
-                )
-            
-            # Build Gmail API service
-            self.service = build('gmail', 'v1', credentials=credentials, cache_discovery=False)
+            # Shared per-email service, built once by the OAuth manager
+            self.service = self.oauth_manager.build_service(self.email)
+            self.credentials = credentials
             self.logger.info(f"Successfully connected to Gmail API for {self.email}")
             return True
             
@@ -85,6 +58,7 @@ class GmailConnectionManager:
     def disconnect(self):
         """Close connection (no-op for Gmail API)."""
         self.service = None
+        self.credentials = None
         self.logger.info("Disconnected from Gmail API")
     
     def is_connected(self) -> bool:
@@ -103,6 +77,14 @@ class GmailConnectionManager:
         """
         return self.service
     
+    def get_credentials(self) -> Optional[Credentials]:
+        """Get the OAuth credentials backing the current service.
+        
+        Returns:
+            Credentials object or None if not connected
+        """
+        return self.credentials
+    
     def reconnect(self) -> bool:
         """Attempt to reconnect to Gmail API.
         
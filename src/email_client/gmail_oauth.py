@@ -5,17 +5,62 @@ Handles OAuth 2.0 token management, authorization flow, and IMAP authentication
 for Gmail accounts. Provides secure token storage and automatic refresh.
 """
 
+import atexit
 import json
 import base64
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import threading
+import time
+import weakref
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
 from cryptography.fernet import Fernet
 
+try:
+    # Optional SIMD base64 (AVX2/NEON); the stdlib codec is used otherwise
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+logging.getLogger(__name__).debug(
+    f"XOAUTH2 base64 backend: "
+    f"{_b64.get_version() if _b64 is not base64 else 'stdlib'}"
+)
+
+
+# Tokens expiring within this window are treated as already expired
+_EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+@lru_cache(maxsize=64)
+def _parse_iso(token_expiry: str) -> Optional[datetime]:
+    """Parse an ISO expiry string into a naive UTC datetime.
+    
+    Cached since the same stored expiry is checked on every connect.
+    
+    Returns:
+        Naive UTC datetime, or None if the string is unparseable
+    """
+    try:
+        expiry = datetime.fromisoformat(token_expiry.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
+
+
+@lru_cache(maxsize=32)
+def _user_prefix(email: str) -> bytes:
+    """Per-account XOAUTH2 prefix, b'user=<email>\\x01auth=Bearer '."""
+    return b'user=' + email.encode('utf-8') + b'\x01auth=Bearer '
+
 
 class GmailOAuthManager:
     """Manages Gmail OAuth 2.0 authentication and token operations."""
@@ -32,6 +77,8 @@ class GmailOAuthManager:
         """
         self.credentials_file = credentials_file
         self.logger = logging.getLogger(__name__)
+        self._client_config = None
+        self._client_config_lock = threading.Lock()
     
     def authorize_user(self) -> Optional[Dict[str, Any]]:
         """Run OAuth authorization flow for a new user.
@@ -123,14 +170,11 @@ class GmailOAuthManager:
         if not token_expiry:
             return True
         
-        try:
-            expiry_time = datetime.fromisoformat(token_expiry.replace('Z', '+00:00'))
-            # Consider expired if expires within 5 minutes
-            buffer_time = datetime.now(expiry_time.tzinfo) + timedelta(minutes=5)
-            return expiry_time <= buffer_time
-        except Exception:
+        expiry_time = _parse_iso(token_expiry)
+        if expiry_time is None:
             # If we can't parse the expiry time, assume expired
             return True
+        return expiry_time - _EXPIRY_MARGIN <= datetime.utcnow()
     
     def generate_oauth2_string(self, email: str, access_token: str) -> bytes:
         """Generate OAuth2 authentication string for IMAP XOAUTH2.
@@ -143,12 +187,26 @@ class GmailOAuthManager:
             Base64-encoded OAuth2 authentication string as bytes
         """
         # Format per RFC 7628: user=<email>\x01auth=Bearer <token>\x01\x01
-        # Make sure Bearer is capitalized and format is exact
-        auth_string = f'user={email}\x01auth=Bearer {access_token}\x01\x01'
-        self.logger.debug(f"Raw OAuth2 string: {repr(auth_string)}")
-        encoded = base64.b64encode(auth_string.encode('utf-8'))
-        self.logger.debug(f"Encoded OAuth2 string: {encoded}")
-        return encoded
+        # The per-account prefix is cached; only the token part is rebuilt
+        auth_bytes = _user_prefix(email) + access_token.encode('ascii') + b'\x01\x01'
+        return _b64.b64encode(auth_bytes)
+    
+    def _get_client_config(self) -> Dict[str, Any]:
+        """Get the 'installed' client config, reading the credentials file once.
+        
+        Returns:
+            Parsed 'installed' section of the OAuth credentials file
+        """
+        with self._client_config_lock:
+            if self._client_config is None:
+                with open(self.credentials_file, 'r') as f:
+                    self._client_config = json.load(f)['installed']
+            return self._client_config
+    
+    def invalidate_client_config(self):
+        """Forget the cached client config so the next read reloads the file."""
+        with self._client_config_lock:
+            self._client_config = None
     
     def _get_client_id(self) -> str:
         """Get OAuth client ID from credentials file.
@@ -157,9 +215,7 @@ class GmailOAuthManager:
             OAuth client ID
         """
         try:
-            with open(self.credentials_file, 'r') as f:
-                credentials = json.load(f)
-                return credentials['installed']['client_id']
+            return self._get_client_config()['client_id']
         except Exception as e:
             self.logger.error(f"Failed to read client ID: {e}")
             raise
@@ -171,28 +227,282 @@ class GmailOAuthManager:
             OAuth client secret
         """
         try:
-            with open(self.credentials_file, 'r') as f:
-                credentials = json.load(f)
-                return credentials['installed']['client_secret']
+            return self._get_client_config()['client_secret']
         except Exception as e:
             self.logger.error(f"Failed to read client secret: {e}")
             raise
 
 
+# Managers whose in-memory secrets are wiped at interpreter exit
+_live_managers: 'weakref.WeakSet[OAuthCredentialManager]' = weakref.WeakSet()
+
+
+@atexit.register
+def _clear_all_cached_secrets():
+    for manager in list(_live_managers):
+        manager.clear_cached_secrets()
+
+
+# Per-email version of the stored token row, bumped by whichever manager
+# writes or deletes it so the other managers drop what they cached
+_token_versions: Dict[str, int] = {}
+_token_versions_lock = threading.Lock()
+
+
+def _bump_token_version(email: str) -> int:
+    """Record that an account's stored tokens changed and return the new version."""
+    with _token_versions_lock:
+        version = _token_versions.get(email, 0) + 1
+        _token_versions[email] = version
+        return version
+
+
+def _run_refresher(manager_ref: 'weakref.ref[OAuthCredentialManager]',
+                   stop: threading.Event, interval: float):
+    """Background refresh loop for one manager.
+    
+    Holds only a weak reference, so the thread exits once its manager is
+    garbage collected as well as when stop is set.
+    """
+    while not stop.wait(interval):
+        manager = manager_ref()
+        if manager is None:
+            return
+        manager.refresh_expiring()
+        del manager
+
+
 class OAuthCredentialManager:
     """Manages encrypted storage of OAuth tokens in the database."""
     
-    def __init__(self, db_manager, cred_manager):
+    # Upsert updates the row in place; INSERT OR REPLACE would delete and
+    # re-insert it under a new id
+    STORE_TOKENS_SQL = """
+        INSERT INTO oauth_tokens 
+        (email, access_token, refresh_token, token_expiry, updated_date)
+        VALUES (?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(email) DO UPDATE SET
+            access_token = excluded.access_token,
+            refresh_token = excluded.refresh_token,
+            token_expiry = excluded.token_expiry,
+            updated_date = excluded.updated_date
+    """
+    
+    SELECT_TOKENS_SQL = """
+        SELECT access_token, refresh_token, token_expiry
+        FROM oauth_tokens WHERE email = ?
+    """
+    
+    UPDATE_ACCESS_SQL = """
+        UPDATE oauth_tokens
+        SET access_token = ?, token_expiry = ?, updated_date = datetime('now')
+        WHERE email = ?
+    """
+    
+    DELETE_TOKENS_SQL = "DELETE FROM oauth_tokens WHERE email = ?"
+    
+    # Seconds a decrypted token row is served from memory
+    TOKENS_CACHE_TTL = 60
+    
+    # Background refresher: how often to check, and how close to expiry to refresh
+    REFRESH_INTERVAL = 60
+    REFRESH_MARGIN = timedelta(minutes=10)
+    
+    def __init__(self, db_manager, cred_manager, background_refresh: bool = True):
         """Initialize OAuth credential manager.
         
         Args:
             db_manager: DBManager instance for database operations
             cred_manager: CredentialManager instance for encryption
+            background_refresh: Start the background token refresher once
+                credentials are cached (off for short-lived dialog managers)
         """
         self.db = db_manager
         self.cred = cred_manager
         self.gmail_oauth = GmailOAuthManager()
         self.logger = logging.getLogger(__name__)
+        # Live Credentials per email, reused until google-auth reports expiry
+        self._creds_cache: Dict[str, Credentials] = {}
+        self._creds_lock = threading.RLock()
+        # Built Gmail services per email, keyed to the credentials they wrap
+        self._service_cache: Dict[str, Tuple[Credentials, Any]] = {}
+        # Decrypted token rows per email with the monotonic time they were read
+        self._tokens_cache: Dict[str, Tuple[Dict[str, str], float]] = {}
+        # Encoded XOAUTH2 string per email with the access token it was built from
+        self._auth_strings: Dict[str, Tuple[str, bytes]] = {}
+        # Token version each email's cached entries were read at
+        self._cache_versions: Dict[str, int] = {}
+        self._background_refresh = background_refresh
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
+        _live_managers.add(self)
+    
+    def get_credentials(self, email: str, force_refresh: bool = False) -> Optional[Credentials]:
+        """Get valid Google credentials for an email.
+        
+        Credentials are cached per email so repeated connects skip the
+        database read and token decryption, and expiry checks are a plain
+        datetime comparison on the cached object. The access token is only
+        refreshed (and the new tokens stored) once google-auth reports it
+        as expired, when no expiry is known, or when force_refresh is set.
+        Tokens stored or deleted through another manager, or a failed
+        refresh, drop the cached entry.
+        
+        Args:
+            email: Email address to get credentials for
+            force_refresh: Refresh even if the token looks valid (e.g. after
+                the server rejected it)
+            
+        Returns:
+            Valid Credentials object, or None if no tokens are stored
+            
+        Raises:
+            google.auth.exceptions.RefreshError: If the token refresh fails
+        """
+        with self._creds_lock:
+            self._check_version(email)
+            credentials = self._creds_cache.get(email)
+            if credentials is None:
+                tokens = self.get_oauth_tokens(email)
+                if not tokens:
+                    return None
+                credentials = self._build_credentials(tokens)
+            
+            if force_refresh or not credentials.valid or credentials.expiry is None:
+                self.logger.info("Refreshing expired token...")
+                previous_refresh_token = credentials.refresh_token
+                try:
+                    credentials.refresh(Request())
+                except Exception:
+                    self._drop_cached(email)
+                    raise
+                token_expiry = credentials.expiry.isoformat() if credentials.expiry else None
+                if credentials.refresh_token == previous_refresh_token:
+                    self.update_access_only(email, credentials.token, token_expiry)
+                else:
+                    self.store_oauth_tokens(
+                        email,
+                        credentials.token,
+                        credentials.refresh_token,
+                        token_expiry
+                    )
+            
+            self._creds_cache[email] = credentials
+            if self._background_refresh:
+                self._start_refresher()
+            return credentials
+    
+    def _start_refresher(self):
+        """Start the background token refresher if it is not running.
+        
+        Started lazily once credentials are cached, so managers that never
+        connect do not spawn a thread. The owner stops it with stop_refresher
+        when it closes.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=_run_refresher,
+            args=(weakref.ref(self), self._refresher_stop, self.REFRESH_INTERVAL),
+            name='oauth-token-refresher', daemon=True
+        )
+        self._refresher.start()
+    
+    def stop_refresher(self, timeout: Optional[float] = None):
+        """Stop the background token refresher.
+        
+        Args:
+            timeout: Seconds to wait for the thread to exit (None waits forever)
+        """
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+            self._refresher = None
+    
+    def refresh_expiring(self):
+        """Refresh cached credentials that expire within REFRESH_MARGIN.
+        
+        Keeps the token refresh round trip off the connect path: by the time
+        a connect needs the credentials they are already fresh in the cache.
+        A failed refresh drops the entry, so it is not retried every interval.
+        """
+        deadline = datetime.utcnow() + self.REFRESH_MARGIN
+        with self._creds_lock:
+            expiring = [email for email, credentials in self._creds_cache.items()
+                        if credentials.expiry is not None and credentials.expiry < deadline]
+        
+        for email in expiring:
+            try:
+                self.get_credentials(email, force_refresh=True)
+            except Exception as e:
+                self.logger.warning(f"Background token refresh failed for {email}: {e}")
+                with self._creds_lock:
+                    self._drop_cached(email)
+    
+    def build_service(self, email: str):
+        """Get a ready Gmail API service for an email.
+        
+        The service is cached per email and reused for as long as it wraps
+        the current cached credentials; re-authorizing or deleting tokens
+        drops those credentials, so the next call builds a fresh service.
+        
+        Args:
+            email: Email address to build the service for
+            
+        Returns:
+            Gmail API service object, or None if no tokens are stored
+            
+        Raises:
+            google.auth.exceptions.RefreshError: If the token refresh fails
+        """
+        with self._creds_lock:
+            credentials = self.get_credentials(email)
+            if credentials is None:
+                self._service_cache.pop(email, None)
+                return None
+            
+            cached = self._service_cache.get(email)
+            if cached is not None and cached[0] is credentials:
+                return cached[1]
+            
+            # Use the discovery document shipped with googleapiclient (no fetch)
+            service = build('gmail', 'v1', credentials=credentials, static_discovery=True)
+            self._service_cache[email] = (credentials, service)
+            return service
+    
+    def _build_credentials(self, tokens: Dict[str, Any]) -> Credentials:
+        """Create a Credentials object from stored tokens.
+        
+        Args:
+            tokens: Token dictionary as returned by get_oauth_tokens
+            
+        Returns:
+            Credentials object carrying the stored expiry
+        """
+        return Credentials(
+            token=tokens['access_token'],
+            refresh_token=tokens['refresh_token'],
+            token_uri='https://oauth2.googleapis.com/token',
+            client_id=self.gmail_oauth._get_client_id(),
+            client_secret=self.gmail_oauth._get_client_secret(),
+            scopes=GmailOAuthManager.SCOPES,
+            expiry=self._parse_expiry(tokens.get('token_expiry'))
+        )
+    
+    @staticmethod
+    def _parse_expiry(token_expiry: Optional[str]) -> Optional[datetime]:
+        """Parse a stored ISO expiry into the naive UTC datetime google-auth expects.
+        
+        Args:
+            token_expiry: Token expiry time in ISO format
+            
+        Returns:
+            Naive UTC datetime, or None if missing or unparseable
+        """
+        if not token_expiry:
+            return None
+        return _parse_iso(token_expiry)
     
     def store_oauth_tokens(self, email: str, access_token: str, 
                           refresh_token: str, token_expiry: Optional[str] = None):
@@ -204,6 +514,11 @@ class OAuthCredentialManager:
             refresh_token: OAuth refresh token
             token_expiry: Token expiry time in ISO format (optional)
         """
+        with self._creds_lock:
+            self._creds_cache.pop(email, None)
+            self._tokens_cache.pop(email, None)
+            self._auth_strings.pop(email, None)
+        
         try:
             # Encrypt tokens
             encrypted_access = self.cred.encrypt_password(access_token)
@@ -212,21 +527,69 @@ class OAuthCredentialManager:
             # Store in database
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO oauth_tokens 
-                    (email, access_token, refresh_token, token_expiry, updated_date)
-                    VALUES (?, ?, ?, ?, datetime('now'))
-                """, (email, encrypted_access, encrypted_refresh, token_expiry))
+                cursor.execute(
+                    self.STORE_TOKENS_SQL,
+                    (email, encrypted_access, encrypted_refresh, token_expiry)
+                )
+            self._record_write(email)
             
+            # Keep the plaintext we already have so the next read skips decryption
+            self._cache_tokens(email, {
+                'access_token': access_token,
+                'refresh_token': refresh_token,
+                'token_expiry': token_expiry
+            })
             self.logger.info(f"OAuth tokens stored for {email}")
             
         except Exception as e:
             self.logger.error(f"Failed to store OAuth tokens for {email}: {e}")
             raise
     
+    def update_access_only(self, email: str, access_token: str,
+                           token_expiry: Optional[str] = None):
+        """Store a refreshed access token, leaving the refresh token untouched.
+        
+        Used when a refresh did not rotate the refresh token, so only the
+        access token needs encrypting and writing.
+        
+        Args:
+            email: Email address the token belongs to
+            access_token: New OAuth access token
+            token_expiry: Token expiry time in ISO format (optional)
+        """
+        with self._creds_lock:
+            self._creds_cache.pop(email, None)
+            previous = self._tokens_cache.pop(email, None)
+            self._auth_strings.pop(email, None)
+        
+        try:
+            encrypted_access = self.cred.encrypt_password(access_token)
+            
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    self.UPDATE_ACCESS_SQL,
+                    (encrypted_access, token_expiry, email)
+                )
+            self._record_write(email)
+            
+            if previous is not None:
+                self._cache_tokens(email, dict(
+                    previous[0], access_token=access_token, token_expiry=token_expiry
+                ))
+            self.logger.info(f"OAuth access token updated for {email}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to update OAuth access token for {email}: {e}")
+            raise
+    
     def get_oauth_tokens(self, email: str) -> Optional[Dict[str, str]]:
         """Retrieve and decrypt OAuth tokens for an email.
         
+        Decrypted rows are kept in memory for TOKENS_CACHE_TTL seconds.
+        Storing tokens caches the new plaintext directly, so a refresh never
+        needs a decrypt; deleting tokens drops the cached row.
+        
         Args:
             email: Email address to get tokens for
             
@@ -234,33 +597,95 @@ class OAuthCredentialManager:
             Dictionary with access_token, refresh_token, and token_expiry,
             or None if no tokens found
         """
+        with self._creds_lock:
+            self._check_version(email)
+            cached = self._tokens_cache.get(email)
+        if cached is not None and time.monotonic() - cached[1] < self.TOKENS_CACHE_TTL:
+            return dict(cached[0])
+        
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT access_token, refresh_token, token_expiry
-                    FROM oauth_tokens WHERE email = ?
-                """, (email,))
+                cursor.execute(self.SELECT_TOKENS_SQL, (email,))
                 row = cursor.fetchone()
                 
                 if not row:
                     return None
                 
                 # Decrypt tokens
-                access_token = self.cred.decrypt_password(row[0])
-                refresh_token = self.cred.decrypt_password(row[1])
+                access_token, refresh_token = self.cred.decrypt_many([row[0], row[1]])
                 token_expiry = row[2]
                 
-                return {
+                tokens = {
                     'access_token': access_token,
                     'refresh_token': refresh_token,
                     'token_expiry': token_expiry
                 }
+            
+            self._cache_tokens(email, tokens)
+            return dict(tokens)
                 
         except Exception as e:
             self.logger.error(f"Failed to retrieve OAuth tokens for {email}: {e}")
             return None
     
+    def _check_version(self, email: str):
+        """Drop an email's cached entries if another manager changed its tokens.
+        
+        Called with _creds_lock held.
+        """
+        version = _token_versions.get(email, 0)
+        if self._cache_versions.get(email, 0) != version:
+            self._drop_cached(email)
+            self._cache_versions[email] = version
+    
+    def _record_write(self, email: str):
+        """Bump the email's token version after this manager wrote its row."""
+        with self._creds_lock:
+            self._cache_versions[email] = _bump_token_version(email)
+    
+    def _drop_cached(self, email: str):
+        """Forget every cached entry for an email. Called with _creds_lock held."""
+        self._creds_cache.pop(email, None)
+        self._tokens_cache.pop(email, None)
+        self._auth_strings.pop(email, None)
+        self._service_cache.pop(email, None)
+    
+    def _cache_tokens(self, email: str, tokens: Dict[str, str]):
+        """Remember decrypted tokens for an email (see get_oauth_tokens)."""
+        with self._creds_lock:
+            self._tokens_cache[email] = (tokens, time.monotonic())
+    
+    def get_auth_string(self, email: str, access_token: str) -> bytes:
+        """Get the base64 XOAUTH2 string, rebuilding it only for a new token.
+        
+        get_credentials hands back the same access token until it expires,
+        so reconnects within the token's lifetime reuse the encoded string.
+        
+        Args:
+            email: Email address
+            access_token: Current OAuth access token
+            
+        Returns:
+            Base64-encoded XOAUTH2 authentication string
+        """
+        with self._creds_lock:
+            cached = self._auth_strings.get(email)
+            if cached is not None and cached[0] == access_token:
+                return cached[1]
+            
+            auth_bytes = self.gmail_oauth.generate_oauth2_string(email, access_token)
+            self._auth_strings[email] = (access_token, auth_bytes)
+            return auth_bytes
+    
+    def clear_cached_secrets(self):
+        """Drop every decrypted token and credentials object held in memory."""
+        with self._creds_lock:
+            self._tokens_cache.clear()
+            self._auth_strings.clear()
+            self._creds_cache.clear()
+            self._service_cache.clear()
+    
     def delete_oauth_tokens(self, email: str) -> bool:
         """Delete OAuth tokens for an email.
         
@@ -270,16 +695,22 @@ class OAuthCredentialManager:
         Returns:
             True if tokens were deleted, False otherwise
         """
+        with self._creds_lock:
+            self._creds_cache.pop(email, None)
+            self._tokens_cache.pop(email, None)
+            self._auth_strings.pop(email, None)
+        
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM oauth_tokens WHERE email = ?", (email,))
+                cursor.execute(self.DELETE_TOKENS_SQL, (email,))
                 deleted = cursor.rowcount > 0
-                
-                if deleted:
-                    self.logger.info(f"OAuth tokens deleted for {email}")
-                
-                return deleted
+            self._record_write(email)
+            
+            if deleted:
+                self.logger.info(f"OAuth tokens deleted for {email}")
+            
+            return deleted
                 
         except Exception as e:
             self.logger.error(f"Failed to delete OAuth tokens for {email}: {e}")
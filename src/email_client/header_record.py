@@ -0,0 +1,35 @@
+"""Header record type shared by the email clients and parser
+
+Kept in its own module so the parser can accept records without
+importing the IMAP client (and its connection pool).
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass
+class HeaderRecord:
+    """Headers of one message, as returned by fetch_headers.
+    
+    Slots keep each record a fraction of the size of the equivalent dict,
+    which adds up for scans holding tens of thousands of them.
+    """
+    # Declared by hand; dataclass(slots=True) needs Python 3.10
+    __slots__ = ('id', 'sender', 'subject', 'date', 'is_read')
+    
+    id: str
+    sender: str
+    subject: str
+    date: str
+    is_read: bool
+    
+    def as_dict(self) -> Dict:
+        """Return the legacy dict form with keys: id, from, subject, date, is_read."""
+        return {
+            'id': self.id,
+            'from': self.sender,
+            'subject': self.subject,
+            'date': self.date,
+            'is_read': self.is_read
+        }
@@ -9,11 +9,571 @@ import imaplib
 import socket
 import logging
 import email
+import base64
+import quopri
+import queue
+import re
+import threading
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+from functools import lru_cache, wraps
 from email.header import decode_header
-from typing import Optional, List, Dict, Tuple
+from typing import Callable, Optional, Iterator, List, Dict, Tuple
 from .auth.auth_strategy import IMAPAuthStrategy
 from .imap_connection import IMAPConnectionManager
 from .email_client_interface import EmailClientInterface
+from .header_record import HeaderRecord
+
+try:
+    # Optional SIMD base64 (AVX2/NEON); the stdlib codec is used otherwise
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+
+# RFC 2047 encoded-word: =?charset?B|Q?text?=
+_ENCODED_WORD_RE = re.compile(r'=\?([^?\s]+)\?([BbQq])\?([^?\s]*)\?=')
+
+
+# Sequence number at the start of a FETCH response, and its FLAGS list
+_FETCH_ID_RE = re.compile(rb'^(\d+) ')
+_FETCH_FLAGS_RE = re.compile(rb'FLAGS \(([^)]*)\)')
+_FETCH_UID_RE = re.compile(rb'\bUID (\d+)')
+_SEEN = b'\\Seen'
+
+
+# From/Subject/Date header lines, including folded continuation lines
+_HDR_RE = re.compile(
+    rb'^(From|Subject|Date):[ \t]*([^\r\n]*(?:\r?\n[ \t][^\r\n]*)*)',
+    re.MULTILINE | re.IGNORECASE
+)
+_FOLD_RE = re.compile(rb'\r?\n(?=[ \t])')
+_HDR_NAMES = {b'from': 'From', b'subject': 'Subject', b'date': 'Date'}
+
+
+def _extract_headers(header_data: bytes) -> Dict[str, str]:
+    """Pull From, Subject and Date out of raw header bytes.
+    
+    Fields the message simply doesn't have come back empty. The full email
+    parser is only used when the regex finds nothing in non-empty data,
+    so unusual layouts are still handled.
+    """
+    fields = {}
+    for match in _HDR_RE.finditer(header_data):
+        name = _HDR_NAMES[match.group(1).lower()]
+        if name not in fields:
+            value = _FOLD_RE.sub(b'', match.group(2))
+            # Raw 8-bit headers are almost always UTF-8 in practice
+            fields[name] = value.decode('utf-8', errors='replace')
+    
+    if not fields and header_data.strip():
+        msg = email.message_from_bytes(header_data)
+        return {name: str(msg.get(name, '')) for name in _HDR_NAMES.values()}
+    for name in _HDR_NAMES.values():
+        fields.setdefault(name, '')
+    return fields
+
+
+_CHARSET_RE = re.compile(rb'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_CTE_RE = re.compile(rb'^Content-Transfer-Encoding:\s*([\w-]+)', re.IGNORECASE | re.MULTILINE)
+
+
+def _header_param(pattern: 're.Pattern', header_fields: bytes) -> bytes:
+    """First group of pattern in the header fields, lowercased, or b''."""
+    match = pattern.search(header_fields)
+    return match.group(1).lower() if match else b''
+
+
+def _decode_transfer_encoding(body_data: bytes, encoding: bytes) -> bytes:
+    """Undo base64 or quoted-printable Content-Transfer-Encoding."""
+    try:
+        if encoding == b'base64':
+            return _b64.b64decode(body_data)
+        if encoding == b'quoted-printable':
+            return quopri.decodestring(body_data)
+    except ValueError:
+        # Malformed payload; fall back to the raw bytes
+        pass
+    return body_data
+
+
+def _decode_body(body_data: bytes, charset: bytes = b'') -> str:
+    """Decode body bytes once, using the declared charset when there is one.
+    
+    Without a declared charset, strict UTF-8 is tried first and anything
+    that is not valid UTF-8 is read as windows-1252 (a superset of
+    latin-1 covering most legacy mail).
+    """
+    if charset:
+        try:
+            return body_data.decode(charset.decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    try:
+        return body_data.decode('utf-8')
+    except UnicodeDecodeError:
+        return body_data.decode('windows-1252', errors='replace')
+
+
+# Tokens of an IMAP parenthesized list: parens, quoted strings, atoms
+_SEXP_TOKEN_RE = re.compile(rb'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+_QUOTED_ESCAPE_RE = re.compile(rb'\\(.)')
+_SECTION_RE = re.compile(rb'BODY\[([^\]]*)\]')
+
+
+def _parse_sexp(data: bytes) -> list:
+    """Parse an IMAP parenthesized list into nested Python lists.
+    
+    Quoted strings and atoms become bytes and NIL becomes None.
+    """
+    stack = [[]]
+    for match in _SEXP_TOKEN_RE.finditer(data):
+        token = match.group()
+        if token == b'(':
+            stack.append([])
+        elif token == b')':
+            if len(stack) == 1:
+                raise ValueError("Unbalanced parentheses in IMAP response")
+            inner = stack.pop()
+            stack[-1].append(inner)
+        elif token.startswith(b'"'):
+            stack[-1].append(_QUOTED_ESCAPE_RE.sub(rb'\1', token[1:-1]))
+        elif token.upper() == b'NIL':
+            stack[-1].append(None)
+        else:
+            stack[-1].append(token)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced parentheses in IMAP response")
+    return stack[0]
+
+
+def _find_text_sections(structure: list, prefix: str = '') -> Dict[str, Tuple[str, bytes, bytes]]:
+    """Locate the first text/plain and text/html parts in a BODYSTRUCTURE.
+    
+    Returns:
+        Mapping of subtype ('plain'/'html') to (section, charset, encoding);
+        a non-multipart message uses section 'TEXT'
+    """
+    found = {}
+    if structure and isinstance(structure[0], list):
+        # Multipart: child parts come first, then the subtype and extensions
+        for index, child in enumerate(structure):
+            if not isinstance(child, list):
+                break
+            section = f'{prefix}{index + 1}'
+            for subtype, part in _find_text_sections(child, section + '.').items():
+                found.setdefault(subtype, part)
+        return found
+    
+    if len(structure) < 6 or not isinstance(structure[0], bytes):
+        return found
+    
+    main_type = structure[0].lower()
+    subtype = (structure[1] or b'').lower()
+    if main_type == b'text' and subtype in (b'plain', b'html'):
+        params = structure[2] if isinstance(structure[2], list) else []
+        charset = b''
+        for key, value in zip(params[::2], params[1::2]):
+            if isinstance(key, bytes) and key.lower() == b'charset' and value:
+                charset = value
+                break
+        section = prefix.rstrip('.') or 'TEXT'
+        found[subtype.decode('ascii')] = (section, charset, (structure[5] or b'').lower())
+    return found
+
+
+def _compress_ids(message_ids: List[bytes]) -> bytes:
+    """Compress message IDs into an IMAP sequence set (e.g. b'1:3,7,9:10')."""
+    numbers = sorted({int(msg_id) for msg_id in message_ids})
+    spans = []
+    start = prev = None
+    for number in numbers:
+        if prev is not None and number == prev + 1:
+            prev = number
+            continue
+        if start is not None:
+            spans.append(f'{start}:{prev}' if prev != start else str(start))
+        start = prev = number
+    if start is not None:
+        spans.append(f'{start}:{prev}' if prev != start else str(start))
+    return ','.join(spans).encode('ascii')
+
+
+def _parse_fetch_response(data: list) -> Dict[bytes, Tuple[bytes, bytes]]:
+    """Split a multi-message FETCH response into per-message parts.
+    
+    imaplib returns a (prelude, literal) tuple per message, optionally
+    followed by a bytes item with the rest of the response (servers may
+    put FLAGS either before or after the literal). Untagged responses for
+    other messages may be interleaved as plain bytes items.
+    
+    Returns:
+        Mapping of message ID to (literal payload, FLAGS contents)
+    """
+    parsed = {}
+    current = None
+    for item in data:
+        if isinstance(item, tuple):
+            match = _FETCH_ID_RE.match(item[0])
+            if not match:
+                current = None
+                continue
+            current = match.group(1)
+            flags = _FETCH_FLAGS_RE.search(item[0])
+            parsed[current] = (item[1], flags.group(1) if flags else b'')
+        elif isinstance(item, bytes) and _FETCH_ID_RE.match(item):
+            # Literal-free response for another message, e.g. an unsolicited
+            # FLAGS update; it must not be attributed to the previous one
+            current = None
+        elif current is not None and isinstance(item, bytes):
+            flags = _FETCH_FLAGS_RE.search(item)
+            if flags:
+                parsed[current] = (parsed[current][0], flags.group(1))
+    return parsed
+
+
+def _parse_uid_flags_response(data: list) -> Dict[bytes, Tuple[int, bytes]]:
+    """Map each message in a FETCH (UID FLAGS) response to its UID and flags.
+    
+    Returns:
+        Mapping of message ID to (UID, FLAGS contents)
+    """
+    parsed = {}
+    for item in data:
+        if isinstance(item, tuple):
+            item = item[0]
+        if not isinstance(item, bytes):
+            continue
+        msg_id = _FETCH_ID_RE.match(item)
+        uid = _FETCH_UID_RE.search(item)
+        if msg_id and uid:
+            flags = _FETCH_FLAGS_RE.search(item)
+            parsed[msg_id.group(1)] = (int(uid.group(1)), flags.group(1) if flags else b'')
+    return parsed
+
+
+def _parse_uid_fetch_response(data: list) -> Dict[bytes, bytes]:
+    """Map each UID in a UID FETCH response to its literal payload.
+    
+    The UID item may come before the literal (in the prelude) or after it
+    (in the trailing bytes item), depending on the server.
+    
+    Returns:
+        Mapping of UID to literal payload
+    """
+    parsed = {}
+    pending = None
+    for item in data:
+        if isinstance(item, tuple):
+            uid = _FETCH_UID_RE.search(item[0])
+            if uid:
+                parsed[uid.group(1)] = item[1]
+                pending = None
+            else:
+                pending = item[1]
+        elif isinstance(item, bytes) and pending is not None:
+            uid = None if _FETCH_ID_RE.match(item) else _FETCH_UID_RE.search(item)
+            if uid:
+                parsed[uid.group(1)] = pending
+            pending = None
+    return parsed
+
+
+@lru_cache(maxsize=8192)
+def _decode_header(header: str) -> str:
+    """Decode a header value, falling back to the email package.
+    
+    Cached because the same senders and subjects recur across a mailbox;
+    headers that need the slow path or can't be decoded at all are cached
+    too, so they are only attempted once. Callers skip plain headers
+    (no '=?') so they don't crowd encoded ones out of the cache.
+    """
+    try:
+        return _decode_encoded_words(header)
+    except Exception:
+        pass
+    
+    # Slow path: let the email package handle anything unusual
+    try:
+        result = []
+        for part, encoding in decode_header(header):
+            if isinstance(part, bytes):
+                result.append(part.decode(encoding or 'utf-8', errors='ignore'))
+            else:
+                result.append(part)
+        return ''.join(result)
+    except Exception:
+        return header
+
+
+def _decode_encoded_words(header: str) -> str:
+    """Decode RFC 2047 encoded-words in a header value.
+    
+    Whitespace between adjacent encoded-words is dropped as the RFC requires.
+    Adjacent words in the same charset are decoded together, since a
+    multibyte character may be split across them.
+    
+    Raises:
+        LookupError, ValueError: If a word has an unknown charset or bad payload
+    """
+    result = []
+    pos = 0
+    pending_charset = None
+    pending = b''
+    for match in _ENCODED_WORD_RE.finditer(header):
+        gap = header[pos:match.start()]
+        charset, encoding, text = match.groups()
+        charset = charset.split('*')[0].lower()
+        if encoding in 'Bb':
+            raw = _b64.b64decode(text + '=' * (-len(text) % 4))
+        else:
+            raw = quopri.decodestring(text.encode('ascii'), header=True)
+        
+        adjacent = pending_charset is not None and (not gap or gap.isspace())
+        if adjacent and charset == pending_charset:
+            pending += raw
+        else:
+            if pending_charset is not None:
+                result.append(pending.decode(pending_charset, errors='replace'))
+            if gap and not adjacent:
+                result.append(gap)
+            pending_charset, pending = charset, raw
+        
+        pos = match.end()
+    
+    if pending_charset is not None:
+        result.append(pending.decode(pending_charset, errors='replace'))
+    result.append(header[pos:])
+    return ''.join(result)
+
+
+def _holds_connection(method):
+    """Run an IMAPClient method with its connection's command lock held.
+    
+    imaplib connections are not thread-safe; the lock keeps the keepalive
+    timer from sending a NOOP in the middle of another command.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._command_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class IMAPConnectionPool:
+    """Persistent extra IMAP sessions for one account.
+    
+    Used to download headers over several connections at once;
+    Gmail and Outlook both allow multiple concurrent sessions per account.
+    Sessions are authenticated once, checked out with acquire() and kept
+    open between operations (with NOOP keepalives), so later scans reuse
+    them instead of paying for a new TLS handshake and login. All members
+    share one authentication strategy (and so one cached OAuth token) and
+    have INBOX selected read-only. Use for_account() to get the account's
+    shared pool and release() when done with it; the pool is closed once
+    its last owner releases it.
+    """
+    
+    _pools: Dict[Tuple[str, str], 'IMAPConnectionPool'] = {}
+    _pools_lock = threading.Lock()
+    
+    def __init__(self, email: str, auth_strategy: IMAPAuthStrategy, provider: str, size: int):
+        """Initialize the pool.
+        
+        Args:
+            email: Email address for authentication
+            auth_strategy: Authentication strategy shared by all members
+            provider: Email provider ('gmail' or 'outlook')
+            size: Maximum number of connections to open
+        """
+        self.email = email
+        self.auth_strategy = auth_strategy
+        self.provider = provider
+        self.size = size
+        self.clients: List['IMAPClient'] = []
+        # Checked-in members waiting to be reused
+        self._idle: queue.Queue = queue.Queue()
+        # Members opened with a replaced strategy, closed when checked in
+        self._retired = set()
+        # Callers of for_account() that have not released the pool yet
+        self._owners = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    @classmethod
+    def for_account(cls, email: str, auth_strategy: IMAPAuthStrategy,
+                    provider: str, size: int) -> 'IMAPConnectionPool':
+        """Get the shared pool for an account, creating it on first use.
+        
+        The caller becomes an owner and must call release() when done.
+        Asking for the pool with a different authentication strategy or
+        size (e.g. after signing in again) retires the existing sessions,
+        so new ones are opened with the new credentials.
+        
+        Args:
+            email: Email address for authentication
+            auth_strategy: Authentication strategy for new members
+            provider: Email provider ('gmail' or 'outlook')
+            size: Maximum number of connections to open
+            
+        Returns:
+            The account's pool
+        """
+        key = (email.lower(), provider)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = cls(email, auth_strategy, provider, size)
+            elif pool.auth_strategy is not auth_strategy or pool.size != size:
+                pool._refresh(auth_strategy, size)
+            pool._owners += 1
+            return pool
+    
+    def release(self):
+        """Give up one owner's claim; the last owner closes the pool."""
+        cls = type(self)
+        with cls._pools_lock:
+            self._owners -= 1
+            if self._owners > 0:
+                return
+            key = (self.email.lower(), self.provider)
+            if cls._pools.get(key) is self:
+                del cls._pools[key]
+        self.close()
+    
+    @classmethod
+    def close_all(cls):
+        """Close every shared pool (called at interpreter exit)."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+    
+    @contextmanager
+    def acquire(self, count: int) -> Iterator[List['IMAPClient']]:
+        """Check out up to count connected clients for the duration of a block.
+        
+        Idle sessions are reused first; new ones are opened only while the
+        pool is below its size. Clients go back to the pool on exit.
+        
+        Each reused session is NOOPed first: besides catching dropped
+        connections, that is when the server reports messages expunged by
+        other sessions, so its sequence numbers match a fresh SEARCH.
+        
+        Args:
+            count: Number of clients wanted
+            
+        Yields:
+            Connected clients (fewer than requested if the pool is busy or
+            connections fail)
+        """
+        clients = self._checkout(min(count, self.size))
+        try:
+            yield clients
+        finally:
+            for client in clients:
+                with self._lock:
+                    retired = client in self._retired
+                    self._retired.discard(client)
+                if retired:
+                    self._disconnect(client)
+                else:
+                    self._idle.put(client)
+    
+    def _checkout(self, count: int) -> List['IMAPClient']:
+        """Take idle members that pass a NOOP, then open new ones."""
+        clients = []
+        while len(clients) < count:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not self._is_alive(client):
+                self._discard(client)
+                continue
+            clients.append(client)
+        
+        while len(clients) < count:
+            with self._lock:
+                if len(self.clients) >= self.size:
+                    break
+                client = self._open()
+                if client is None:
+                    break
+                self.clients.append(client)
+            clients.append(client)
+        return clients
+    
+    def _open(self) -> Optional['IMAPClient']:
+        """Open, authenticate and select INBOX on a new member."""
+        client = IMAPClient(self.email, self.auth_strategy, self.provider)
+        if not client.connect():
+            self.logger.warning("Could not open additional IMAP connection")
+            return None
+        with client._command_lock:
+            client.imap.select('INBOX', readonly=True)
+        client.keepalive()
+        return client
+    
+    def _is_alive(self, client: 'IMAPClient') -> bool:
+        """NOOP an idle member: syncs its mailbox view and checks it's alive."""
+        try:
+            with client._command_lock:
+                return client.imap is not None and client.imap.noop()[0] == 'OK'
+        except (imaplib.IMAP4.error, OSError):
+            return False
+    
+    def _discard(self, client: 'IMAPClient'):
+        """Drop a dead member so a fresh one can take its place."""
+        with self._lock:
+            if client in self.clients:
+                self.clients.remove(client)
+        self._disconnect(client)
+    
+    def _disconnect(self, client: 'IMAPClient'):
+        """Log out a member that is leaving the pool."""
+        try:
+            client.disconnect()
+        except Exception as e:
+            self.logger.debug(f"Error closing dropped IMAP connection: {e}")
+    
+    def _refresh(self, auth_strategy: IMAPAuthStrategy, size: int):
+        """Switch to a new strategy and size, retiring the current members.
+        
+        Idle members are closed now; members checked out by another caller
+        are closed when they are checked back in.
+        """
+        self.auth_strategy = auth_strategy
+        self.size = size
+        with self._lock:
+            self._retired.update(self.clients)
+            self.clients = []
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._retired.discard(client)
+            self._disconnect(client)
+    
+    def close(self):
+        """Disconnect every pooled connection."""
+        with self._lock:
+            clients, self.clients = self.clients, []
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for client in clients:
+            client.disconnect()
+
+
+atexit.register(IMAPConnectionPool.close_all)
 
 
 class IMAPClient(EmailClientInterface):
@@ -24,8 +584,32 @@ class IMAPClient(EmailClientInterface):
     Implements EmailClientInterface for polymorphic usage.
     """
     
+    # Messages per FETCH command; keeps command lines within server limits
+    FETCH_CHUNK_SIZE = 1000
+    
+    # Only the headers fetch_headers reads; skips DKIM/Received blocks.
+    # BODY.PEEK leaves \Seen untouched.
+    HEADER_FETCH_ITEMS = '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)] FLAGS)'
+    
+    # Cheap per-message items fetched to check the on-disk header cache
+    CACHE_PROBE_ITEMS = '(UID FLAGS)'
+    
+    # Messages per STORE command when flagging for deletion
+    STORE_CHUNK_SIZE = 1000
+    
+    # Concurrent IMAP sessions used by multi-chunk fetch_headers
+    MAX_POOL_WORKERS = 6
+    
+    # One FETCH chunk per pooled session, so a scan batch uses all of them;
+    # progress and cancellation still happen per chunk through on_chunk
+    HEADER_BATCH_SIZE = FETCH_CHUNK_SIZE * MAX_POOL_WORKERS
+    
+    # Seconds between keepalive NOOPs; Gmail drops idle sessions at ~30 min
+    KEEPALIVE_INTERVAL = 25 * 60
+    
     def __init__(self, email: str, auth_strategy: IMAPAuthStrategy = None, 
-                 provider: str = None, connection_manager: IMAPConnectionManager = None):
+                 provider: str = None, connection_manager: IMAPConnectionManager = None,
+                 header_cache=None):
         """Initialize IMAP client.
         
         Args:
@@ -33,6 +617,9 @@ class IMAPClient(EmailClientInterface):
             auth_strategy: Authentication strategy (required if connection_manager not provided)
             provider: Email provider ('gmail' or 'outlook'), auto-detected if None
             connection_manager: Optional pre-configured connection manager
+            header_cache: Optional HeaderCacheRepository; when set, headers
+                already seen in an earlier scan are read from disk instead
+                of being downloaded again
             
         Raises:
             ValueError: If neither auth_strategy nor connection_manager is provided
@@ -54,6 +641,13 @@ class IMAPClient(EmailClientInterface):
         )
         self.provider = self.connection_manager.provider
         self.imap = None
+        self._pool: Optional[IMAPConnectionPool] = None
+        self._keepalive_timer: Optional[threading.Timer] = None
+        # Held for every command on self.imap (see _holds_connection)
+        self._command_lock = threading.RLock()
+        self._uidplus: Optional[bool] = None
+        self._uidvalidity: Optional[int] = None
+        self.header_cache = header_cache
     
     def connect(self) -> bool:
         """Connect to IMAP server and authenticate using the connection manager.
@@ -64,12 +658,63 @@ class IMAPClient(EmailClientInterface):
         success = self.connection_manager.connect()
         if success:
             self.imap = self.connection_manager.get_connection()
+            self._uidplus = None
+            self._uidvalidity = None
         return success
     
+    def keepalive(self, interval: float = KEEPALIVE_INTERVAL):
+        """Keep the connection open across scan passes with periodic NOOPs.
+        
+        Gmail drops sessions idle for about 30 minutes, so a NOOP every
+        25 minutes lets one authenticated connection be reused instead of
+        reconnecting (and re-authenticating) for each pass. The timer
+        re-arms itself after every NOOP until disconnect() is called.
+        
+        Args:
+            interval: Seconds between NOOPs
+        """
+        self._cancel_keepalive()
+        timer = threading.Timer(interval, self._send_keepalive, args=(interval,))
+        timer.daemon = True
+        self._keepalive_timer = timer
+        timer.start()
+    
+    def _send_keepalive(self, interval: float):
+        """Send a NOOP if the connection is idle, then schedule the next one."""
+        imap = self.imap
+        if imap is None:
+            return
+        # A command holding the connection already keeps the session alive,
+        # and imaplib connections must not interleave commands from two threads
+        if self._command_lock.acquire(blocking=False):
+            try:
+                imap.noop()
+            except (imaplib.IMAP4.error, OSError) as e:
+                self.logger.warning(f"Keepalive NOOP failed for {self.email}: {e}")
+                return
+            finally:
+                self._command_lock.release()
+        if self.imap is imap:
+            self.keepalive(interval)
+    
+    def _cancel_keepalive(self):
+        """Stop the keepalive timer if one is running."""
+        if self._keepalive_timer is not None:
+            self._keepalive_timer.cancel()
+            self._keepalive_timer = None
+    
     def disconnect(self):
-        """Close IMAP connection."""
+        """Close the IMAP connection.
+        
+        Also releases this client's claim on the account's shared pool;
+        the pool's sessions are closed once no other client is using it.
+        """
+        self._cancel_keepalive()
         self.connection_manager.disconnect()
         self.imap = None
+        if self._pool is not None:
+            self._pool.release()
+            self._pool = None
     
     def is_connected(self) -> bool:
         """Check if connected to IMAP server.
@@ -87,6 +732,7 @@ class IMAPClient(EmailClientInterface):
         """
         return self.connection_manager.get_error_message()
     
+    @_holds_connection
     def get_email_count(self) -> int:
         """Get total number of emails in INBOX.
         
@@ -104,6 +750,7 @@ class IMAPClient(EmailClientInterface):
             self.logger.error(f"Error getting email count: {e}")
             return 0
     
+    @_holds_connection
     def fetch_email_ids(self, batch_size: int = 500) -> List[bytes]:
         """Fetch all message IDs, limited by batch size.
         
@@ -126,83 +773,341 @@ class IMAPClient(EmailClientInterface):
             self.logger.error(f"Error fetching email IDs: {e}")
             return []
     
-    def fetch_headers(self, message_ids: List[bytes]) -> List[Dict]:
+    def fetch_headers(self, message_ids: List[bytes],
+                      on_chunk: Optional[Callable[[int], bool]] = None) -> List[HeaderRecord]:
         """Fetch headers for a batch of message IDs.
         
+        IDs are range-compressed into one FETCH per FETCH_CHUNK_SIZE
+        messages instead of one round-trip per message. Batches spanning
+        several chunks fetch them concurrently over pooled connections.
+        
         Args:
             message_ids: List of message IDs to fetch
+            on_chunk: Optional callback(count) run after each FETCH chunk,
+                from the pool threads when pooled; returning False stops
+                every session after its current chunk
             
         Returns:
-            List of header dictionaries with keys: id, from, subject, date, is_read
+            List of HeaderRecord, in input order (failed messages are
+            skipped, as are chunks not fetched after on_chunk stopped)
+        """
+        chunks = [
+            message_ids[start:start + self.FETCH_CHUNK_SIZE]
+            for start in range(0, len(message_ids), self.FETCH_CHUNK_SIZE)
+        ]
+        with self._pooled_clients(len(chunks)) as clients:
+            if not clients:
+                headers = list(self.iter_headers(message_ids, on_chunk))
+            else:
+                # Chunks are dealt round-robin so each session has one FETCH
+                # in flight at a time while the others wait on the server
+                partitions = [chunks[i::len(clients)] for i in range(len(clients))]
+                
+                def fetch_partition(client, partition):
+                    fetched = []
+                    for chunk in partition:
+                        fetched.append(client._fetch_header_chunk(chunk, self.header_cache))
+                        if on_chunk is not None and not on_chunk(len(chunk)):
+                            break
+                    return fetched
+                
+                with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+                    results = list(executor.map(fetch_partition, clients, partitions))
+                
+                # One pass over the chunk results; a stopped session leaves
+                # its later chunks out
+                headers = list(chain.from_iterable(
+                    results[index % len(clients)][index // len(clients)]
+                    for index in range(len(chunks))
+                    if index // len(clients) < len(results[index % len(clients)])
+                ))
+        
+        self.logger.info(f"Fetched {len(headers)} email headers")
+        self.logger.debug(f"Header decode cache: {_decode_header.cache_info()}")
+        return headers
+    
+    def iter_headers(self, message_ids: List[bytes],
+                     on_chunk: Optional[Callable[[int], bool]] = None) -> Iterator[HeaderRecord]:
+        """Yield headers chunk by chunk as each FETCH completes.
+        
+        Only one chunk of raw responses is held at a time, and callers can
+        start processing before later chunks are requested.
+        
+        Args:
+            message_ids: List of message IDs to fetch
+            on_chunk: Optional callback(count) run after each chunk;
+                returning False stops before the next FETCH
+            
+        Yields:
+            HeaderRecord per message, in input order (failed messages are skipped)
         """
+        for start in range(0, len(message_ids), self.FETCH_CHUNK_SIZE):
+            chunk = message_ids[start:start + self.FETCH_CHUNK_SIZE]
+            yield from self._fetch_header_chunk(chunk, self.header_cache)
+            if on_chunk is not None and not on_chunk(len(chunk)):
+                return
+    
+    @_holds_connection
+    def _fetch_header_chunk(self, chunk: List[bytes],
+                            header_cache=None) -> List[HeaderRecord]:
+        """Fetch headers for one chunk, consulting the on-disk cache if given.
+        
+        With a cache, only UID and FLAGS are fetched for every message;
+        headers are downloaded just for UIDs not cached under the current
+        UIDVALIDITY and then stored. Read state always comes from the
+        fresh FLAGS, so cached rows never report a stale \\Seen.
+        
+        Args:
+            chunk: Up to FETCH_CHUNK_SIZE message IDs
+            header_cache: Optional HeaderCacheRepository
+            
+        Returns:
+            HeaderRecords in input order (failed messages are skipped)
+        """
+        if header_cache is None:
+            return self._fetch_header_fields(chunk)
+        
+        try:
+            uidvalidity = self._get_uidvalidity()
+            status, data = self.imap.fetch(_compress_ids(chunk), self.CACHE_PROBE_ITEMS)
+            if uidvalidity is None or status != 'OK':
+                return self._fetch_header_fields(chunk)
+            probes = _parse_uid_flags_response(data)
+            cached = header_cache.get_headers(
+                self.email, uidvalidity, [uid for uid, _ in probes.values()]
+            )
+        except Exception as e:
+            self.logger.warning(f"Header cache unavailable, fetching headers: {e}")
+            return self._fetch_header_fields(chunk)
+        
+        missing = [msg_id for msg_id in chunk if probes.get(msg_id, (None,))[0] not in cached]
+        fetched = {}
+        if missing:
+            fetched = {record.id: record for record in self._fetch_header_fields(missing)}
+            rows = []
+            for msg_id in missing:
+                record = fetched.get(msg_id.decode('ascii'))
+                if record is not None and msg_id in probes:
+                    rows.append((probes[msg_id][0], record.sender,
+                                 record.subject, record.date))
+            try:
+                header_cache.store_headers(self.email, uidvalidity, rows)
+            except Exception as e:
+                self.logger.warning(f"Error caching headers: {e}")
+        
+        self.logger.debug(
+            f"Header cache: {len(chunk) - len(missing)} hits, {len(missing)} misses"
+        )
+        
         headers = []
-        for msg_id in message_ids:
+        for msg_id in chunk:
+            key = msg_id.decode('ascii')
+            if key in fetched:
+                headers.append(fetched[key])
+                continue
+            probe = probes.get(msg_id)
+            if probe is None or probe[0] not in cached:
+                continue
+            uid, flags_data = probe
+            headers.append(HeaderRecord(key, *cached[uid], _SEEN in flags_data))
+        return headers
+    
+    def _get_uidvalidity(self) -> Optional[int]:
+        """Get the INBOX UIDVALIDITY, asking the server once per connection.
+        
+        SELECT already reports it, so the untagged response is used when
+        imaplib still holds it; otherwise STATUS is issued.
+        """
+        if self._uidvalidity is None:
+            values = self.imap.untagged_responses.get('UIDVALIDITY')
+            if not values:
+                status, data = self.imap.status('INBOX', '(UIDVALIDITY)')
+                match = re.search(rb'UIDVALIDITY (\d+)', data[0]) if status == 'OK' else None
+                values = [match.group(1)] if match else None
+            if values:
+                self._uidvalidity = int(values[-1])
+        return self._uidvalidity
+    
+    def _fetch_header_fields(self, chunk: List[bytes]) -> List[HeaderRecord]:
+        """Download and decode headers for one chunk of message IDs.
+        
+        Args:
+            chunk: Up to FETCH_CHUNK_SIZE message IDs
+            
+        Returns:
+            HeaderRecords in input order (failed messages are skipped)
+        """
+        try:
+            status, data = self.imap.fetch(_compress_ids(chunk), self.HEADER_FETCH_ITEMS)
+            if status != 'OK':
+                return []
+            responses = _parse_fetch_response(data)
+        except Exception as e:
+            self.logger.warning(f"Error fetching header batch: {e}")
+            return []
+        
+        # Hoisted lookups for the per-message loop
+        get_response = responses.get
+        decode = self._decode_header_value
+        extract = _extract_headers
+        
+        # Pre-sized and index-assigned; compacted only if messages were skipped
+        headers = [None] * len(chunk)
+        filled = 0
+        for index, msg_id in enumerate(chunk):
+            response = get_response(msg_id)
+            if response is None:
+                continue
             try:
-                status, data = self.imap.fetch(msg_id, '(RFC822.HEADER FLAGS)')
-                if status != 'OK':
-                    continue
-                
                 # Parse headers
-                header_data = data[0][1]
-                flags_data = data[1] if len(data) > 1 else b''
-                flags = flags_data.decode('utf-8', errors='ignore') if flags_data else ''
-                msg = email.message_from_bytes(header_data)
+                header_data, flags_data = response
+                is_read = _SEEN in flags_data
+                fields = extract(header_data)
                 
                 # Extract and decode headers
-                from_header = self._decode_header_value(msg.get('From', ''))
-                subject = self._decode_header_value(msg.get('Subject', ''))
-                date = msg.get('Date', '')
-                is_read = '\\Seen' in flags
-                
-                headers.append({
-                    'id': msg_id.decode('utf-8'),
-                    'from': from_header,
-                    'subject': subject,
-                    'date': date,
-                    'is_read': is_read
-                })
+                from_header = decode(fields['From'])
+                subject = decode(fields['Subject'])
+                date = fields['Date']
             except Exception as e:
                 self.logger.warning(f"Error parsing email {msg_id}: {e}")
                 continue
+            
+            headers[index] = HeaderRecord(msg_id.decode('ascii'), from_header, subject, date, is_read)
+            filled += 1
         
-        self.logger.info(f"Fetched {len(headers)} email headers")
+        if filled < len(headers):
+            headers = [record for record in headers if record is not None]
         return headers
     
+    @_holds_connection
     def fetch_body(self, message_id: bytes) -> Dict:
         """Fetch email body.
         
+        The message's BODYSTRUCTURE is fetched first so only the first
+        text/plain and text/html parts are downloaded, never attachments;
+        a message with no text part at all gets empty bodies. Messages
+        whose structure can't be parsed fall back to the whole TEXT section.
+        
         Args:
             message_id: Message ID to fetch
             
         Returns:
             Dictionary with keys: id, body_text, body_html
         """
+        msg_id = message_id.decode('ascii')
         try:
-            # Use BODY.PEEK to avoid marking as read
-            status, data = self.imap.fetch(message_id, '(BODY.PEEK[TEXT])')
-            if status != 'OK':
-                return {'id': message_id.decode('utf-8'), 'body_text': '', 'body_html': ''}
-            
-            # Extract body content
-            body_data = data[0][1] if data and data[0] and len(data[0]) > 1 else b''
-            
-            # Decode body (try common encodings)
-            body_text = ''
-            for encoding in ['utf-8', 'iso-8859-1', 'windows-1252']:
-                try:
-                    body_text = body_data.decode(encoding, errors='ignore')
-                    break
-                except:
-                    continue
+            sections = self._get_text_sections(message_id)
+            if sections is None:
+                # Structure unknown: fall back to the whole TEXT section
+                return {
+                    'id': msg_id,
+                    'body_text': self._fetch_text_section(message_id),
+                    'body_html': ''  # HTML parsing done in email_parser
+                }
             
+            # No text/plain or text/html part (e.g. a lone PDF): nothing to fetch
+            bodies = self._fetch_sections(message_id, sections) if sections else {}
             return {
-                'id': message_id.decode('utf-8'),
-                'body_text': body_text,
-                'body_html': ''  # HTML parsing done in email_parser
+                'id': msg_id,
+                'body_text': bodies.get('plain', ''),
+                'body_html': bodies.get('html', '')
             }
         except Exception as e:
             self.logger.error(f"Error fetching body for {message_id}: {e}")
-            return {'id': message_id.decode('utf-8'), 'body_text': '', 'body_html': ''}
+            return {'id': msg_id, 'body_text': '', 'body_html': ''}
+    
+    def _get_text_sections(self, message_id: bytes) -> Optional[Dict[str, Tuple[str, bytes, bytes]]]:
+        """Fetch BODYSTRUCTURE and locate the text parts.
+        
+        Returns:
+            See _find_text_sections (empty when the message has no text
+            part); None if the structure is unavailable
+        """
+        status, data = self.imap.fetch(message_id, '(BODYSTRUCTURE)')
+        if status != 'OK' or not data or not isinstance(data[0], bytes):
+            # Literals inside the structure arrive split up; use the fallback
+            return None
+        try:
+            response = _parse_sexp(data[0])
+        except ValueError:
+            return None
+        
+        for items in response:
+            if isinstance(items, list) and b'BODYSTRUCTURE' in items[:-1]:
+                return _find_text_sections(items[items.index(b'BODYSTRUCTURE') + 1])
+        return None
+    
+    def _fetch_sections(self, message_id: bytes,
+                        sections: Dict[str, Tuple[str, bytes, bytes]]) -> Dict[str, str]:
+        """Download and decode the given body sections in one FETCH.
+        
+        Returns:
+            Mapping of subtype ('plain'/'html') to decoded text
+        """
+        items = ' '.join(f'BODY.PEEK[{section}]' for section, _, _ in sections.values())
+        status, data = self.imap.fetch(message_id, f'({items})')
+        if status != 'OK':
+            return {}
+        
+        payloads = {}
+        for item in data:
+            if isinstance(item, tuple) and len(item) >= 2:
+                match = _SECTION_RE.search(item[0])
+                if match:
+                    payloads[match.group(1).decode('ascii')] = item[1] or b''
+        
+        bodies = {}
+        for subtype, (section, charset, encoding) in sections.items():
+            payload = _decode_transfer_encoding(payloads.get(section, b''), encoding)
+            bodies[subtype] = _decode_body(payload, charset)
+        return bodies
+    
+    def _fetch_text_section(self, message_id: bytes) -> str:
+        """Download the whole TEXT section, decoded with the message's charset."""
+        # Use BODY.PEEK to avoid marking as read; the header fields give
+        # the charset and transfer encoding
+        status, data = self.imap.fetch(
+            message_id,
+            '(BODY.PEEK[HEADER.FIELDS (CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] '
+            'BODY.PEEK[TEXT])'
+        )
+        if status != 'OK':
+            return ''
+        
+        # Extract body content and the requested header fields
+        header_fields = b''
+        body_data = b''
+        for item in data:
+            if not isinstance(item, tuple) or len(item) < 2:
+                continue
+            if b'HEADER.FIELDS' in item[0].upper():
+                header_fields = item[1] or b''
+            else:
+                body_data = item[1] or b''
+        
+        body_data = _decode_transfer_encoding(body_data, _header_param(_CTE_RE, header_fields))
+        return _decode_body(body_data, _header_param(_CHARSET_RE, header_fields))
+    
+    @contextmanager
+    def _pooled_clients(self, workers: int) -> Iterator[List['IMAPClient']]:
+        """Check out up to `workers` connections from the account's pool.
+        
+        Args:
+            workers: Number of connections wanted
+            
+        Yields:
+            Connected pooled clients; empty when fewer than two are wanted
+            or no extra sessions can be opened
+        """
+        if workers <= 1 or self.auth_strategy is None:
+            yield []
+            return
+        if self._pool is None:
+            self._pool = IMAPConnectionPool.for_account(
+                self.email, self.auth_strategy, self.provider, self.MAX_POOL_WORKERS
+            )
+        with self._pool.acquire(workers) as clients:
+            yield clients
     
     def _decode_header_value(self, header: str) -> str:
         """Decode email header handling various encodings.
@@ -213,18 +1118,11 @@ class IMAPClient(EmailClientInterface):
         Returns:
             Decoded header string
         """
-        try:
-            decoded_parts = decode_header(header)
-            result = []
-            for part, encoding in decoded_parts:
-                if isinstance(part, bytes):
-                    result.append(part.decode(encoding or 'utf-8', errors='ignore'))
-                else:
-                    result.append(part)
-            return ''.join(result)
-        except Exception:
+        if '=?' not in header:
             return header
+        return _decode_header(header)
     
+    @_holds_connection
     def delete_emails_from_sender(self, sender_email: str, db_manager=None) -> Tuple[int, str]:
         """Delete all emails from a specific sender.
         
@@ -255,11 +1153,14 @@ class IMAPClient(EmailClientInterface):
                 self.logger.error(message)
                 return (0, message)
             
-            # Search for emails from sender
+            # Search for emails from sender; UIDs stay valid across expunges
             self.logger.info(f"Searching for emails from {sender_email}")
-            message_ids = self._search_by_sender(sender_email)
+            uids = self._search_by_sender(sender_email)
+            
+            # SEARCH FROM is a substring match; keep only exact address matches
+            uids = self._filter_by_sender(uids, sender_email)
             
-            count = len(message_ids)
+            count = len(uids)
             
             if count == 0:
                 message = f"No emails found from {sender_email}"
@@ -269,10 +1170,11 @@ class IMAPClient(EmailClientInterface):
             self.logger.info(f"Found {count} emails from {sender_email}, marking for deletion")
             
             # Mark all for deletion
-            self._mark_deleted(message_ids)
+            self._mark_deleted(uids)
             
             # Permanently delete
-            self._expunge()
+            self._expunge(uids)
+            self._forget_cached_headers(uids)
             
             message = f"Deleted {count} emails from {sender_email}"
             self.logger.info(message)
@@ -288,48 +1190,138 @@ class IMAPClient(EmailClientInterface):
             return (0, message)
     
     def _search_by_sender(self, sender: str) -> List[bytes]:
-        """Find all email IDs from a specific sender.
+        """Find the UIDs of all emails from a specific sender.
+        
+        Gmail searches with X-GM-RAW "from:", which is answered from its
+        own search index and matches the parsed sender address; other
+        servers get a standard SEARCH FROM, a substring match over the
+        whole From header. Either way _filter_by_sender confirms hits.
         
         Args:
             sender: Email address to search for
             
         Returns:
-            List of message IDs as bytes
+            List of UIDs as bytes
             
         Raises:
             imaplib.IMAP4.error: If IMAP search fails
         """
-        status, data = self.imap.search(None, f'FROM "{sender}"')
+        if self.provider == 'gmail':
+            status, data = self.imap.uid('SEARCH', None, 'X-GM-RAW', f'"from:{sender}"')
+        else:
+            status, data = self.imap.uid('SEARCH', None, f'FROM "{sender}"')
         
         if status != 'OK':
             self.logger.error(f"Search failed for sender: {sender}")
             return []
         
-        message_ids = data[0].split()
-        return message_ids
+        uids = data[0].split()
+        return uids
     
-    def _mark_deleted(self, message_ids: List[bytes]):
+    def _filter_by_sender(self, uids: List[bytes], sender: str) -> List[bytes]:
+        """Keep only messages whose From address is exactly the sender.
+        
+        IMAP SEARCH FROM matches substrings, so 'bob@x.com' would also hit
+        'jimbob@x.com'. From headers are fetched in range-compressed batches
+        and checked with one precompiled bytes regex per sender.
+        
+        Args:
+            uids: Candidate UIDs from _search_by_sender
+            sender: Email address to match
+            
+        Returns:
+            UIDs whose From header contains the exact address
+            
+        Raises:
+            imaplib.IMAP4.error: If IMAP fetch fails
+        """
+        address = re.compile(
+            rb'(?:^|[<\s:,"])' + re.escape(sender.lower().encode('utf-8')) + rb'(?=[>\s,"]|$)',
+            re.IGNORECASE
+        )
+        matched = []
+        for start in range(0, len(uids), self.FETCH_CHUNK_SIZE):
+            chunk = uids[start:start + self.FETCH_CHUNK_SIZE]
+            status, data = self.imap.uid(
+                'FETCH', _compress_ids(chunk), '(UID BODY.PEEK[HEADER.FIELDS (FROM)])'
+            )
+            if status != 'OK':
+                continue
+            responses = _parse_uid_fetch_response(data)
+            matched.extend(
+                uid for uid in chunk
+                if uid in responses and address.search(responses[uid] or b'')
+            )
+        
+        skipped = len(uids) - len(matched)
+        if skipped:
+            self.logger.info(f"Skipped {skipped} search hits not sent by {sender}")
+        return matched
+    
+    def _mark_deleted(self, uids: List[bytes]):
         """Mark emails with \\Deleted flag.
         
         Args:
-            message_ids: List of message IDs to mark
+            uids: List of message UIDs to mark
             
         Raises:
             imaplib.IMAP4.error: If IMAP store operation fails
         """
-        for msg_id in message_ids:
-            self.imap.store(msg_id, '+FLAGS', '\\Deleted')
+        # Sorted chunks compress into a few ranges each; chunking keeps the
+        # command line within server length limits for very large deletes.
+        # .SILENT stops the server echoing an untagged FETCH per message.
+        for chunk in self._uid_chunks(uids):
+            self.imap.uid('STORE', chunk, '+FLAGS.SILENT', '(\\Deleted)')
         
-        self.logger.debug(f"Marked {len(message_ids)} emails for deletion")
+        self.logger.debug(f"Marked {len(uids)} emails for deletion")
     
-    def _expunge(self):
-        """Permanently delete all emails marked with \\Deleted flag.
+    def _expunge(self, uids: List[bytes]):
+        """Permanently delete the given emails once marked \\Deleted.
         
-        This operation cannot be undone.
+        With UIDPLUS, UID EXPUNGE removes only these messages, leaving any
+        other \\Deleted messages (e.g. flagged by another client) alone;
+        otherwise a plain EXPUNGE is used. This operation cannot be undone.
         
+        Args:
+            uids: UIDs previously passed to _mark_deleted
+            
         Raises:
             imaplib.IMAP4.error: If IMAP expunge operation fails
         """
-        self.imap.expunge()
+        if self._supports_uidplus():
+            for chunk in self._uid_chunks(uids):
+                self.imap.uid('EXPUNGE', chunk)
+        else:
+            self.imap.expunge()
         self.logger.debug("Expunged deleted emails")
+    
+    def _forget_cached_headers(self, uids: List[bytes]):
+        """Drop expunged messages from the on-disk header cache."""
+        if self.header_cache is None:
+            return
+        try:
+            self.header_cache.delete_headers(self.email, [int(uid) for uid in uids])
+        except Exception as e:
+            self.logger.warning(f"Error removing cached headers: {e}")
+    
+    def _supports_uidplus(self) -> bool:
+        """Check for UIDPLUS, asking the server once per connection.
+        
+        imaplib only records the pre-login capabilities, which servers
+        such as Gmail trim, so CAPABILITY is re-issued after login.
+        """
+        if self._uidplus is None:
+            try:
+                status, data = self.imap.capability()
+                caps = data[0].upper().split() if status == 'OK' and data and data[0] else []
+                self._uidplus = b'UIDPLUS' in caps
+            except imaplib.IMAP4.error:
+                self._uidplus = False
+        return self._uidplus
+    
+    def _uid_chunks(self, uids: List[bytes]) -> Iterator[bytes]:
+        """Yield sorted UIDs as range-compressed sets of STORE_CHUNK_SIZE."""
+        ordered = sorted(uids, key=int)
+        for start in range(0, len(ordered), self.STORE_CHUNK_SIZE):
+            yield _compress_ids(ordered[start:start + self.STORE_CHUNK_SIZE])
 
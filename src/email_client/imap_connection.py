@@ -6,11 +6,63 @@ for better testability and maintainability.
 
 import imaplib
 import socket
+import ssl
 import logging
-from typing import Optional
+from typing import Optional, Dict
 from .auth.auth_strategy import IMAPAuthStrategy
 
 
+# One context for every IMAP connection; TLS sessions can only be resumed
+# with the context that created them
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.minimum_version = ssl.TLSVersion.TLSv1_2
+try:
+    _SSL_CONTEXT.set_alpn_protocols(['imap'])
+except NotImplementedError:
+    pass
+
+
+class ResumableIMAP4_SSL(imaplib.IMAP4_SSL):
+    """IMAP4_SSL that resumes a previous TLS session when given one.
+    
+    Resumption skips the full key exchange, so reconnects and extra pooled
+    connections to the same server handshake faster.
+    """
+    
+    def __init__(self, host: str, port: int = 993, session: Optional[ssl.SSLSession] = None,
+                 ssl_context: ssl.SSLContext = _SSL_CONTEXT, **kwargs):
+        self._tls_session = session
+        super().__init__(host, port, ssl_context=ssl_context, **kwargs)
+    
+    def _create_socket(self, timeout):
+        sock = imaplib.IMAP4._create_socket(self, timeout)
+        return self.ssl_context.wrap_socket(
+            sock, server_hostname=self.host, session=self._tls_session
+        )
+
+
+# Address domain (including '@') -> provider name
+_PROVIDER_DOMAINS = {
+    '@gmail.com': 'gmail',
+    '@googlemail.com': 'gmail',
+    '@outlook.com': 'outlook',
+    '@hotmail.com': 'outlook',
+    '@live.com': 'outlook',
+}
+
+
+def detect_provider(email: str) -> Optional[str]:
+    """Detect the provider for one address with a single dict lookup.
+    
+    Args:
+        email: Email address to analyze
+        
+    Returns:
+        Provider name ('gmail' or 'outlook'), or None if unsupported
+    """
+    return _PROVIDER_DOMAINS.get(email[email.rfind('@'):].lower())
+
+
 class IMAPConnectionManager:
     """Manages IMAP connections and authentication.
     
@@ -24,6 +76,9 @@ class IMAPConnectionManager:
         'outlook': 'outlook.office365.com'
     }
     
+    # Most recent TLS session per server, shared by all connection managers
+    _tls_sessions: Dict[str, ssl.SSLSession] = {}
+    
     def __init__(self, email: str, auth_strategy: IMAPAuthStrategy, provider: str = None):
         """Initialize IMAP connection manager.
         
@@ -53,14 +108,10 @@ class IMAPConnectionManager:
         Raises:
             ValueError: If provider cannot be detected
         """
-        email_lower = email.lower()
-        
-        if email_lower.endswith(('@gmail.com', '@googlemail.com')):
-            return 'gmail'
-        elif email_lower.endswith(('@outlook.com', '@hotmail.com', '@live.com')):
-            return 'outlook'
-        else:
+        provider = detect_provider(email)
+        if provider is None:
             raise ValueError(f"Unsupported email provider: {email}")
+        return provider
     
     def connect(self) -> bool:
         """Connect to IMAP server and authenticate.
@@ -75,14 +126,17 @@ class IMAPConnectionManager:
             
             server = self.SERVERS[self.provider]
             
-            # Connect with SSL
+            # Connect with SSL, resuming the last TLS session to this server
             self.logger.info(f"Connecting to {server}:993...")
-            self.connection = imaplib.IMAP4_SSL(server, 993)
+            self.connection = ResumableIMAP4_SSL(
+                server, 993, session=self._tls_sessions.get(server)
+            )
             
             # Authenticate using the strategy
             success = self.auth_strategy.authenticate(self.connection, self.email)
             
             if success:
+                self._remember_tls_session()
                 self.logger.info(f"Successfully connected to {self.provider}")
             else:
                 self.connection = None
@@ -101,6 +155,8 @@ class IMAPConnectionManager:
     def disconnect(self):
         """Close IMAP connection."""
         if self.connection:
+            # TLS 1.3 tickets arrive after the handshake, so save again here
+            self._remember_tls_session()
             try:
                 self.connection.logout()
                 self.logger.info("Disconnected from IMAP server")
@@ -109,6 +165,12 @@ class IMAPConnectionManager:
             finally:
                 self.connection = None
     
+    def _remember_tls_session(self):
+        """Store the connection's TLS session for resumption by later connects."""
+        session = getattr(getattr(self.connection, 'sock', None), 'session', None)
+        if isinstance(session, ssl.SSLSession):
+            self._tls_sessions[self.SERVERS[self.provider]] = session
+    
     def is_connected(self) -> bool:
         """Check if connected to IMAP server.
         
@@ -6,9 +6,9 @@ strategy effectiveness, and failure patterns to help improve the system
 and provide insights to users.
 """
 import csv
-from collections import Counter, defaultdict
 from typing import Dict, List, Optional
 import logging
+import time
 from datetime import datetime
 
 from src.database.db_manager import DBManager
@@ -25,6 +25,9 @@ class UnsubscribeAnalytics:
     - Problem senders
     """
     
+    # Seconds a get_strategy_stats() result is reused across methods
+    STATS_CACHE_TTL = 5.0
+    
     def __init__(self, db_manager: DBManager):
         """
         Initialize analytics.
@@ -34,6 +37,24 @@ class UnsubscribeAnalytics:
         """
         self.db = db_manager
         self.logger = logging.getLogger(__name__)
+        self._stats_cache: Optional[Dict] = None
+        self._stats_ts = 0.0
+    
+    def _cached_stats(self) -> Dict:
+        """
+        Get strategy stats, reusing a recent result.
+        
+        generate_report, get_strategy_effectiveness and get_success_rate are
+        typically called together, so one query serves all of them.
+        
+        Returns:
+            Result of DBManager.get_strategy_stats()
+        """
+        now = time.monotonic()
+        if self._stats_cache is None or now - self._stats_ts >= self.STATS_CACHE_TTL:
+            self._stats_cache = self.db.get_strategy_stats()
+            self._stats_ts = now
+        return self._stats_cache
     
     def generate_report(self) -> Dict:
         """
@@ -49,7 +70,7 @@ class UnsubscribeAnalytics:
                 - top_failures: Most problematic senders
         """
         try:
-            stats = self.db.get_strategy_stats()
+            stats = self._cached_stats()
             
             total = stats.get('total', 0)
             successful = stats.get('successful', 0)
@@ -93,30 +114,19 @@ class UnsubscribeAnalytics:
             List of dictionaries with sender and failure count
         """
         try:
-            actions = self.db.get_action_history()
-            
-            # Count failures per sender
-            failures = defaultdict(int)
-            failure_reasons = defaultdict(list)
+            # Counting and ranking happen in SQLite; only the top-K come back
+            top = self.db.get_top_failure_senders(limit)
+            failure_reasons = self.db.get_failure_reasons_for(
+                [row['sender_email'] for row in top], per_sender=3
+            )
             
-            for action in actions:
-                if action.get('action_type') == 'unsubscribe' and not action.get('success'):
-                    sender = action.get('sender_email', 'unknown')
-                    failures[sender] += 1
-                    details = action.get('details', '')
-                    if details:
-                        failure_reasons[sender].append(details)
-            
-            # Sort by failure count
             top_failures = [
                 {
-                    'sender': sender,
-                    'failure_count': count,
-                    'reasons': failure_reasons[sender][:3]  # Top 3 reasons
+                    'sender': row['sender_email'],
+                    'failure_count': row['count'],
+                    'reasons': failure_reasons.get(row['sender_email'], [])  # Top 3 reasons
                 }
-                for sender, count in sorted(failures.items(), 
-                                           key=lambda x: x[1], 
-                                           reverse=True)[:limit]
+                for row in top
             ]
             
             return top_failures
@@ -133,7 +143,7 @@ class UnsubscribeAnalytics:
             Dictionary mapping strategy name to success rate (0-100)
         """
         try:
-            stats = self.db.get_strategy_stats()
+            stats = self._cached_stats()
             by_strategy = stats.get('by_strategy', {})
             
             effectiveness = {}
@@ -164,50 +174,53 @@ class UnsubscribeAnalytics:
         try:
             report = self.generate_report()
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            strategy_rows = []
+            for strategy, counts in report['strategy_stats'].items():
+                total = counts.get('total', 0)
+                successful = counts.get('successful', 0)
+                rate = (successful / total * 100) if total > 0 else 0
+                strategy_rows.append(
+                    (strategy, total, successful, counts.get('failed', 0), f"{rate:.1f}%")
+                )
+            
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 
-                # Summary section
-                writer.writerow(['Email Unsubscriber Analytics Report'])
-                writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-                writer.writerow([])
-                
-                # Overall stats
-                writer.writerow(['Overall Statistics'])
-                writer.writerow(['Total Attempts', report['total_attempts']])
-                writer.writerow(['Successful', report['successful']])
-                writer.writerow(['Failed', report['failed']])
-                writer.writerow(['Success Rate', f"{report['success_rate']:.1f}%"])
-                writer.writerow([])
+                # Summary section and overall stats
+                writer.writerows([
+                    ['Email Unsubscriber Analytics Report'],
+                    ['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+                    [],
+                    ['Overall Statistics'],
+                    ['Total Attempts', report['total_attempts']],
+                    ['Successful', report['successful']],
+                    ['Failed', report['failed']],
+                    ['Success Rate', f"{report['success_rate']:.1f}%"],
+                    [],
+                ])
                 
                 # Strategy effectiveness
                 writer.writerow(['Strategy Effectiveness'])
                 writer.writerow(['Strategy', 'Total', 'Successful', 'Failed', 'Success Rate'])
-                for strategy, counts in report['strategy_stats'].items():
-                    total = counts.get('total', 0)
-                    successful = counts.get('successful', 0)
-                    failed = counts.get('failed', 0)
-                    rate = (successful / total * 100) if total > 0 else 0
-                    writer.writerow([strategy, total, successful, failed, f"{rate:.1f}%"])
+                writer.writerows(strategy_rows)
                 writer.writerow([])
                 
                 # Top failures
                 writer.writerow(['Top Failed Senders'])
                 writer.writerow(['Sender', 'Failure Count', 'Recent Reasons'])
-                for failure in report['top_failures']:
-                    reasons = '; '.join(failure['reasons'][:2])  # Top 2 reasons
-                    writer.writerow([
-                        failure['sender'],
-                        failure['failure_count'],
-                        reasons
-                    ])
+                writer.writerows(
+                    (failure['sender'], failure['failure_count'],
+                     '; '.join(failure['reasons'][:2]))  # Top 2 reasons
+                    for failure in report['top_failures']
+                )
                 writer.writerow([])
                 
                 # Failure reasons summary
                 writer.writerow(['Common Failure Reasons'])
                 writer.writerow(['Reason', 'Count'])
-                for reason in report['failure_reasons']:
-                    writer.writerow([reason['reason'], reason['count']])
+                writer.writerows(
+                    (reason['reason'], reason['count']) for reason in report['failure_reasons']
+                )
             
             self.logger.info(f"Analytics exported to {filepath}")
             return True
@@ -224,7 +237,7 @@ class UnsubscribeAnalytics:
             Success rate as percentage (0-100)
         """
         try:
-            stats = self.db.get_strategy_stats()
+            stats = self._cached_stats()
             total = stats.get('total', 0)
             successful = stats.get('successful', 0)
             return (successful / total * 100) if total > 0 else 0
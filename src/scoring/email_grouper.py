@@ -4,133 +4,167 @@ Groups and aggregates emails by sender, calculating summary statistics
 and scores for each sender.
 """
 
-from collections import defaultdict
-from typing import List, Dict
+import heapq
+from typing import Dict, Iterable, List, Optional
 from src.scoring.scorer import EmailScorer
 
 
+# Group used for emails that have no sender field
+UNKNOWN_SENDER = 'unknown@example.com'
+
+
+class SenderAccumulator:
+    """Running totals for one sender while emails stream in.
+
+    Holds only counts and a few samples, so grouping memory grows with
+    the number of senders rather than the number of emails.
+    """
+
+    __slots__ = ('count', 'unread', 'with_links', 'sample_links', 'last_date')
+
+    # Unique unsubscribe links kept per sender
+    MAX_SAMPLE_LINKS = 3
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.count = 0
+        self.unread = 0
+        self.with_links = 0
+        self.sample_links: List[str] = []
+        self.last_date = ''
+
+    def add(self, email: Dict):
+        """Fold one email into the totals.
+
+        Args:
+            email: Email dictionary with is_unread, unsubscribe_links, date
+        """
+        self.count += 1
+        if email.get('is_unread'):
+            self.unread += 1
+        links = email.get('unsubscribe_links')
+        if links:
+            self.with_links += 1
+            # Stop looking at links once enough unique samples are kept
+            samples = self.sample_links
+            if len(samples) < self.MAX_SAMPLE_LINKS:
+                for link in links:
+                    if link not in samples:
+                        samples.append(link)
+                        if len(samples) >= self.MAX_SAMPLE_LINKS:
+                            break
+        self.last_date = email.get('date', '')
+
+
 class EmailGrouper:
     """Group and aggregate emails by sender.
-    
+
     Transforms individual emails into sender-level statistics with scores,
     sorted by priority for user action.
     """
-    
+
     def __init__(self, scorer: EmailScorer):
         """Initialize email grouper.
-        
+
         Args:
             scorer: EmailScorer instance for calculating scores
         """
         self.scorer = scorer
-    
-    def group_by_sender(self, emails: List[Dict]) -> List[Dict]:
+
+    def group_by_sender(self, emails: Iterable[Dict], top_k: Optional[int] = None) -> List[Dict]:
         """Group emails by sender and calculate aggregate stats.
-        
+
         Args:
-            emails: List of email dictionaries with sender, is_unread, etc.
-            
+            emails: Email dictionaries with sender, is_unread, etc.; any
+                iterable, consumed once
+            top_k: Only return this many highest-scoring senders
+
         Returns:
             List of sender dictionaries sorted by total_score (descending)
         """
-        if not emails:
-            return []
-        
-        # Group emails by sender
-        groups = defaultdict(list)
+        accumulators: Dict[str, SenderAccumulator] = {}
         for email in emails:
-            sender = email.get('sender', 'unknown@example.com')
-            groups[sender].append(email)
-        
-        # Aggregate stats for each sender
-        senders = []
-        for sender, sender_emails in groups.items():
-            sender_data = self._aggregate_sender_data(sender, sender_emails)
-            senders.append(sender_data)
-        
+            self.accumulate(accumulators, email)
+        return self.finalize(accumulators, top_k)
+
+    def accumulate(self, accumulators: Dict[str, SenderAccumulator], email: Dict):
+        """Add one email to its sender's running totals.
+
+        Lets callers group emails as they are parsed instead of keeping
+        them all in a list; call finalize() once every email is added.
+
+        Args:
+            accumulators: Per-sender totals, updated in place
+            email: Email dictionary with sender, is_unread, etc.
+        """
+        sender = email.get('sender', UNKNOWN_SENDER)
+        accumulator = accumulators.get(sender)
+        if accumulator is None:
+            accumulator = accumulators[sender] = SenderAccumulator()
+        accumulator.add(email)
+
+    def finalize(self, accumulators: Dict[str, SenderAccumulator],
+                 top_k: Optional[int] = None) -> List[Dict]:
+        """Score accumulated senders and build the sorted sender list.
+
+        Args:
+            accumulators: Per-sender totals from accumulate()
+            top_k: Only return this many highest-scoring senders; selected
+                with a heap instead of sorting every sender
+
+        Returns:
+            List of sender dictionaries sorted by total_score (descending)
+        """
+        if not accumulators:
+            return []
+
+        # Whitelist/unwanted status for every sender in two bulk lookups
+        sender_flags = self.scorer.preload_sender_flags(list(accumulators))
+
+        senders = [
+            self._aggregate_sender_data(sender, accumulator, sender_flags[sender])
+            for sender, accumulator in accumulators.items()
+        ]
+
         # Sort by total score descending
+        if top_k is not None:
+            return heapq.nlargest(top_k, senders, key=lambda x: x['total_score'])
         return sorted(senders, key=lambda x: x['total_score'], reverse=True)
-    
-    def _aggregate_sender_data(self, sender: str, emails: List[Dict]) -> Dict:
+
+    def _aggregate_sender_data(self, sender: str, accumulator: SenderAccumulator,
+                               sender_flags: tuple) -> Dict:
         """Calculate aggregate statistics for a sender.
-        
+
         Args:
             sender: Sender email address
-            emails: List of emails from this sender
-            
+            accumulator: Running totals for this sender's emails
+            sender_flags: Pre-resolved (whitelisted, historical_bonus)
+
         Returns:
             Dictionary with sender statistics
         """
-        frequency = len(emails)
-        unread_count = sum(1 for e in emails if e.get('is_unread', False))
-        
-        # Calculate scores for all emails
-        scores = []
-        score_breakdowns = []
-        for email in emails:
-            score, breakdown = self.scorer.calculate_score(
-                email,
-                frequency=frequency,
-                sender=sender
-            )
-            scores.append(score)
-            score_breakdowns.append(breakdown)
-        
-        # Collect unsubscribe links
-        all_links = []
-        for email in emails:
-            links = email.get('unsubscribe_links', [])
-            all_links.extend(links)
-        sample_links = list(set(all_links))[:3]  # Unique, up to 3
-        
-        # Aggregate score breakdowns for the sender
-        aggregated_breakdown = self._aggregate_score_breakdowns(score_breakdowns)
+        whitelisted, historical_bonus = sender_flags
+        frequency = accumulator.count
+
+        # Every score term depends only on the sender's counts; protected
+        # senders score -1 per email
+        aggregated_breakdown = self.scorer.score_counts(
+            frequency,
+            unread=accumulator.unread,
+            with_links=accumulator.with_links,
+            whitelisted=whitelisted,
+            historical_bonus=historical_bonus
+        )
+        total_score = aggregated_breakdown['total']
 
         return {
             'sender': sender,
             'total_count': frequency,
-            'unread_count': unread_count,
-            'average_score': sum(scores) / len(scores) if scores else 0,
-            'total_score': sum(scores),
+            'unread_count': accumulator.unread,
+            'average_score': total_score / frequency if frequency else 0,
+            'total_score': total_score,
             'score_breakdown': aggregated_breakdown,
-            'has_unsubscribe': len(all_links) > 0,
-            'sample_links': sample_links,
-            'last_email_date': emails[-1].get('date', '') if emails else ''
-        }
-
-    def _aggregate_score_breakdowns(self, breakdowns: List[Dict]) -> Dict:
-        """Aggregate score breakdowns from multiple emails into a single breakdown.
-
-        Args:
-            breakdowns: List of score breakdown dictionaries from individual emails
-
-        Returns:
-            Aggregated breakdown dictionary for the sender
-        """
-        if not breakdowns:
-            return {'total': 0}
-
-        # Initialize aggregated breakdown
-        aggregated = {
-            'total': 0,
-            'unread': 0,
-            'frequency': 0,
-            'has_unsubscribe': 0,
-            'historical_unwanted': 0
+            'has_unsubscribe': accumulator.with_links > 0,
+            'sample_links': list(accumulator.sample_links),
+            'last_email_date': accumulator.last_date
         }
-
-        # Sum up all components
-        for breakdown in breakdowns:
-            if 'total' in breakdown:
-                aggregated['total'] += breakdown['total']
-            if 'unread' in breakdown:
-                aggregated['unread'] += breakdown['unread']
-            if 'frequency' in breakdown:
-                aggregated['frequency'] += breakdown['frequency']
-            if 'has_unsubscribe' in breakdown:
-                aggregated['has_unsubscribe'] += breakdown['has_unsubscribe']
-            if 'historical_unwanted' in breakdown:
-                aggregated['historical_unwanted'] += breakdown['historical_unwanted']
-
-        return aggregated
-
@@ -4,7 +4,7 @@ Calculates spam/unwanted email scores based on multiple criteria.
 Provides transparent score breakdowns for user trust.
 """
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import logging
 
 
@@ -18,6 +18,9 @@ class EmailScorer:
     - Historical unwanted sender data
     """
     
+    # Points added for a sender previously marked unwanted
+    HISTORICAL_UNWANTED_BONUS = 5
+    
     def __init__(self, db_manager=None):
         """Initialize email scorer.
         
@@ -43,18 +46,80 @@ class EmailScorer:
             breakdown_dict contains individual component scores
             Score of -1 indicates whitelisted sender (protected)
         """
+        whitelisted, historical_bonus = self.get_sender_flags(sender)
+        return self.calculate_score_cached(email_data, frequency, whitelisted, historical_bonus)
+    
+    def get_sender_flags(self, sender: Optional[str]) -> Tuple[bool, int]:
+        """Look up the per-sender scoring inputs from the database.
+        
+        The result is the same for every email from a sender, so callers
+        scoring many emails resolve it once and use calculate_score_cached.
+        
+        Args:
+            sender: Sender email address
+            
+        Returns:
+            Tuple of (whitelisted, historical_bonus); (False, 0) without a
+            sender or database
+        """
+        if not sender or not self.db:
+            return (False, 0)
+        if self._check_whitelisted(sender):
+            return (True, 0)
+        return (False, self._check_historical_unwanted(sender))
+    
+    def preload_sender_flags(self, senders: List[str]) -> Dict[str, Tuple[bool, int]]:
+        """Resolve get_sender_flags for many senders in two bulk queries.
+        
+        Args:
+            senders: Sender email addresses
+            
+        Returns:
+            Dictionary mapping each sender to (whitelisted, historical_bonus)
+        """
+        whitelisted = set()
+        unwanted = set()
+        if self.db:
+            try:
+                whitelisted = self.db.get_whitelist_set(senders)
+                unwanted = self.db.get_unwanted_set(senders)
+            except Exception as e:
+                self.logger.error(f"Error preloading sender flags: {e}")
+        
+        return {
+            sender: (True, 0) if sender in whitelisted
+            else (False, self.HISTORICAL_UNWANTED_BONUS if sender in unwanted else 0)
+            for sender in senders
+        }
+    
+    def calculate_score_cached(self, email_data: Dict, frequency: int,
+                               whitelisted: bool, historical_bonus: int) -> Tuple[int, Dict]:
+        """Calculate score for an email with pre-resolved sender flags.
+        
+        Same scoring as calculate_score without any database lookups.
+        
+        Args:
+            email_data: Dictionary with email attributes
+                - is_unread: bool (optional)
+                - unsubscribe_links: list (optional)
+            frequency: Number of emails from this sender
+            whitelisted: Whether the sender is whitelisted
+            historical_bonus: Points for a previously unwanted sender
+                
+        Returns:
+            Tuple of (total_score, breakdown_dict), as calculate_score
+        """
         score = 0
         breakdown = {}
         
         # Check if whitelisted (highest priority - score = -1 to indicate protection)
-        if sender and self.db:
-            if self._check_whitelisted(sender):
-                breakdown['whitelisted'] = True
-                breakdown['total'] = -1
-                return (-1, breakdown)
+        if whitelisted:
+            breakdown['whitelisted'] = True
+            breakdown['total'] = -1
+            return (-1, breakdown)
         
         # Check if unread (+1 point)
-        if email_data.get('is_unread', False):
+        if email_data.get('is_unread'):
             score += 1
             breakdown['unread'] = 1
         
@@ -70,15 +135,51 @@ class EmailScorer:
             breakdown['frequency'] = freq_score
         
         # Historical scoring (+5 if previously marked unwanted)
-        if sender and self.db:
-            hist_score = self._check_historical_unwanted(sender)
-            if hist_score > 0:
-                score += hist_score
-                breakdown['historical_unwanted'] = hist_score
+        if historical_bonus > 0:
+            score += historical_bonus
+            breakdown['historical_unwanted'] = historical_bonus
         
         breakdown['total'] = score
         return (score, breakdown)
     
+    def score_counts(self, count: int, unread: int, with_links: int,
+                     whitelisted: bool, historical_bonus: int) -> Dict[str, int]:
+        """Sum the score breakdown for a sender from per-email counts.
+        
+        Every scoring term is either constant per sender or a single point
+        per email, so the summed breakdown needs only these counts. Used by
+        EmailGrouper to score senders while emails stream in.
+        
+        Args:
+            count: Number of emails from the sender
+            unread: How many of them are unread
+            with_links: How many of them have unsubscribe links
+            whitelisted: Whether the sender is whitelisted
+            historical_bonus: Points for a previously unwanted sender
+            
+        Returns:
+            Dictionary with keys total, unread, frequency, has_unsubscribe,
+            historical_unwanted, each summed over the sender's emails
+        """
+        if whitelisted:
+            return {
+                'total': -count,
+                'unread': 0,
+                'frequency': 0,
+                'has_unsubscribe': 0,
+                'historical_unwanted': 0
+            }
+        
+        freq_total = self._calculate_frequency_score(count) * count
+        historical_total = historical_bonus * count
+        return {
+            'total': freq_total + historical_total + unread + with_links,
+            'unread': unread,
+            'frequency': freq_total,
+            'has_unsubscribe': with_links,
+            'historical_unwanted': historical_total
+        }
+    
     def _calculate_frequency_score(self, frequency: int) -> int:
         """Calculate score based on email frequency.
         
@@ -97,11 +198,11 @@ class EmailScorer:
             sender: Sender email address
             
         Returns:
-            5 points if sender in unwanted list, 0 otherwise
+            HISTORICAL_UNWANTED_BONUS if sender in unwanted list, 0 otherwise
         """
         try:
             if self.db.check_unwanted(sender):
-                return 5
+                return self.HISTORICAL_UNWANTED_BONUS
         except Exception as e:
             self.logger.error(f"Error checking historical data: {e}")
         return 0
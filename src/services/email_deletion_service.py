@@ -6,7 +6,8 @@ comprehensive safety checks, progress reporting, and database integration.
 """
 
 import logging
-from typing import List, Dict, Callable, Optional
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Callable, Optional, Tuple
 from threading import Event
 
 
@@ -27,6 +28,10 @@ class EmailDeletionService:
         >>> print(f"Deleted: {results['total_emails_deleted']}")
     """
     
+    # Upper bound on senders deleted at once; the client's
+    # MAX_CONCURRENT_DELETES can lower it further
+    MAX_WORKERS = 8
+    
     def __init__(self, email_client, db_manager):
         """
         Initialize EmailDeletionService with injected dependencies.
@@ -49,7 +54,10 @@ class EmailDeletionService:
         Delete emails from multiple senders.
         
         Deletes all emails from each specified sender, with whitelist
-        safety checks. All deletions are logged to action history.
+        safety checks. All deletions are logged to action history in one
+        transaction once every sender has been processed.
+        Clients that allow concurrent requests get several senders
+        deleted at once (up to MAX_WORKERS); others go one at a time.
         
         Args:
             senders: List of sender dictionaries with 'sender' email address
@@ -83,83 +91,34 @@ class EmailDeletionService:
         if total == 0:
             return results
         
-        # Process each sender
-        for i, sender_data in enumerate(senders):
-            # Check for cancellation
-            if self.cancel_event.is_set():
-                self.logger.info(f"Deletion cancelled at sender {i+1}/{total}")
-                break
-            
-            sender_email = sender_data.get('sender', 'unknown')
-            
-            # Update progress
-            if progress_callback:
-                progress_callback(i, total, f"Deleting from {sender_email}...")
-            
-            try:
-                # Safety check: whitelist
-                if self.db.check_whitelist(sender_email):
-                    self.logger.warning(
-                        f"Skipping deletion from whitelisted sender: {sender_email}"
-                    )
-                    results['skipped_senders'] += 1
-                    continue
-                
-                # Delete emails from this sender
-                self.logger.info(f"Deleting emails from: {sender_email}")
-                deleted_count, message = self.email_client.delete_emails_from_sender(
-                    sender_email, self.db
-                )
-                
-                if deleted_count > 0:
-                    results['deleted_senders'] += 1
-                    results['total_emails_deleted'] += deleted_count
-                    results['deleted_sender_emails'].append(sender_email)  # Track deleted sender
-                    self.logger.info(
-                        f"Deleted {deleted_count} emails from {sender_email}"
-                    )
+        # Action history rows, written in one transaction at the end
+        pending_logs = []
+        workers = min(self.MAX_WORKERS, self.email_client.MAX_CONCURRENT_DELETES, total)
+        try:
+            if workers > 1:
+                self._delete_concurrently(senders, workers, results, pending_logs, progress_callback)
+            else:
+                # Process each sender
+                for i, sender_data in enumerate(senders):
+                    # Check for cancellation
+                    if self.cancel_event.is_set():
+                        self.logger.info(f"Deletion cancelled at sender {i+1}/{total}")
+                        break
                     
-                    # Log successful deletion
-                    self.db.log_action(
-                        sender_email,
-                        'delete',
-                        True,
-                        f'Deleted {deleted_count} emails'
-                    )
+                    sender_email = sender_data.get('sender', 'unknown')
+                    
+                    # Update progress
+                    if progress_callback:
+                        progress_callback(i, total, f"Deleting from {sender_email}...")
                     
-                    # Remove from must-delete list if present
                     try:
-                        self.db.remove_from_must_delete(sender_email)
+                        outcome, deleted_count = self._delete_one(sender_email)
                     except Exception as e:
-                        self.logger.warning(
-                            f"Failed to remove {sender_email} from must-delete list: {e}"
-                        )
-                else:
-                    # No emails found or deletion failed
-                    results['skipped_senders'] += 1
-                    self.logger.info(f"No emails to delete from {sender_email}")
-            
-            except Exception as e:
-                # Handle deletion errors
-                error_msg = str(e)[:100]
-                results['failed_senders'] += 1
-                self.logger.error(
-                    f"Error deleting from {sender_email}: {e}",
-                    exc_info=True
-                )
-                
-                # Log failed deletion
-                try:
-                    self.db.log_action(
-                        sender_email,
-                        'delete',
-                        False,
-                        f'Error: {error_msg}'
-                    )
-                except Exception as log_error:
-                    self.logger.error(
-                        f"Failed to log deletion error for {sender_email}: {log_error}"
-                    )
+                        self._record_failure(results, pending_logs, sender_email, e)
+                    else:
+                        self._record_result(results, pending_logs, sender_email, outcome, deleted_count)
+        finally:
+            self._flush_action_logs(pending_logs)
         
         # Final progress update
         if progress_callback:
@@ -175,6 +134,173 @@ class EmailDeletionService:
         
         return results
     
+    def _delete_concurrently(
+        self,
+        senders: List[Dict],
+        workers: int,
+        results: Dict,
+        pending_logs: List[Tuple[str, str, bool, str]],
+        progress_callback: Optional[Callable[[int, int, str], None]]
+    ):
+        """
+        Delete from several senders at once on a bounded thread pool.
+        
+        Senders own disjoint messages, so their deletions are independent
+        network round trips. Workers only talk to the mail server; results,
+        database logging and progress are all handled on this thread.
+        
+        Args:
+            senders: List of sender dictionaries with 'sender' email address
+            workers: Number of deletions to run at once
+            results: Results dictionary to update in place
+            pending_logs: Action history rows to append to
+            progress_callback: Optional callback function(current, total, message)
+        """
+        total = len(senders)
+        sender_emails = [s.get('sender', 'unknown') for s in senders]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._delete_one, sender_email): sender_email
+                for sender_email in sender_emails
+            }
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                sender_email = futures[future]
+                try:
+                    outcome, deleted_count = future.result()
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    self._record_failure(results, pending_logs, sender_email, e)
+                else:
+                    self._record_result(results, pending_logs, sender_email, outcome, deleted_count)
+                
+                if progress_callback:
+                    progress_callback(done, total, f"Deleted from {sender_email}")
+                
+                if self.cancel_event.is_set():
+                    # Drop senders that have not started yet
+                    pending = sum(f.cancel() for f in futures)
+                    if pending:
+                        self.logger.info(f"Deletion cancelled with {pending}/{total} senders left")
+    
+    def _delete_one(self, sender_email: str) -> Tuple[str, int]:
+        """
+        Delete all emails from one sender after the whitelist safety check.
+        
+        Safe to run on a worker thread: it only reads the whitelist and
+        calls the email client.
+        
+        Args:
+            sender_email: Email address of the sender
+        
+        Returns:
+            Tuple of (outcome, deleted_count) where outcome is 'deleted',
+            'whitelisted' or 'cancelled'
+        
+        Raises:
+            Exception: Any error from the whitelist check or the client
+        """
+        if self.cancel_event.is_set():
+            return ('cancelled', 0)
+        
+        # Safety check: whitelist
+        if self.db.check_whitelist(sender_email):
+            return ('whitelisted', 0)
+        
+        # Delete emails from this sender
+        self.logger.info(f"Deleting emails from: {sender_email}")
+        deleted_count, message = self.email_client.delete_emails_from_sender(
+            sender_email, self.db
+        )
+        return ('deleted', deleted_count)
+    
+    def _record_result(self, results: Dict, pending_logs: List[Tuple[str, str, bool, str]],
+                       sender_email: str, outcome: str, deleted_count: int):
+        """
+        Count a finished sender and queue a log row for successful deletions.
+        
+        Args:
+            results: Results dictionary to update in place
+            pending_logs: Action history rows to append to
+            sender_email: Email address of the sender
+            outcome: Outcome from _delete_one
+            deleted_count: Number of emails deleted
+        """
+        if outcome == 'cancelled':
+            return
+        
+        if outcome == 'whitelisted':
+            self.logger.warning(
+                f"Skipping deletion from whitelisted sender: {sender_email}"
+            )
+            results['skipped_senders'] += 1
+            return
+        
+        if deleted_count > 0:
+            results['deleted_senders'] += 1
+            results['total_emails_deleted'] += deleted_count
+            results['deleted_sender_emails'].append(sender_email)  # Track deleted sender
+            self.logger.info(
+                f"Deleted {deleted_count} emails from {sender_email}"
+            )
+            
+            # Log successful deletion
+            pending_logs.append(
+                (sender_email, 'delete', True, f'Deleted {deleted_count} emails')
+            )
+            
+            # Remove from must-delete list if present
+            try:
+                self.db.remove_from_must_delete(sender_email)
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to remove {sender_email} from must-delete list: {e}"
+                )
+        else:
+            # No emails found or deletion failed
+            results['skipped_senders'] += 1
+            self.logger.info(f"No emails to delete from {sender_email}")
+    
+    def _record_failure(self, results: Dict, pending_logs: List[Tuple[str, str, bool, str]],
+                        sender_email: str, error: Exception):
+        """
+        Count a failed sender and queue a log row for the failure.
+        
+        Args:
+            results: Results dictionary to update in place
+            pending_logs: Action history rows to append to
+            sender_email: Email address of the sender
+            error: Exception raised while deleting
+        """
+        # Handle deletion errors
+        error_msg = str(error)[:100]
+        results['failed_senders'] += 1
+        self.logger.error(
+            f"Error deleting from {sender_email}: {error}",
+            exc_info=error
+        )
+        
+        # Log failed deletion
+        pending_logs.append((sender_email, 'delete', False, f'Error: {error_msg}'))
+    
+    def _flush_action_logs(self, pending_logs: List[Tuple[str, str, bool, str]]):
+        """
+        Write queued action history rows in a single transaction.
+        
+        Args:
+            pending_logs: (sender_email, action_type, success, details) rows
+        """
+        if not pending_logs:
+            return
+        try:
+            self.db.log_actions_bulk(pending_logs)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to log {len(pending_logs)} deletion actions: {e}"
+            )
+    
     def delete_from_must_delete_list(
         self,
         progress_callback: Optional[Callable[[int, int, str], None]] = None
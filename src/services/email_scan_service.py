@@ -7,8 +7,9 @@ cancellation, and error handling.
 """
 
 import logging
+import time
 from typing import List, Dict, Callable, Optional
-from threading import Event
+from threading import Event, Lock
 
 
 class EmailScanService:
@@ -26,6 +27,9 @@ class EmailScanService:
         >>> print(f"Found {len(senders)} unique senders")
     """
     
+    # Minimum seconds between progress callbacks while parsing
+    PROGRESS_INTERVAL = 0.2
+    
     def __init__(self, email_client, db_manager, parser, scorer, grouper):
         """
         Initialize EmailScanService with injected dependencies.
@@ -45,19 +49,21 @@ class EmailScanService:
         self.logger = logging.getLogger(__name__)
         self.cancel_event = Event()
     
-    def scan_inbox(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> List[Dict]:
+    def scan_inbox(self, progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                   top_k: Optional[int] = None) -> List[Dict]:
         """
         Scan inbox and return grouped sender data.
         
         Orchestrates the complete scan process:
         1. Fetch email IDs from client
-        2. Fetch and parse email headers
+        2. Fetch email headers in batches and parse them
         3. Group emails by sender
         4. Calculate scores for each sender
         
         Args:
             progress_callback: Optional callback function(current, total, message)
                                Called periodically to report progress
+            top_k: Only return this many highest-scoring senders (default: all)
         
         Returns:
             List of sender dictionaries with aggregated stats and scores.
@@ -85,43 +91,74 @@ class EmailScanService:
             
             self.logger.info(f"Found {total} emails to process")
             
-            # Parse emails
-            emails = []
+            # Parse emails straight into per-sender totals so only one
+            # small accumulator per sender is kept, not every parsed email
+            accumulators = {}
+            parsed = 0
             parse_errors = 0
+            last_progress = time.monotonic()
+            log_parse_errors = self.logger.isEnabledFor(logging.DEBUG)
+            
+            fetched = 0
+            progress_lock = Lock()
+            
+            def on_chunk(count):
+                # Runs after each server round trip, possibly on the client's
+                # pool threads. Progress is throttled to one update per
+                # PROGRESS_INTERVAL; returning False stops the batch early.
+                nonlocal fetched, last_progress
+                with progress_lock:
+                    fetched += count
+                    now = time.monotonic()
+                    if progress_callback and now - last_progress >= self.PROGRESS_INTERVAL:
+                        last_progress = now
+                        progress_callback(fetched, total, f"Processing {fetched:,} of {total:,}")
+                return not self.cancel_event.is_set()
             
-            for i, email_id in enumerate(email_ids):
+            # Headers are requested in the client's preferred batch size; both
+            # clients serve a multi-ID request in bulk and keep ID order
+            batch_size = self.email_client.HEADER_BATCH_SIZE
+            for start in range(0, total, batch_size):
                 # Check for cancellation
                 if self.cancel_event.is_set():
-                    self.logger.info(f"Scan cancelled at email {i+1}/{total}")
+                    self.logger.info(f"Scan cancelled at email {start+1}/{total}")
                     break
                 
+                chunk = email_ids[start:start + batch_size]
                 try:
-                    # Fetch headers for this email
-                    headers = self.email_client.fetch_headers([email_id])
-                    if headers:
-                        # Parse email data
-                        email_data = self.parser.parse_email(headers[0])
-                        emails.append(email_data)
+                    headers = self.email_client.fetch_headers(chunk, on_chunk=on_chunk) or []
                 except Exception as e:
-                    # Log parse errors but continue processing
-                    parse_errors += 1
-                    self.logger.warning(f"Error parsing email {email_id}: {e}")
-                    continue
+                    # Count the whole batch as failed but keep scanning
+                    parse_errors += len(chunk)
+                    self.logger.warning(f"Error fetching headers for {len(chunk)} emails: {e}")
+                    headers = []
+                
+                for header in headers:
+                    try:
+                        # Parse email data
+                        email_data = self.parser.parse_email(header)
+                        self.grouper.accumulate(accumulators, email_data)
+                        parsed += 1
+                    except Exception as e:
+                        # Count parse errors (summarized below) and keep going
+                        parse_errors += 1
+                        if log_parse_errors:
+                            self.logger.debug(f"Error parsing email: {e}")
                 
-                # Update progress periodically (every 50 emails)
-                if progress_callback and i % 50 == 0:
-                    progress_callback(i + 1, total, f"Processing {i+1:,} of {total:,}")
+                # Count whatever the client did not report per round trip
+                if not self.cancel_event.is_set():
+                    on_chunk(start + len(chunk) - fetched)
             
             # Log any parse errors
             if parse_errors > 0:
-                self.logger.warning(f"Failed to parse {parse_errors} emails")
+                self.logger.warning(f"Failed to parse {parse_errors}/{total} emails")
             
             # Check if cancelled before grouping
             if self.cancel_event.is_set():
-                self.logger.info(f"Scan cancelled. Processed {len(emails)} emails before cancellation")
+                self.logger.info(f"Scan cancelled. Processed {parsed} emails before cancellation")
                 # Return partial results
-                if emails:
-                    senders = self.grouper.group_by_sender(emails)
+                if accumulators:
+                    senders = self.grouper.finalize(accumulators, top_k)
                     return senders
                 return []
             
@@ -129,8 +166,8 @@ class EmailScanService:
             if progress_callback:
                 progress_callback(total, total, "Analyzing senders...")
             
-            self.logger.info(f"Grouping {len(emails)} emails by sender")
-            senders = self.grouper.group_by_sender(emails)
+            self.logger.info(f"Scoring {len(accumulators)} senders from {parsed} emails")
+            senders = self.grouper.finalize(accumulators, top_k)
             
             self.logger.info(f"Scan complete: {len(senders)} unique senders found")
             return senders
@@ -7,7 +7,7 @@ reporting, and cancellation support.
 """
 
 import logging
-from typing import List, Dict, Callable, Optional
+from typing import List, Dict, Callable, Optional, Set, Tuple
 from threading import Event
 
 
@@ -51,8 +51,9 @@ class UnsubscribeService:
         Unsubscribe from multiple senders using strategy chain.
         
         Attempts to unsubscribe from each sender, checking whitelist first
-        and trying available strategies. All attempts are logged to the
-        action history.
+        and trying available strategies. The whitelist is looked up for
+        all senders in one query, and failed attempts are logged to the
+        action history in one transaction once every sender is processed.
         
         Args:
             senders: List of sender dictionaries with 'sender' email and
@@ -88,73 +89,74 @@ class UnsubscribeService:
         if total == 0:
             return results
         
-        # Process each sender
-        for i, sender_data in enumerate(senders):
-            # Check for cancellation
-            if self.cancel_event.is_set():
-                self.logger.info(f"Unsubscribe cancelled at sender {i+1}/{total}")
-                results['details'].append("Operation cancelled by user")
-                break
-            
-            sender_email = sender_data.get('sender', 'unknown')
-            
-            # Update progress
-            if progress_callback:
-                progress_callback(i, total, f"Processing {sender_email}...")
-            
-            try:
-                # Check if whitelisted
-                if self.db.check_whitelist(sender_email):
-                    self.logger.info(f"Skipping whitelisted sender: {sender_email}")
-                    results['skipped_count'] += 1
-                    results['details'].append(f"{sender_email}: Skipped (whitelisted)")
-                    continue
+        # One whitelist query for the whole batch; action history rows are
+        # written in one transaction at the end
+        whitelist = self._load_whitelist(senders)
+        pending_logs = []
+        try:
+            # Process each sender
+            for i, sender_data in enumerate(senders):
+                # Check for cancellation
+                if self.cancel_event.is_set():
+                    self.logger.info(f"Unsubscribe cancelled at sender {i+1}/{total}")
+                    results['details'].append("Operation cancelled by user")
+                    break
                 
-                # Check if sender has unsubscribe method
-                has_unsubscribe = (
-                    sender_data.get('list_unsubscribe') or 
-                    sender_data.get('unsubscribe_links')
-                )
+                sender_email = sender_data.get('sender', 'unknown')
                 
-                if not has_unsubscribe:
-                    self.logger.info(f"No unsubscribe method for: {sender_email}")
-                    results['skipped_count'] += 1
-                    results['details'].append(f"{sender_email}: No unsubscribe method found")
-                    # Log as failed attempt
-                    self.db.log_action(
-                        sender_email, 
-                        'unsubscribe', 
-                        False, 
-                        'No unsubscribe method available'
-                    )
-                    continue
+                # Update progress
+                if progress_callback:
+                    progress_callback(i, total, f"Processing {sender_email}...")
                 
-                # Attempt unsubscribe via strategy chain
-                self.logger.info(f"Attempting unsubscribe for: {sender_email}")
-                success, message, strategy = self.strategy_chain.execute(sender_data)
+                try:
+                    # Check if whitelisted
+                    if self._is_whitelisted(sender_email, whitelist):
+                        self.logger.info(f"Skipping whitelisted sender: {sender_email}")
+                        results['skipped_count'] += 1
+                        results['details'].append(f"{sender_email}: Skipped (whitelisted)")
+                        continue
+                    
+                    # Check if sender has unsubscribe method
+                    has_unsubscribe = (
+                        sender_data.get('list_unsubscribe') or 
+                        sender_data.get('unsubscribe_links')
+                    )
+                    
+                    if not has_unsubscribe:
+                        self.logger.info(f"No unsubscribe method for: {sender_email}")
+                        results['skipped_count'] += 1
+                        results['details'].append(f"{sender_email}: No unsubscribe method found")
+                        # Log as failed attempt
+                        pending_logs.append(
+                            (sender_email, 'unsubscribe', False, 'No unsubscribe method available')
+                        )
+                        continue
+                    
+                    # Attempt unsubscribe via strategy chain
+                    self.logger.info(f"Attempting unsubscribe for: {sender_email}")
+                    success, message, strategy = self.strategy_chain.execute(sender_data)
+                    
+                    if success:
+                        results['success_count'] += 1
+                        results['successful_senders'].append(sender_email)
+                        results['details'].append(f"{sender_email}: Success ({strategy})")
+                        self.logger.info(f"Successfully unsubscribed from {sender_email} using {strategy}")
+                    else:
+                        results['failed_count'] += 1
+                        results['details'].append(f"{sender_email}: Failed - {message}")
+                        self.logger.warning(f"Failed to unsubscribe from {sender_email}: {message}")
                 
-                if success:
-                    results['success_count'] += 1
-                    results['successful_senders'].append(sender_email)
-                    results['details'].append(f"{sender_email}: Success ({strategy})")
-                    self.logger.info(f"Successfully unsubscribed from {sender_email} using {strategy}")
-                else:
+                except Exception as e:
+                    # Handle unexpected errors
+                    error_msg = f"Unexpected error: {str(e)[:100]}"
                     results['failed_count'] += 1
-                    results['details'].append(f"{sender_email}: Failed - {message}")
-                    self.logger.warning(f"Failed to unsubscribe from {sender_email}: {message}")
-            
-            except Exception as e:
-                # Handle unexpected errors
-                error_msg = f"Unexpected error: {str(e)[:100]}"
-                results['failed_count'] += 1
-                results['details'].append(f"{sender_email}: Error - {error_msg}")
-                self.logger.error(f"Error processing {sender_email}: {e}", exc_info=True)
-                
-                # Log to action history
-                try:
-                    self.db.log_action(sender_email, 'unsubscribe', False, error_msg)
-                except Exception as log_error:
-                    self.logger.error(f"Failed to log error for {sender_email}: {log_error}")
+                    results['details'].append(f"{sender_email}: Error - {error_msg}")
+                    self.logger.error(f"Error processing {sender_email}: {e}", exc_info=True)
+                    
+                    # Log to action history
+                    pending_logs.append((sender_email, 'unsubscribe', False, error_msg))
+        finally:
+            self._flush_action_logs(pending_logs)
         
         # Final progress update
         if progress_callback:
@@ -168,6 +170,54 @@ class UnsubscribeService:
         
         return results
     
+    def _load_whitelist(self, senders: List[Dict]) -> Optional[Set[str]]:
+        """
+        Look up which senders are whitelisted in a single query.
+        
+        Args:
+            senders: List of sender dictionaries with 'sender' email address
+        
+        Returns:
+            Set of whitelisted sender emails, or None if the lookup failed
+            and each sender must be checked on its own
+        """
+        try:
+            return self.db.get_whitelist_set([s.get('sender', 'unknown') for s in senders])
+        except Exception as e:
+            self.logger.error(f"Bulk whitelist lookup failed, checking senders one by one: {e}")
+            return None
+    
+    def _is_whitelisted(self, sender_email: str, whitelist: Optional[Set[str]]) -> bool:
+        """
+        Check a sender against the preloaded whitelist.
+        
+        Args:
+            sender_email: Email address of the sender
+            whitelist: Result of _load_whitelist
+        
+        Returns:
+            True if the sender is whitelisted
+        """
+        if whitelist is None:
+            return self.db.check_whitelist(sender_email)
+        return sender_email in whitelist
+    
+    def _flush_action_logs(self, pending_logs: List[Tuple[str, str, bool, str]]):
+        """
+        Write queued action history rows in a single transaction.
+        
+        Args:
+            pending_logs: (sender_email, action_type, success, details) rows
+        """
+        if not pending_logs:
+            return
+        try:
+            self.db.log_actions_bulk(pending_logs)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to log {len(pending_logs)} unsubscribe actions: {e}"
+            )
+    
     def cancel(self):
         """
         Cancel ongoing unsubscribe operation.
@@ -19,8 +19,13 @@ class FilterableTreeview:
         self.filter_entries = {}
         self.filter_vars = {}
         self.all_items = []  # Store all data for filtering
+        self._all_iids = []  # Tree item ID for each entry in all_items
+        self._filter_rows = None  # (item ID, lowercased values) per stored item
+        self._last_filters = None  # Filters behind _last_matches
+        self._last_matches = []  # Rows matched by the last apply_filters()
         self.filter_logger = logging.getLogger(__name__)
         self._resize_timer = None  # For debouncing resize events
+        self._filter_timer = None  # For debouncing filter keystrokes
         
     def create_filter_row(self, parent, tree, columns):
         """
@@ -138,9 +143,26 @@ class FilterableTreeview:
         var.set('')
     
     def _on_filter_change(self, column_id):
-        """Handle filter text change for a column."""
+        """Handle filter text change for a column (debounced)."""
+        self._cancel_pending_filter()
+        
+        # Wait for a pause in typing so a burst of keystrokes filters once
+        self._filter_timer = self.tree_ref.after(120, self._do_apply_filters)
+    
+    def _do_apply_filters(self):
+        """Run the filter scheduled by _on_filter_change."""
+        self._filter_timer = None
         self.apply_filters()
     
+    def _cancel_pending_filter(self):
+        """Cancel a scheduled filter that has not run yet."""
+        if self._filter_timer:
+            try:
+                self.tree_ref.after_cancel(self._filter_timer)
+            except:
+                pass
+            self._filter_timer = None
+    
     def apply_filters(self):
         """Apply all active filters to the treeview."""
         if not hasattr(self, 'tree') or not hasattr(self, 'sender_data'):
@@ -160,68 +182,108 @@ class FilterableTreeview:
         
         self.filter_logger.debug(f"Applying filters: {filters}")
         
-        # Clear current tree items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Clear sender_data before repopulating
-        self.sender_data.clear()
-        
         # If no filters, restore all items
         if not filters:
+            self._last_filters = None
             self._restore_all_items()
             self.filter_logger.debug(f"Restored all {len(self.all_items)} items")
             return
         
-        # Apply filters to stored data
-        filtered_count = 0
-        for data in self.all_items:
-            try:
-                if self._item_matches_filters(data, filters):
-                    # Re-insert matching item
-                    values = self._data_to_values(data)
-                    if values:
-                        tags = self._get_item_tags(data)
-                        new_id = self.tree.insert('', tk.END, values=values, tags=tags)
-                        self.sender_data[new_id] = data
-                        filtered_count += 1
-            except Exception as e:
-                self.filter_logger.error(f"Error filtering item: {e}")
-                continue
-        
-        self.filter_logger.debug(f"Applied filters: {filtered_count} of {len(self.all_items)} items match")
+        # Resolve filtered columns to value positions once per keystroke
+        col_index = {col_id: i for i, col_id in enumerate(self.tree['columns'])}
+        filter_list = [
+            (col_index[col_id], text) for col_id, text in filters.items() if col_id in col_index
+        ]
+        
+        # Typing more of a filter can only narrow the result, so only the
+        # rows matched last time need checking again
+        if self._narrows_last_filters(filters):
+            rows = self._last_matches
+        else:
+            rows = self._get_filter_rows()
+        
+        matches = [row for row in rows if row[1] and row[0] in self.sender_data]
+        
+        # One pass per filter keeps the per-row test a bare substring check,
+        # and each pass only sees rows that survived the previous ones
+        for i, text in filter_list:
+            matches = [row for row in matches if i >= len(row[1]) or text in row[1][i]]
+        self._last_filters = filters
+        self._last_matches = matches
+        
+        # Rows keep their item IDs; hide everything, then reattach the matches
+        visible = [item_id for item_id, values_lower in matches]
+        self._show_only(visible)
+        
+        self.filter_logger.debug(f"Applied filters: {len(visible)} of {len(self.all_items)} items match")
     
-    def _item_matches_filters(self, data, filters: Dict[str, str]) -> bool:
+    def _narrows_last_filters(self, filters: Dict[str, str]) -> bool:
         """
-        Check if an item matches all active filters.
+        Check whether filters can only match a subset of the last result.
+        
+        True when every previous filter is still set and its text is
+        contained in the new text for that column; new columns may be added.
         
         Args:
-            data: Item data dictionary
-            filters: Dictionary of column_id -> filter_text
+            filters: Lowercased filter text by column ID
             
         Returns:
-            True if item matches all filters
+            True if filtering the last matches gives the full result
         """
-        # Get column values
-        values = self._data_to_values(data)
-        if not values:
+        if self._last_filters is None:
             return False
+        return all(
+            col_id in filters and text in filters[col_id]
+            for col_id, text in self._last_filters.items()
+        )
+    
+    def _show_only(self, item_ids: List[str]):
+        """
+        Attach the given items in order and detach every other row.
         
-        # Map column IDs to their position
-        columns = list(self.tree['columns'])
-        
-        # Check each filter
-        for col_id, filter_text in filters.items():
+        Args:
+            item_ids: IDs of rows to show, in display order
+        """
+        self.tree.detach(*self.tree.get_children())
+        for item_id in item_ids:
             try:
-                col_index = columns.index(col_id)
-                if col_index < len(values):
-                    cell_value = str(values[col_index]).lower()
-                    if filter_text not in cell_value:
-                        return False
-            except (ValueError, IndexError):
-                continue
-        
-        return True
+                self.tree.reattach(item_id, '', tk.END)
+            except Exception as e:
+                self.filter_logger.error(f"Error filtering item: {e}")
+        
+        # Hidden rows must not stay selected behind the filter
+        shown = set(item_ids)
+        hidden_selected = [item_id for item_id in self.tree.selection() if item_id not in shown]
+        if hidden_selected:
+            self.tree.selection_remove(*hidden_selected)
+    
+    def _get_filter_rows(self) -> List[tuple]:
+        """
+        Get lowercased display values for every stored item.
+        
+        Built on the first filter after store_all_items() and reused for
+        later keystrokes, so each row is formatted and lowercased once.
+        
+        Returns:
+            List of (item_id, lowercased values) tuples
+        """
+        rows = self._filter_rows
+        if rows is None or len(rows) != len(self.all_items):
+            rows = []
+            for item_id, data in zip(self._all_iids, self.all_items):
+                try:
+                    values = self._data_to_values(data)
+                except Exception as e:
+                    self.filter_logger.error(f"Error filtering item: {e}")
+                    values = ()
+                rows.append((item_id, tuple(str(v).lower() for v in values)))
+            self._filter_rows = rows
+        return rows
+    
+    def invalidate_filter_cache(self):
+        """Forget cached row values after stored item data changes in place."""
+        self._filter_rows = None
+        self._last_filters = None
     
     def _data_to_values(self, data: Dict) -> tuple:
         """
@@ -255,26 +317,44 @@ class FilterableTreeview:
         """Restore all items to the treeview."""
         if not hasattr(self, 'sender_data'):
             return
-            
-        self.sender_data.clear()
         
-        for data in self.all_items:
-            values = self._data_to_values(data)
-            tags = self._get_item_tags(data)
-            new_id = self.tree.insert('', tk.END, values=values, tags=tags)
-            self.sender_data[new_id] = data
+        self._show_only([item_id for item_id in self._all_iids if item_id in self.sender_data])
+    
+    def get_visible_items(self) -> List[Dict]:
+        """
+        Get data for the rows currently shown, in display order.
+        
+        Rows hidden by a filter are detached but stay in sender_data, so
+        callers acting on "everything in the table" should use this.
+        
+        Returns:
+            List of data dictionaries for attached rows
+        """
+        return [
+            self.sender_data[item_id] for item_id in self.tree.get_children()
+            if item_id in self.sender_data
+        ]
     
     def store_all_items(self):
         """Store current tree items for filtering."""
         self.all_items = []
+        self._all_iids = []
+        self._filter_rows = None
+        self._last_filters = None
         
         if not hasattr(self, 'tree') or not hasattr(self, 'sender_data'):
             return
         
-        # Store just the data, not the item IDs (which become invalid after tree clear)
-        for item_id in self.tree.get_children():
+        # Filtered-out rows are detached, not deleted, so they are missing
+        # from get_children() but still keyed in sender_data
+        item_ids = list(self.tree.get_children())
+        attached = set(item_ids)
+        item_ids.extend(item_id for item_id in self.sender_data if item_id not in attached)
+        
+        for item_id in item_ids:
             if item_id in self.sender_data:
-                self.all_items.append(self.sender_data[item_id].copy())
+                self._all_iids.append(item_id)
+                self.all_items.append(self.sender_data[item_id])
         
         self.filter_logger.debug(f"Stored {len(self.all_items)} items for filtering")
     
@@ -283,6 +363,9 @@ class FilterableTreeview:
         for var in self.filter_vars.values():
             var.set('')
         
+        # Restoring below makes the filter queued by the writes redundant
+        self._cancel_pending_filter()
+        
         # Restore all items
         self._restore_all_items()
         
@@ -60,6 +60,7 @@ class MainWindow:
         self._create_menu_bar()
         self._create_main_content()
         self._create_status_bar()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self.logger.info("Main window initialized")
     
@@ -75,9 +76,15 @@ class MainWindow:
         return create_email_client(
             account=account,
             auth_factory=self.auth_factory,
-            oauth_manager=self.oauth_manager
+            oauth_manager=self.oauth_manager,
+            header_cache=self.db.header_cache
         )
     
+    def _on_close(self):
+        """Stop the background token refresher and close the window."""
+        self.oauth_manager.stop_refresher(timeout=1)
+        self.root.destroy()
+    
     def _center_window(self):
         """Center window on screen."""
         self.root.update_idletasks()
@@ -98,7 +105,7 @@ class MainWindow:
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Add Account", command=self._add_account)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self._on_close)
         
         # Settings menu
         settings_menu = tk.Menu(menubar, tearoff=0)
@@ -546,7 +553,7 @@ class MainWindow:
                 # Update statistics
                 current_senders = []
                 if hasattr(self.sender_table, 'sender_data'):
-                    current_senders = list(self.sender_table.sender_data.values())
+                    current_senders = self.sender_table.get_visible_items()
                 self.update_statistics(current_senders)
                 
                 # Show status in status bar
@@ -669,7 +676,7 @@ class MainWindow:
                 # Update statistics
                 current_senders = []
                 if hasattr(self.sender_table, 'sender_data'):
-                    current_senders = list(self.sender_table.sender_data.values())
+                    current_senders = self.sender_table.get_visible_items()
                 self.update_statistics(current_senders)
                 
                 # Show status in status bar
@@ -796,7 +803,7 @@ class MainWindow:
                 # Update statistics
                 current_senders = []
                 if hasattr(self.sender_table, 'sender_data'):
-                    current_senders = list(self.sender_table.sender_data.values())
+                    current_senders = self.sender_table.get_visible_items()
                 self.update_statistics(current_senders)
                 
                 # Show status in status bar
@@ -1213,7 +1220,7 @@ Note: App passwords are more secure than regular passwords for applications like
                 # Update statistics
                 current_senders = []
                 if hasattr(self.sender_table, 'sender_data'):
-                    current_senders = list(self.sender_table.sender_data.values())
+                    current_senders = self.sender_table.get_visible_items()
                 self.update_statistics(current_senders)
                 
                 # Update status bar
@@ -1441,7 +1448,7 @@ Note: App passwords are more secure than regular passwords for applications like
             # Update statistics
             current_senders = []
             if hasattr(self.sender_table, 'sender_data'):
-                current_senders = list(self.sender_table.sender_data.values())
+                current_senders = self.sender_table.get_visible_items()
             self.update_statistics(current_senders)
             
             self.status_bar.config(text=f"Added {sender_email} to must delete list")
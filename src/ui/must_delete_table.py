@@ -129,14 +129,14 @@ class MustDeleteTable(FilterableTreeview):
         Get all sender data in the table.
         
         Returns:
-            List of all sender dictionaries
+            List of sender dictionaries for rows not hidden by a filter
         """
-        return list(self.sender_data.values())
+        return self.get_visible_items()
     
     def clear(self):
         """Clear all items from the table."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Include rows detached by an active filter
+        self.tree.delete(*self.sender_data)
         self.sender_data.clear()
     
     def remove_selected(self):
@@ -28,7 +28,9 @@ class GmailOAuthDialog(tk.Toplevel):
         self.email = email
         self.db = db_manager
         self.cred = cred_manager
-        self.oauth_manager = OAuthCredentialManager(db_manager, cred_manager)
+        self.oauth_manager = OAuthCredentialManager(
+            db_manager, cred_manager, background_refresh=False
+        )
         self.gmail_oauth = GmailOAuthManager()
         self.success = False
         self.logger = logging.getLogger(__name__)
@@ -278,8 +278,8 @@ class SenderTable(FilterableTreeview):
     
     def clear(self):
         """Clear all items from the table."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Include rows detached by an active filter
+        self.tree.delete(*self.sender_data)
         self.sender_data.clear()
         self.score_breakdowns.clear()
         self._hide_tooltip()
@@ -372,6 +372,7 @@ class SenderTable(FilterableTreeview):
                 
                 # Update stored data
                 sender_data['status'] = status
+                self.invalidate_filter_cache()
                 
                 self.logger.debug(f"Updated status for {sender_email} to {status}")
                 break
@@ -10,6 +10,7 @@ from tkinter import ttk, messagebox
 import re
 import logging
 from src.email_client.imap_client import IMAPClient
+from src.email_client.imap_connection import detect_provider
 from src.email_client.credentials import CredentialManager
 from src.email_client.gmail_oauth import OAuthCredentialManager
 from src.email_client.auth import AuthStrategyFactory
@@ -32,7 +33,9 @@ class AccountDialog(tk.Toplevel):
         super().__init__(parent)
         self.db = db_manager
         self.cred = cred_manager
-        self.oauth_manager = OAuthCredentialManager(db_manager, cred_manager)
+        self.oauth_manager = OAuthCredentialManager(
+            db_manager, cred_manager, background_refresh=False
+        )
         self.auth_factory = AuthStrategyFactory(cred_manager, self.oauth_manager)
         self.connection_tested = False
         self.is_gmail = False
@@ -199,15 +202,8 @@ class AccountDialog(tk.Toplevel):
         Returns:
             Provider name ('gmail' or 'outlook')
         """
-        email_lower = email.lower()
-        
-        if email_lower.endswith(('@gmail.com', '@googlemail.com')):
-            return 'gmail'
-        elif email_lower.endswith(('@outlook.com', '@hotmail.com', '@live.com')):
-            return 'outlook'
-        else:
-            # Default to gmail for unknown providers
-            return 'gmail'
+        # Default to gmail for unknown providers
+        return detect_provider(email) or 'gmail'
     
     def _update_info_text(self):
         """Update info text based on provider and auth method."""
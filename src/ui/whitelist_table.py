@@ -131,14 +131,14 @@ class WhitelistTable(FilterableTreeview):
         Get all entry data in the table.
         
         Returns:
-            List of all entry dictionaries
+            List of entry dictionaries for rows not hidden by a filter
         """
-        return list(self.entry_data.values())
+        return self.get_visible_items()
     
     def clear(self):
         """Clear all items from the table."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Include rows detached by an active filter
+        self.tree.delete(*self.sender_data)
         self.entry_data.clear()
     
     def remove_selected(self):
@@ -69,7 +69,7 @@ def mock_imap_connection():
     connection.select.return_value = ('OK', [b'100'])  # 100 emails in INBOX
     connection.search.return_value = ('OK', [b'1 2 3 4 5'])  # 5 email IDs
     connection.fetch.return_value = ('OK', [
-        (b'1 (RFC822.HEADER {200}', b'From: test@example.com\r\nSubject: Test\r\n\r\n'),
+        (b'1 (BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {200}', b'From: test@example.com\r\nSubject: Test\r\n\r\n'),
         b')'
     ])
     connection.logout.return_value = ('BYE', [b'Logging out'])
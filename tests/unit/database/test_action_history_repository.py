@@ -181,6 +181,50 @@ class TestActionHistoryRepository:
         assert reasons[1]['reason'] == 'Invalid URL'
         assert reasons[1]['count'] == 2
     
+    def test_get_top_failure_senders(self, history_repo):
+        """Test failing senders are counted and ranked in SQL."""
+        for _ in range(3):
+            history_repo.log_unsubscribe_attempt('a@example.com', 'HTTP', False, 'Timeout')
+        history_repo.log_unsubscribe_attempt('b@example.com', 'HTTP', False, 'Invalid URL')
+        history_repo.log_unsubscribe_attempt('c@example.com', 'HTTP', True, 'Success')
+        history_repo.log_action('c@example.com', 'delete', False, 'Failed')
+        
+        assert history_repo.get_top_failure_senders(limit=5) == [
+            {'sender_email': 'a@example.com', 'count': 3},
+            {'sender_email': 'b@example.com', 'count': 1},
+        ]
+        assert len(history_repo.get_top_failure_senders(limit=1)) == 1
+    
+    def test_get_failure_reasons_for(self, history_repo):
+        """Test failure details are capped per sender, most recent first."""
+        for i in range(4):
+            history_repo.log_unsubscribe_attempt('a@example.com', 'HTTP', False, f'Error {i}')
+        history_repo.log_unsubscribe_attempt('b@example.com', 'HTTP', False, 'Invalid URL')
+        history_repo.log_unsubscribe_attempt('c@example.com', 'HTTP', False, 'Timeout')
+        
+        reasons = history_repo.get_failure_reasons_for(['a@example.com', 'b@example.com'], 2)
+        
+        assert reasons == {
+            'a@example.com': ['Strategy: HTTP - Error 3', 'Strategy: HTTP - Error 2'],
+            'b@example.com': ['Strategy: HTTP - Invalid URL'],
+        }
+        assert history_repo.get_failure_reasons_for([]) == {}
+    
+    def test_log_actions_bulk(self, history_repo):
+        """Test bulk logging writes every row like individual log_action calls."""
+        history_repo.log_actions_bulk([
+            ('a@example.com', 'delete', True, 'Deleted 3 emails'),
+            ('b@example.com', 'delete', False, 'Error: timeout'),
+        ])
+        history_repo.log_actions_bulk([])
+        
+        actions = {a['sender_email']: a for a in history_repo.get_action_history()}
+        
+        assert len(actions) == 2
+        assert actions['a@example.com']['success'] == 1
+        assert actions['a@example.com']['details'] == 'Deleted 3 emails'
+        assert actions['b@example.com']['success'] == 0
+    
     def test_get_actions_for_sender(self, history_repo):
         """Test getting all actions for specific sender."""
         # Log actions for multiple senders
@@ -225,4 +225,10 @@ class TestBaseRepository:
         # Verify data committed
         result = base_repo._fetch_one("SELECT * FROM test_table WHERE id = ?", (1,))
         assert result == (1, 'test', 100)
-
+    
+    def test_get_connection_sets_synchronous_normal(self, base_repo):
+        """Test every repository connection runs with synchronous=NORMAL."""
+        with base_repo._get_connection() as conn:
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        
+        assert synchronous == 1  # NORMAL
@@ -265,4 +265,15 @@ class TestDBManagerFacade:
                 os.unlink(empty_db)
             except:
                 pass
-
+    
+    def test_initialize_db_enables_wal(self, tmp_path):
+        """Test initialize_db switches the database to WAL journaling."""
+        db = DBManager(str(tmp_path / 'wal.db'))
+        db.initialize_db('src/database/schema.sql')
+        
+        with db.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        
+        assert mode == 'wal'
+        assert synchronous == 1  # NORMAL
@@ -0,0 +1,106 @@
+"""Tests for HeaderCacheRepository class."""
+
+import pytest
+import tempfile
+import os
+import sqlite3
+from unittest.mock import patch
+from src.database.header_cache_repository import HeaderCacheRepository
+
+
+@pytest.fixture
+def temp_db():
+    """Create a temporary database with header_cache table."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    # Initialize with header_cache table
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE header_cache (
+            account TEXT NOT NULL,
+            uid INTEGER NOT NULL,
+            uidvalidity INTEGER NOT NULL,
+            sender TEXT,
+            subject TEXT,
+            date TEXT,
+            PRIMARY KEY (account, uid)
+        )
+    """)
+    conn.commit()
+    conn.close()
+    
+    yield path
+    
+    # Cleanup
+    try:
+        os.unlink(path)
+    except:
+        pass
+
+
+@pytest.fixture
+def cache_repo(temp_db):
+    """Create a HeaderCacheRepository instance."""
+    return HeaderCacheRepository(temp_db)
+
+
+class TestHeaderCacheRepository:
+    """Tests for HeaderCacheRepository class."""
+    
+    def test_store_and_get_headers(self, cache_repo):
+        """Test stored rows are returned for matching UIDs only."""
+        cache_repo.store_headers('me@x.com', 7, [
+            (101, 'a@x.com', 'One', 'Mon, 1 Jan 2024'),
+            (102, 'b@x.com', 'Two', ''),
+        ])
+        
+        headers = cache_repo.get_headers('me@x.com', 7, [101, 103])
+        
+        assert headers == {101: ('a@x.com', 'One', 'Mon, 1 Jan 2024')}
+    
+    def test_accounts_are_isolated(self, cache_repo):
+        """Test UIDs are scoped to the account that cached them."""
+        cache_repo.store_headers('me@x.com', 7, [(101, 'a@x.com', 'One', '')])
+        
+        assert cache_repo.get_headers('other@x.com', 7, [101]) == {}
+    
+    def test_uidvalidity_change_purges_account(self, cache_repo):
+        """Test rows cached under an old UIDVALIDITY are dropped on lookup."""
+        cache_repo.store_headers('me@x.com', 7, [(101, 'a@x.com', 'One', '')])
+        
+        assert cache_repo.get_headers('me@x.com', 8, [101]) == {}
+        assert cache_repo.get_headers('me@x.com', 7, [101]) == {}
+    
+    def test_purge_runs_only_when_uidvalidity_changes(self, cache_repo):
+        """Test repeated lookups under one UIDVALIDITY skip the stale-row purge."""
+        with patch.object(cache_repo, '_purge_stale', wraps=cache_repo._purge_stale) as purge:
+            for _ in range(3):
+                cache_repo.get_headers('me@x.com', 7, [101])
+            assert purge.call_count == 1
+            
+            cache_repo.get_headers('me@x.com', 8, [101])
+            cache_repo.get_headers('other@x.com', 8, [101])
+            assert purge.call_count == 3
+    
+    def test_large_lookup_is_chunked(self, cache_repo):
+        """Test lookups beyond SQLite's parameter limit still return every row."""
+        rows = [(uid, 'a@x.com', 'S', '') for uid in range(1, 2001)]
+        cache_repo.store_headers('me@x.com', 7, rows)
+        
+        headers = cache_repo.get_headers('me@x.com', 7, list(range(1, 2001)))
+        
+        assert len(headers) == 2000
+    
+    def test_delete_headers_and_clear(self, cache_repo):
+        """Test deleted UIDs and cleared accounts are no longer returned."""
+        cache_repo.store_headers('me@x.com', 7, [
+            (101, 'a@x.com', 'One', ''),
+            (102, 'b@x.com', 'Two', ''),
+        ])
+        
+        cache_repo.delete_headers('me@x.com', [101])
+        assert list(cache_repo.get_headers('me@x.com', 7, [101, 102])) == [102]
+        
+        cache_repo.clear('me@x.com')
+        assert cache_repo.get_headers('me@x.com', 7, [102]) == {}
@@ -218,6 +218,16 @@ class TestUnwantedSendersRepository:
         
         assert result is False
     
+    def test_get_unwanted_set(self, unwanted_repo):
+        """Test bulk lookup returns only the unwanted senders asked about."""
+        unwanted_repo.add_unwanted_sender('spam@example.com', 'Test', False)
+        unwanted_repo.add_to_must_delete('junk@example.com', 'Test')
+        unwanted_repo.add_unwanted_sender('other@example.com', 'Test', False)
+        
+        result = unwanted_repo.get_unwanted_set(['spam@example.com', 'junk@example.com', 'ok@example.com'])
+        
+        assert result == {'spam@example.com', 'junk@example.com'}
+    
     def test_check_unwanted_finds_must_delete(self, unwanted_repo):
         """Test check_unwanted finds must-delete senders too."""
         unwanted_repo.add_to_must_delete('spam@example.com', 'Test')
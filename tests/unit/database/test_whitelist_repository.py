@@ -119,6 +119,18 @@ class TestWhitelistRepository:
         # Other domains should not match
         assert whitelist_repo.check_whitelist('user@other.com') is False
     
+    def test_get_whitelist_set_matches_check_whitelist(self, whitelist_repo):
+        """Test bulk lookup applies the same exact and domain matching."""
+        whitelist_repo.add_to_whitelist('test@example.com')
+        whitelist_repo.add_to_whitelist('@company.com', is_domain=True)
+        emails = ['test@example.com', 'user@COMPANY.com', 'user@other.com', 'Test@example.com']
+        
+        result = whitelist_repo.get_whitelist_set(emails)
+        
+        assert result == {e for e in emails if whitelist_repo.check_whitelist(e)}
+        assert result == {'test@example.com', 'user@COMPANY.com'}
+        assert whitelist_repo.get_whitelist_set([]) == set()
+    
     def test_check_whitelist_not_found(self, whitelist_repo):
         """Test checking whitelist returns False when not found."""
         result = whitelist_repo.check_whitelist('notfound@example.com')
@@ -159,6 +159,18 @@ class TestClientFactory:
         assert isinstance(client, IMAPClient)
         assert client.provider == 'generic'
     
+    def test_null_provider_detected_from_email(self, mock_auth_factory, mock_oauth_manager):
+        """Test that a NULL provider column falls back to auto-detection."""
+        account = {
+            'email': 'User@Yahoo.com',
+            'provider': None,
+            'encrypted_password': 'encrypted123'
+        }
+        
+        client = create_email_client(account, mock_auth_factory, mock_oauth_manager)
+        
+        assert client.provider == 'yahoo'
+    
     def test_provider_override(self, mock_auth_factory, mock_oauth_manager):
         """Test that explicit provider overrides auto-detection."""
         account = {
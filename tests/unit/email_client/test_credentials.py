@@ -0,0 +1,89 @@
+"""Unit tests for CredentialManager."""
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from src.email_client.credentials import CredentialManager
+
+
+class TestCredentialManager:
+    """Test cases for CredentialManager."""
+
+    @pytest.fixture
+    def cred_manager(self, tmp_path):
+        """Create credential manager with a temporary key file."""
+        return CredentialManager(key_path=str(tmp_path / 'key.key'))
+
+    def test_creates_key_file(self, tmp_path):
+        """Test a new key file is generated on first use."""
+        key_path = tmp_path / 'nested' / 'key.key'
+        CredentialManager(key_path=str(key_path))
+
+        assert key_path.exists()
+
+    def test_reuses_existing_key(self, tmp_path, cred_manager):
+        """Test a second manager on the same key file can decrypt."""
+        encrypted = cred_manager.encrypt_password('secret')
+        other = CredentialManager(key_path=str(tmp_path / 'key.key'))
+
+        assert other.decrypt_password(encrypted) == 'secret'
+
+    def test_encrypt_decrypt_roundtrip(self, cred_manager):
+        """Test password survives encrypt/decrypt roundtrip."""
+        encrypted = cred_manager.encrypt_password('p@ssw0rd')
+
+        assert encrypted != 'p@ssw0rd'
+        assert cred_manager.decrypt_password(encrypted) == 'p@ssw0rd'
+
+    def test_decrypt_many_preserves_order(self, cred_manager):
+        """Test batch decryption returns plaintexts in input order."""
+        plaintexts = ['access', 'refresh', 'ünïcode']
+        encrypted = [cred_manager.encrypt_password(p) for p in plaintexts]
+
+        assert cred_manager.decrypt_many(encrypted) == plaintexts
+
+    def test_decrypt_many_empty(self, cred_manager):
+        """Test batch decryption of an empty list."""
+        assert cred_manager.decrypt_many([]) == []
+
+    def test_decrypt_many_invalid_token_raises(self, cred_manager):
+        """Test batch decryption fails if any token is invalid."""
+        encrypted = cred_manager.encrypt_password('ok')
+
+        with pytest.raises(InvalidToken):
+            cred_manager.decrypt_many([encrypted, 'not-a-token'])
+
+    def test_decrypt_with_other_key_raises_invalid_token(self, tmp_path, cred_manager):
+        """Test decrypting a token from a different key raises InvalidToken."""
+        other = CredentialManager(key_path=str(tmp_path / 'other.key'))
+        encrypted = other.encrypt_password('secret')
+
+        with pytest.raises(InvalidToken):
+            cred_manager.decrypt_password(encrypted)
+
+    def test_encrypts_with_aead_not_fernet(self, cred_manager):
+        """Test new values are AES-GCM tokens, not Fernet tokens."""
+        encrypted = cred_manager.encrypt_password('secret')
+
+        assert not encrypted.startswith('gAAAAA')
+        assert encrypted != cred_manager.encrypt_password('secret')
+
+    def test_decrypts_legacy_fernet_token(self, tmp_path, cred_manager):
+        """Test values stored by the old Fernet implementation still decrypt."""
+        key = (tmp_path / 'key.key').read_bytes()
+        legacy = Fernet(key).encrypt(b'old-secret').decode('utf-8')
+
+        assert cred_manager.decrypt_password(legacy) == 'old-secret'
+        assert cred_manager.decrypt_many([legacy, cred_manager.encrypt_password('new')]) == [
+            'old-secret', 'new'
+        ]
+
+    def test_tampered_token_raises_invalid_token(self, cred_manager):
+        """Test a modified AES-GCM token fails authentication."""
+        encrypted = cred_manager.encrypt_password('secret')
+        tampered = encrypted[:-4] + ('AAAA' if encrypted[-4:] != 'AAAA' else 'BBBB')
+
+        with pytest.raises(InvalidToken):
+            cred_manager.decrypt_password(tampered)
+
+        with pytest.raises(InvalidToken):
+            cred_manager.decrypt_password('AQ==')
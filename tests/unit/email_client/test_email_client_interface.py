@@ -40,7 +40,7 @@ class TestEmailClientInterface:
             assert hasattr(EmailClientInterface, method)
             assert callable(getattr(EmailClientInterface, method))
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_imap_client_satisfies_interface(self, mock_imap):
         """Test that IMAPClient can be used through interface."""
         # Create IMAP client
@@ -104,7 +104,7 @@ class MockEmailClient(EmailClientInterface):
     def fetch_email_ids(self, limit: int = 500):
         return ['id1', 'id2', 'id3']
     
-    def fetch_headers(self, message_ids):
+    def fetch_headers(self, message_ids, on_chunk=None):
         return [
             {'from': 'test@example.com', 'subject': 'Test'}
         ]
@@ -3,14 +3,19 @@
 Tests email parsing functionality including:
 - IMAP bytes parsing
 - Gmail API dict parsing
+- IMAP header record parsing
 - Header decoding (UTF-8, base64, etc.)
 - Multipart message handling
 - Unsubscribe link detection
 - Error handling for malformed emails
 """
 
+import subprocess
+import sys
+from pathlib import Path
 import pytest
 from src.email_client.email_parser import EmailParser
+from src.email_client.header_record import HeaderRecord
 from tests.fixtures.email_responses import (
     SAMPLE_IMAP_HEADER,
     SAMPLE_IMAP_MULTIPART,
@@ -69,6 +74,51 @@ class TestEmailParser:
         assert len(result['unsubscribe_links']) == 1
         assert 'https://example.com/unsub' in result['unsubscribe_links']
     
+    def test_parse_gmail_api_dict_missing_fields(self, parser):
+        """Test Gmail API dict parsing fills defaults for missing fields."""
+        result = parser.parse_email({'sender': 'test@example.com'})
+        
+        assert result['sender'] == 'test@example.com'
+        assert result['sender_name'] == ''
+        assert result['message_id'] == ''
+        assert result['body_text'] == ''
+        assert result['body_html'] == ''
+        assert result['unsubscribe_links'] == []
+        assert result['is_unread'] is False
+    
+    def test_parse_imap_header_record(self, parser):
+        """Test IMAP header records parse into the Gmail API dict shape."""
+        record = HeaderRecord('12', 'News Team <news@example.com>', 'Deals', 'Mon, 1 Jan 2024', False)
+        
+        result = parser.parse_email(record)
+        
+        assert result['sender'] == 'news@example.com'
+        assert result['sender_name'] == 'News Team'
+        assert result['subject'] == 'Deals'
+        assert result['message_id'] == '12'
+        assert result['unsubscribe_links'] == []
+        assert result['is_unread'] is True
+    
+    def test_parser_import_does_not_load_imap_client(self):
+        """Test the parser can be imported without the IMAP client and its pool."""
+        code = (
+            "import sys; import src.email_client.email_parser; "
+            "assert 'src.email_client.imap_client' not in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=repo_root)
+    
+    def test_parsed_senders_are_interned(self, parser):
+        """Test repeated senders share one string object across emails."""
+        first = parser.parse_email({'sender': ''.join(['news@', 'example.com'])})
+        second = parser.parse_email({'sender': ''.join(['news@', 'example.com'])})
+        record = parser.parse_email(
+            HeaderRecord('12', 'News <news@example.com>', 'Deals', 'Mon, 1 Jan 2024', True)
+        )
+        
+        assert first['sender'] is second['sender']
+        assert record['sender'] is first['sender']
+    
     def test_parse_malformed_email_returns_empty_dict(self, parser):
         """Test that malformed email returns empty dict without crashing."""
         result = parser.parse_email(SAMPLE_MALFORMED_EMAIL)
@@ -117,6 +167,17 @@ class TestEmailParser:
         assert 'Plain' in result['subject']
         assert 'Subject' in result['subject']
     
+    def test_plain_subject_skips_decode_header(self, parser, monkeypatch):
+        """Test subjects without encoded-words are returned without decoding."""
+        import src.email_client.email_parser as email_parser
+        
+        def fail(header):
+            raise AssertionError("decode_header should not be called")
+        
+        monkeypatch.setattr(email_parser, 'decode_header', fail)
+        
+        assert parser._decode_header_value('Weekly Deals') == 'Weekly Deals'
+    
     def test_detect_unsubscribe_from_header(self, parser):
         """Test detecting unsubscribe link from List-Unsubscribe header."""
         email_data = {
@@ -181,6 +242,23 @@ class TestEmailParser:
         # Should have only one link despite appearing in multiple places
         assert links.count('https://example.com/unsub') <= 1
     
+    def test_detect_unsubscribe_preserves_strategy_order(self, parser):
+        """Test that header links come before body links after de-duplication."""
+        email_data = {
+            'list_unsubscribe': '<https://example.com/header-unsub>',
+            'body_text': 'Visit https://example.com/text-unsubscribe now',
+            'body_html': ('<a href="https://example.com/html-unsubscribe">Unsubscribe</a>'
+                          '<a href="https://example.com/header-unsub">Unsubscribe</a>')
+        }
+        
+        links = parser.detect_unsubscribe_links(email_data)
+        
+        assert links == [
+            'https://example.com/header-unsub',
+            'https://example.com/html-unsubscribe',
+            'https://example.com/text-unsubscribe'
+        ]
+    
     def test_detect_unsubscribe_limits_to_5(self, parser):
         """Test that unsubscribe detection returns maximum 5 links."""
         # Create email with many unsubscribe links
@@ -246,7 +324,26 @@ class TestEmailParser:
         
         assert len(links) > 0
         assert 'https://example.com/remove' in links
-    
+
+    def test_extract_from_html_keyword_in_text_case_insensitive(self, parser):
+        """Test HTML link extraction matches keywords in link text regardless of case."""
+        html = ('<html><a href="https://example.com/prefs?id=1">Stop Receiving These</a>'
+                '<a href="https://example.com/about">About us</a></html>')
+        links = parser._extract_from_html(html)
+
+        assert links == ['https://example.com/prefs?id=1']
+
+    def test_beautifulsoup_loaded_lazily_and_cached(self, parser, monkeypatch):
+        """Test bs4 is only resolved on first HTML scan and then reused."""
+        from src.email_client import email_parser
+        monkeypatch.setattr(email_parser, '_BeautifulSoup', None)
+
+        parser._extract_from_html('<a href="https://example.com/unsubscribe">x</a>')
+        loaded = email_parser._BeautifulSoup
+
+        assert loaded is not None
+        assert email_parser._get_beautifulsoup() is loaded
+
     def test_extract_from_html_malformed(self, parser):
         """Test HTML extraction handles malformed HTML gracefully."""
         html = '<html><a href="broken>Broken link</html>'
@@ -272,6 +369,17 @@ class TestEmailParser:
         # If not found, that's expected behavior - mailto detection happens elsewhere
         assert isinstance(links, list)
     
+    def test_extract_from_text_url_and_mailto_in_order(self, parser):
+        """Test text extraction finds URLs and mailto links in a single pass."""
+        text = ('Email mailto:list@example.com?subject=unsubscribe or '
+                'visit https://example.com/opt-out?u=1 to stop.')
+        links = parser._extract_from_text(text)
+        
+        assert links == [
+            'mailto:list@example.com?subject=unsubscribe',
+            'https://example.com/opt-out?u=1'
+        ]
+    
     def test_decode_payload_utf8(self, parser):
         """Test decoding payload with UTF-8 charset."""
         import email.message
@@ -283,6 +391,15 @@ class TestEmailParser:
         
         assert 'Test content' in result
     
+    def test_decode_payload_unknown_charset_falls_back(self, parser):
+        """Test an unknown charset name still yields the body as UTF-8."""
+        import email.message
+        part = email.message.Message()
+        part.set_payload('caf\u00e9 unsubscribe'.encode('utf-8'))
+        part.set_param('charset', 'x-unknown')
+        
+        assert parser._decode_payload(part) == 'caf\u00e9 unsubscribe'
+    
     def test_decode_payload_handles_errors(self, parser):
         """Test payload decoding handles errors gracefully."""
         import email.message
@@ -0,0 +1,356 @@
+"""Unit tests for GmailAPIClient operations."""
+
+import base64
+import pytest
+from unittest.mock import Mock, MagicMock
+from src.email_client.gmail_api_client import GmailAPIClient
+
+
+class FakeBatch:
+    """Minimal stand-in for googleapiclient's BatchHttpRequest.
+
+    Each added request is a callable returning the response dict (or
+    raising); execute() invokes the batch callback per request.
+    """
+
+    def __init__(self, callback, log):
+        self.callback = callback
+        self.requests = []
+        log.append(self)
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request(), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+def make_message(msg_id, sender='News <news@example.com>', unread=True):
+    """Build a Gmail API metadata message dict."""
+    return {
+        'id': msg_id,
+        'labelIds': ['INBOX', 'UNREAD'] if unread else ['INBOX'],
+        'snippet': f'snippet {msg_id}',
+        'payload': {
+            'headers': [
+                {'name': 'From', 'value': sender},
+                {'name': 'Subject', 'value': f'Subject {msg_id}'},
+                {'name': 'Date', 'value': 'Mon, 1 Jan 2024 12:00:00 +0000'},
+            ]
+        }
+    }
+
+
+class TestGmailAPIClient:
+    """Test cases for GmailAPIClient."""
+
+    @pytest.fixture
+    def service(self):
+        """Mock Gmail service whose message gets resolve lazily in batches."""
+        service = MagicMock()
+        service.batches = []
+        service.failing_ids = set()
+
+        def get(userId, id, **kwargs):
+            def run():
+                if id in service.failing_ids:
+                    raise Exception('not found')
+                return make_message(id)
+            return run
+
+        service.users.return_value.messages.return_value.get.side_effect = get
+        service.new_batch_http_request.side_effect = (
+            lambda callback: FakeBatch(callback, service.batches)
+        )
+        return service
+
+    @pytest.fixture
+    def client(self, service):
+        """Create client with a connected mock service."""
+        client = GmailAPIClient('test@gmail.com', oauth_manager=Mock())
+        client.service = service
+        return client
+
+    def test_fetch_headers_not_connected(self):
+        """Test fetch_headers returns empty list without a service."""
+        client = GmailAPIClient('test@gmail.com', oauth_manager=Mock())
+        assert client.fetch_headers(['a']) == []
+
+    def test_fetch_headers_uses_batches(self, client, service):
+        """Test headers are fetched in batches of BATCH_SIZE."""
+        ids = [f'id{i}' for i in range(GmailAPIClient.BATCH_SIZE + 5)]
+
+        emails = client.fetch_headers(ids)
+
+        assert len(service.batches) == 2
+        assert len(service.batches[0].requests) == GmailAPIClient.BATCH_SIZE
+        assert len(service.batches[1].requests) == 5
+        assert [e['message_id'] for e in emails] == ids
+
+    def test_fetch_headers_on_chunk_stops_remaining_batches(self, client, service):
+        """Test on_chunk runs per batch and returning False skips the rest."""
+        ids = [f'id{i}' for i in range(GmailAPIClient.BATCH_SIZE + 5)]
+        on_chunk = Mock(return_value=False)
+
+        emails = client.fetch_headers(ids, on_chunk=on_chunk)
+
+        on_chunk.assert_called_once_with(GmailAPIClient.BATCH_SIZE)
+        assert len(service.batches) == 1
+        assert len(emails) == GmailAPIClient.BATCH_SIZE
+
+    def test_fetch_headers_requests_partial_response(self, client, service):
+        """Test metadata gets ask only for the fields that are parsed."""
+        messages = service.users.return_value.messages.return_value
+
+        client.fetch_headers(['m1'])
+
+        kwargs = messages.get.call_args[1]
+        assert kwargs['format'] == 'metadata'
+        assert kwargs['fields'] == 'id,labelIds,snippet,payload/headers'
+
+    def test_fetch_headers_parses_fields(self, client):
+        """Test batched responses are parsed into email dicts."""
+        emails = client.fetch_headers(['m1'])
+
+        assert emails[0]['sender'] == 'news@example.com'
+        assert emails[0]['sender_name'] == 'News'
+        assert emails[0]['subject'] == 'Subject m1'
+        assert emails[0]['snippet'] == 'snippet m1'
+        assert emails[0]['is_unread'] is True
+
+    def test_fetch_headers_skips_failed_messages(self, client, service):
+        """Test per-message failures inside a batch are skipped."""
+        service.failing_ids = {'b'}
+
+        emails = client.fetch_headers(['a', 'b', 'c'])
+
+        assert [e['message_id'] for e in emails] == ['a', 'c']
+
+    def test_fetch_headers_duplicate_ids(self, client, service):
+        """Test duplicate IDs are requested once but returned per input."""
+        emails = client.fetch_headers(['a', 'b', 'a'])
+
+        assert [rid for rid, _ in service.batches[0].requests] == ['a', 'b']
+        assert [e['message_id'] for e in emails] == ['a', 'b', 'a']
+
+    def test_fetch_headers_batch_execute_failure(self, client, service):
+        """Test a failing batch execute does not raise."""
+        batch = MagicMock()
+        batch.execute.side_effect = Exception('network down')
+        service.new_batch_http_request.side_effect = None
+        service.new_batch_http_request.return_value = batch
+
+        assert client.fetch_headers(['a']) == []
+
+    def test_messages_collection_resolved_once(self, client, service):
+        """Test users().messages() is built once per service, not per call."""
+        service.users.reset_mock()
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {}
+
+        client.fetch_email_ids()
+        client.search_emails('from:x@example.com')
+        client.mark_as_read(['a'])
+
+        service.users.assert_not_called()
+
+    def test_disconnect_clears_messages_collection(self, client):
+        """Test disconnecting drops the cached messages collection."""
+        client.disconnect()
+
+        assert client.service is None
+        assert client._messages is None
+
+    def test_get_email_count_requests_total_only(self, client, service):
+        """Test the profile lookup only asks for messagesTotal."""
+        service.users.return_value.getProfile.return_value.execute.return_value = {
+            'messagesTotal': 42
+        }
+
+        assert client.get_email_count() == 42
+        service.users.return_value.getProfile.assert_called_with(
+            userId='me', fields='messagesTotal'
+        )
+
+    def test_parse_message_headers(self, client):
+        """Test header parsing handles each supported header and ignores others."""
+        message = {
+            'id': 'x',
+            'labelIds': ['INBOX'],
+            'payload': {'headers': [
+                {'name': 'FROM', 'value': '"Shop, Inc" <deals@shop.com>'},
+                {'name': 'X-Mailer', 'value': 'ignored'},
+                {'name': 'Date', 'value': 'not a date'},
+                {'name': 'List-Unsubscribe', 'value': '<https://shop.com/u>'},
+            ]}
+        }
+
+        email_data = client._parse_message_headers(message)
+
+        assert email_data['sender'] == 'deals@shop.com'
+        assert email_data['sender_name'] == 'Shop, Inc'
+        assert email_data['date'] == 'not a date'
+        assert email_data['date_obj'] is not None
+        assert email_data['list_unsubscribe'] == '<https://shop.com/u>'
+        assert email_data['is_unread'] is False
+        assert 'subject' not in email_data
+
+    def test_parse_message_headers_plain_from(self, client):
+        """Test a bare address is used as both sender and sender name."""
+        message = {'id': 'x', 'payload': {'headers': [
+            {'name': 'From', 'value': 'plain@example.com'}
+        ]}}
+
+        email_data = client._parse_message_headers(message)
+
+        assert email_data['sender'] == 'plain@example.com'
+        assert email_data['sender_name'] == 'plain@example.com'
+
+    def test_mark_as_read_uses_batch_modify(self, client, service):
+        """Test mark_as_read removes UNREAD with a single batchModify."""
+        messages = service.users.return_value.messages.return_value
+
+        assert client.mark_as_read(['a', 'b']) is True
+
+        messages.batchModify.assert_called_once_with(
+            userId='me',
+            body={'removeLabelIds': ['UNREAD'], 'ids': ['a', 'b']}
+        )
+        messages.modify.assert_not_called()
+
+    def test_delete_emails_trashes_in_chunks(self, client, service):
+        """Test delete_emails trashes via batchModify in 1000-ID chunks."""
+        messages = service.users.return_value.messages.return_value
+        ids = [f'id{i}' for i in range(GmailAPIClient.MODIFY_BATCH_SIZE + 1)]
+
+        assert client.delete_emails(ids) is True
+
+        calls = messages.batchModify.call_args_list
+        assert len(calls) == 2
+        assert calls[0][1]['body']['addLabelIds'] == ['TRASH']
+        assert len(calls[0][1]['body']['ids']) == GmailAPIClient.MODIFY_BATCH_SIZE
+        assert calls[1][1]['body']['ids'] == [ids[-1]]
+        messages.batchDelete.assert_not_called()
+        messages.trash.assert_not_called()
+
+    def test_delete_emails_failure(self, client, service):
+        """Test delete_emails reports failure when batchModify raises."""
+        messages = service.users.return_value.messages.return_value
+        messages.batchModify.return_value.execute.side_effect = Exception('quota')
+
+        assert client.delete_emails(['a']) is False
+        assert 'quota' in client.error_message
+
+    def test_delete_emails_from_sender(self, client, service):
+        """Test sender deletion searches then trashes matching messages."""
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {
+            'messages': [{'id': 'a'}, {'id': 'b'}]
+        }
+
+        count, message = client.delete_emails_from_sender('spam@example.com')
+
+        assert count == 2
+        assert 'Deleted 2 emails' in message
+        assert messages.batchModify.call_args[1]['body']['ids'] == ['a', 'b']
+
+    def test_extract_body_nested_multipart(self, client):
+        """Test deeply nested parts are found and the first of each type wins."""
+        def part(mime, text):
+            return {'mimeType': mime, 'body': {'data': base64.urlsafe_b64encode(text.encode()).decode()}}
+
+        payload = {'mimeType': 'multipart/mixed', 'body': {'size': 0}, 'parts': [
+            {'mimeType': 'multipart/related', 'parts': [
+                {'mimeType': 'multipart/alternative', 'parts': [
+                    part('text/plain', 'first text'),
+                    part('text/html', '<p>first html</p>'),
+                ]},
+            ]},
+            part('text/plain', 'attachment-ish text'),
+            {'mimeType': 'image/png', 'body': {'attachmentId': 'att1'}},
+        ]}
+
+        assert client._extract_body(payload) == {
+            'text': 'first text',
+            'html': '<p>first html</p>'
+        }
+
+    def test_extract_body_single_part_html(self, client):
+        """Test a single-part HTML message body."""
+        payload = {'mimeType': 'text/html',
+                   'body': {'data': base64.urlsafe_b64encode(b'<i>x</i>').decode()}}
+
+        assert client._extract_body(payload) == {'html': '<i>x</i>'}
+
+    def test_extract_body_uses_part_charset(self, client):
+        """Test parts are decoded with the charset from their Content-Type."""
+        data = base64.urlsafe_b64encode('café'.encode('latin-1')).decode()
+        payload = {'mimeType': 'multipart/alternative', 'parts': [
+            {'mimeType': 'text/plain',
+             'headers': [{'name': 'Content-Type', 'value': 'text/plain; charset="ISO-8859-1"'}],
+             'body': {'data': data}},
+            {'mimeType': 'text/html',
+             'headers': [{'name': 'Content-Type', 'value': 'text/html; charset=x-unknown'}],
+             'body': {'data': base64.urlsafe_b64encode('<b>é</b>'.encode()).decode()}},
+        ]}
+
+        assert client._extract_body(payload) == {'text': 'café', 'html': '<b>é</b>'}
+
+    def test_requests_reuse_thread_http(self, client, service):
+        """Test calls on one thread share a single keep-alive Http object."""
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {'messages': [{'id': 'a'}]}
+        client.connection_manager.credentials = Mock()
+
+        client.fetch_email_ids(limit=10)
+        client.mark_as_read(['a'])
+
+        list_http = messages.list.return_value.execute.call_args[1]['http']
+        modify_http = messages.batchModify.return_value.execute.call_args[1]['http']
+        assert list_http is not None
+        assert list_http is modify_http
+
+    def test_fetch_email_ids_follows_pages(self, client, service):
+        """Test fetch_email_ids follows nextPageToken across pages."""
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.side_effect = [
+            {'messages': [{'id': str(i)} for i in range(500)], 'nextPageToken': 'p2'},
+            {'messages': [{'id': str(i)} for i in range(500, 700)]},
+        ]
+
+        ids = client.fetch_email_ids(limit=1000)
+
+        assert ids == [str(i) for i in range(700)]
+        first, second = messages.list.call_args_list
+        fields = 'messages/id,nextPageToken'
+        assert first[1] == {'userId': 'me', 'maxResults': 500, 'fields': fields}
+        assert second[1] == {'userId': 'me', 'maxResults': 500, 'fields': fields,
+                             'pageToken': 'p2'}
+
+    def test_search_emails_stops_at_limit(self, client, service):
+        """Test search_emails stops paging once the limit is reached."""
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.side_effect = [
+            {'messages': [{'id': str(i)} for i in range(500)], 'nextPageToken': 'p2'},
+            {'messages': [{'id': str(i)} for i in range(500, 600)], 'nextPageToken': 'p3'},
+        ]
+
+        ids = client.search_emails('from:a@example.com', limit=600)
+
+        assert len(ids) == 600
+        assert messages.list.call_count == 2
+        assert messages.list.call_args[1] == {
+            'userId': 'me', 'maxResults': 100, 'fields': 'messages/id,nextPageToken',
+            'q': 'from:a@example.com', 'pageToken': 'p2'
+        }
+
+    def test_search_emails_failure_returns_empty(self, client, service):
+        """Test search errors are swallowed and return no IDs."""
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.side_effect = Exception('boom')
+
+        assert client.search_emails('from:a@example.com') == []
@@ -0,0 +1,476 @@
+"""Unit tests for GmailOAuthManager and OAuthCredentialManager."""
+
+import base64
+import gc
+import json
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from src.database.db_manager import DBManager
+from src.email_client.credentials import CredentialManager
+from src.email_client.gmail_oauth import GmailOAuthManager, OAuthCredentialManager
+
+
+@pytest.fixture
+def oauth_manager(tmp_path):
+    """OAuthCredentialManager over a real schema database and key file."""
+    db = DBManager(str(tmp_path / 'test.db'))
+    db.initialize_db('src/database/schema.sql')
+    cred = CredentialManager(key_path=str(tmp_path / 'key.key'))
+    manager = OAuthCredentialManager(db, cred)
+    manager.gmail_oauth = Mock()
+    manager.gmail_oauth._get_client_id.return_value = 'cid'
+    manager.gmail_oauth._get_client_secret.return_value = 'csecret'
+    yield manager
+    manager.stop_refresher(timeout=1)
+
+
+def future_expiry(minutes=60):
+    """ISO expiry string the given number of minutes from now (naive UTC)."""
+    return (datetime.utcnow() + timedelta(minutes=minutes)).isoformat()
+
+
+class TestGmailOAuthManager:
+    """Test cases for GmailOAuthManager."""
+
+    @pytest.fixture
+    def credentials_file(self, tmp_path):
+        """Write a minimal installed-app credentials file."""
+        path = tmp_path / 'gmail_credentials.json'
+        path.write_text(json.dumps({
+            'installed': {'client_id': 'cid', 'client_secret': 'csecret'}
+        }))
+        return path
+
+    @pytest.fixture
+    def manager(self, credentials_file):
+        """Create manager pointing at the temporary credentials file."""
+        return GmailOAuthManager(credentials_file=str(credentials_file))
+
+    def test_get_client_id_and_secret(self, manager):
+        """Test client ID and secret are read from the credentials file."""
+        assert manager._get_client_id() == 'cid'
+        assert manager._get_client_secret() == 'csecret'
+
+    def test_client_config_read_once(self, manager):
+        """Test the credentials file is parsed only once across lookups."""
+        with patch('src.email_client.gmail_oauth.json.load',
+                   wraps=json.load) as mock_load:
+            manager._get_client_id()
+            manager._get_client_secret()
+            manager._get_client_id()
+
+        assert mock_load.call_count == 1
+
+    def test_invalidate_client_config_reloads(self, manager, credentials_file):
+        """Test invalidation picks up a rotated credentials file."""
+        manager._get_client_id()
+        credentials_file.write_text(json.dumps({
+            'installed': {'client_id': 'new', 'client_secret': 'csecret'}
+        }))
+
+        assert manager._get_client_id() == 'cid'
+        manager.invalidate_client_config()
+        assert manager._get_client_id() == 'new'
+
+    def test_generate_oauth2_string(self, manager):
+        """Test the XOAUTH2 string matches the RFC 7628 layout."""
+        encoded = manager.generate_oauth2_string('a@gmail.com', 'tok')
+
+        assert isinstance(encoded, bytes)
+        assert base64.b64decode(encoded) == b'user=a@gmail.com\x01auth=Bearer tok\x01\x01'
+
+    def test_is_token_expired(self, manager):
+        """Test expiry checks honour the five-minute margin and bad input."""
+        assert manager.is_token_expired(future_expiry(60)) is False
+        assert manager.is_token_expired(future_expiry(3)) is True
+        assert manager.is_token_expired(future_expiry(-1)) is True
+        assert manager.is_token_expired(None) is True
+        assert manager.is_token_expired('garbage') is True
+
+    def test_is_token_expired_aware_timestamp(self, manager):
+        """Test timezone-aware expiry strings are compared in UTC."""
+        expiry = (datetime.now(timezone(timedelta(hours=5))) + timedelta(hours=1)).isoformat()
+
+        assert manager.is_token_expired(expiry) is False
+
+    def test_missing_credentials_file_raises(self, tmp_path):
+        """Test a missing credentials file raises on lookup."""
+        manager = GmailOAuthManager(credentials_file=str(tmp_path / 'missing.json'))
+
+        with pytest.raises(FileNotFoundError):
+            manager._get_client_id()
+
+
+class TestOAuthCredentialManager:
+    """Test cases for OAuthCredentialManager."""
+
+    def test_store_and_get_tokens_roundtrip(self, oauth_manager):
+        """Test tokens are stored encrypted and decrypted on read."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', '2030-01-01T00:00:00')
+
+        tokens = oauth_manager.get_oauth_tokens('a@gmail.com')
+
+        assert tokens == {
+            'access_token': 'access',
+            'refresh_token': 'refresh',
+            'token_expiry': '2030-01-01T00:00:00'
+        }
+        with oauth_manager.db.get_connection() as conn:
+            row = conn.execute("SELECT access_token FROM oauth_tokens").fetchone()
+        assert row[0] != 'access'
+
+    def test_store_tokens_updates_row_in_place(self, oauth_manager):
+        """Test re-storing tokens keeps the same row rather than replacing it."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+        with oauth_manager.db.get_connection() as conn:
+            first_id = conn.execute("SELECT id FROM oauth_tokens").fetchone()[0]
+
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access2', 'refresh2', '2030-01-01T00:00:00')
+
+        with oauth_manager.db.get_connection() as conn:
+            rows = conn.execute("SELECT id FROM oauth_tokens").fetchall()
+        assert rows == [(first_id,)]
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['refresh_token'] == 'refresh2'
+
+    def test_get_tokens_missing(self, oauth_manager):
+        """Test unknown email returns None."""
+        assert oauth_manager.get_oauth_tokens('nobody@gmail.com') is None
+
+    def test_delete_tokens(self, oauth_manager):
+        """Test deleting stored tokens."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+
+        assert oauth_manager.delete_oauth_tokens('a@gmail.com') is True
+        assert oauth_manager.get_oauth_tokens('a@gmail.com') is None
+        assert oauth_manager.delete_oauth_tokens('a@gmail.com') is False
+
+    def test_get_tokens_cached_within_ttl(self, oauth_manager):
+        """Test repeat reads skip the database and decryption until the TTL passes."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+        oauth_manager.get_oauth_tokens('a@gmail.com')
+
+        with patch.object(oauth_manager.cred, 'decrypt_many') as mock_decrypt:
+            tokens = oauth_manager.get_oauth_tokens('a@gmail.com')
+            mock_decrypt.assert_not_called()
+
+            with patch('src.email_client.gmail_oauth.time.monotonic',
+                       return_value=time.monotonic() + OAuthCredentialManager.TOKENS_CACHE_TTL + 1):
+                mock_decrypt.return_value = ['access', 'refresh']
+                oauth_manager.get_oauth_tokens('a@gmail.com')
+            mock_decrypt.assert_called_once()
+
+        assert tokens['access_token'] == 'access'
+
+    def test_store_tokens_invalidates_token_cache(self, oauth_manager):
+        """Test stored tokens are visible immediately despite the cache."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+        oauth_manager.get_oauth_tokens('a@gmail.com')
+
+        oauth_manager.update_access_only('a@gmail.com', 'access2')
+
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['access_token'] == 'access2'
+
+    def test_stored_tokens_read_without_decrypting(self, oauth_manager):
+        """Test tokens just written are served from memory, not decrypted."""
+        with patch.object(oauth_manager.cred, 'decrypt_many') as mock_decrypt:
+            oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+            oauth_manager.update_access_only('a@gmail.com', 'access2', '2030-01-01T00:00:00')
+
+            tokens = oauth_manager.get_oauth_tokens('a@gmail.com')
+
+        mock_decrypt.assert_not_called()
+        assert tokens == {
+            'access_token': 'access2',
+            'refresh_token': 'refresh',
+            'token_expiry': '2030-01-01T00:00:00'
+        }
+
+    def test_clear_cached_secrets(self, oauth_manager):
+        """Test clearing forces the next read back to the database."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh')
+
+        oauth_manager.clear_cached_secrets()
+
+        with patch.object(oauth_manager.cred, 'decrypt_many',
+                          return_value=['access', 'refresh']) as mock_decrypt:
+            oauth_manager.get_oauth_tokens('a@gmail.com')
+        mock_decrypt.assert_called_once()
+
+    def test_auth_string_reused_until_token_changes(self, oauth_manager):
+        """Test reconnects with the same token reuse the encoded XOAUTH2 string."""
+        oauth_manager.gmail_oauth.generate_oauth2_string.side_effect = (
+            GmailOAuthManager().generate_oauth2_string
+        )
+
+        first = oauth_manager.get_auth_string('a@gmail.com', 'access')
+        assert oauth_manager.get_auth_string('a@gmail.com', 'access') == first
+        assert oauth_manager.gmail_oauth.generate_oauth2_string.call_count == 1
+
+        refreshed = oauth_manager.get_auth_string('a@gmail.com', 'refreshed')
+        assert oauth_manager.gmail_oauth.generate_oauth2_string.call_count == 2
+        assert base64.b64decode(refreshed).endswith(b'Bearer refreshed\x01\x01')
+
+    def test_clear_cached_secrets_drops_auth_strings(self, oauth_manager):
+        """Test clearing secrets also forgets the encoded XOAUTH2 strings."""
+        oauth_manager.get_auth_string('a@gmail.com', 'access')
+
+        oauth_manager.clear_cached_secrets()
+        oauth_manager.get_auth_string('a@gmail.com', 'access')
+
+        assert oauth_manager.gmail_oauth.generate_oauth2_string.call_count == 2
+
+    def test_get_credentials_none_without_tokens(self, oauth_manager):
+        """Test get_credentials returns None when nothing is stored."""
+        assert oauth_manager.get_credentials('nobody@gmail.com') is None
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_get_credentials_valid_token_not_refreshed(self, mock_refresh, oauth_manager):
+        """Test a valid stored token is used without refreshing."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+
+        credentials = oauth_manager.get_credentials('a@gmail.com')
+
+        assert credentials.token == 'access'
+        assert credentials.refresh_token == 'refresh'
+        assert credentials.client_id == 'cid'
+        assert credentials.client_secret == 'csecret'
+        assert 'gmail.modify' in credentials.scopes[0]
+        mock_refresh.assert_not_called()
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_get_credentials_cached(self, mock_refresh, oauth_manager):
+        """Test repeated calls reuse the cached credentials without DB reads."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        first = oauth_manager.get_credentials('a@gmail.com')
+
+        with patch.object(oauth_manager, 'get_oauth_tokens') as mock_get:
+            second = oauth_manager.get_credentials('a@gmail.com')
+
+        assert second is first
+        mock_get.assert_not_called()
+
+    @patch('src.email_client.gmail_oauth.Request')
+    def test_get_credentials_refreshes_expired(self, mock_request, oauth_manager):
+        """Test an expired token is refreshed and the new tokens stored."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'old', 'refresh', future_expiry(-10))
+
+        def fake_refresh(credentials, request):
+            credentials.token = 'new'
+            credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   autospec=True, side_effect=fake_refresh) as mock_refresh:
+            credentials = oauth_manager.get_credentials('a@gmail.com')
+
+        mock_refresh.assert_called_once()
+        assert credentials.token == 'new'
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['access_token'] == 'new'
+        assert oauth_manager.get_credentials('a@gmail.com') is credentials
+
+    @patch('src.email_client.gmail_oauth.Request')
+    def test_refresh_without_rotation_updates_access_only(self, mock_request, oauth_manager):
+        """Test an unrotated refresh token is not re-encrypted or rewritten."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'old', 'refresh', future_expiry(-10))
+        with oauth_manager.db.get_connection() as conn:
+            stored_refresh = conn.execute("SELECT refresh_token FROM oauth_tokens").fetchone()[0]
+
+        def fake_refresh(credentials, request):
+            credentials.token = 'new'
+            credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   autospec=True, side_effect=fake_refresh), \
+                patch.object(oauth_manager, 'store_oauth_tokens') as mock_store:
+            oauth_manager.get_credentials('a@gmail.com')
+
+        mock_store.assert_not_called()
+        with oauth_manager.db.get_connection() as conn:
+            row = conn.execute("SELECT refresh_token FROM oauth_tokens").fetchone()
+        assert row[0] == stored_refresh
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['access_token'] == 'new'
+
+    @patch('src.email_client.gmail_oauth.Request')
+    def test_refresh_with_rotation_stores_both(self, mock_request, oauth_manager):
+        """Test a rotated refresh token is persisted."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'old', 'refresh', future_expiry(-10))
+
+        def fake_refresh(credentials, request):
+            credentials.token = 'new'
+            credentials._refresh_token = 'rotated'
+            credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   autospec=True, side_effect=fake_refresh):
+            oauth_manager.get_credentials('a@gmail.com')
+
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['refresh_token'] == 'rotated'
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_store_tokens_invalidates_cache(self, mock_refresh, oauth_manager):
+        """Test storing new tokens (e.g. re-authorization) drops cached credentials."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        oauth_manager.get_credentials('a@gmail.com')
+
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'reauth', 'refresh2', future_expiry())
+
+        assert oauth_manager.get_credentials('a@gmail.com').token == 'reauth'
+
+    @patch('src.email_client.gmail_oauth.build')
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_build_service_called_correctly(self, mock_refresh, mock_build, oauth_manager):
+        """Test the Gmail service is built from the cached credentials."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+
+        service = oauth_manager.build_service('a@gmail.com')
+
+        assert service is mock_build.return_value
+        mock_build.assert_called_once_with(
+            'gmail', 'v1',
+            credentials=oauth_manager.get_credentials('a@gmail.com'),
+            static_discovery=True
+        )
+
+    @patch('src.email_client.gmail_oauth.build')
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_build_service_cached_until_reauthorized(self, mock_refresh, mock_build, oauth_manager):
+        """Test repeat calls reuse the service until new tokens are stored."""
+        mock_build.side_effect = [Mock(), Mock()]
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+
+        first = oauth_manager.build_service('a@gmail.com')
+        assert oauth_manager.build_service('a@gmail.com') is first
+
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'reauth', 'refresh2', future_expiry())
+        assert oauth_manager.build_service('a@gmail.com') is not first
+        assert mock_build.call_count == 2
+
+    @patch('src.email_client.gmail_oauth.build')
+    def test_build_service_none_without_tokens(self, mock_build, oauth_manager):
+        """Test no service is built when nothing is stored."""
+        assert oauth_manager.build_service('nobody@gmail.com') is None
+        mock_build.assert_not_called()
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_caching_credentials_starts_refresher(self, mock_refresh, oauth_manager):
+        """Test the background refresher starts once credentials are cached."""
+        assert oauth_manager._refresher is None
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+
+        oauth_manager.get_credentials('a@gmail.com')
+
+        assert oauth_manager._refresher.is_alive()
+        assert oauth_manager._refresher.daemon
+        oauth_manager.stop_refresher(timeout=1)
+        assert oauth_manager._refresher is None
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_refresher_not_started_without_background_refresh(self, mock_refresh, oauth_manager):
+        """Test managers built with background_refresh=False never start the thread."""
+        manager = OAuthCredentialManager(oauth_manager.db, oauth_manager.cred,
+                                         background_refresh=False)
+        manager.gmail_oauth = oauth_manager.gmail_oauth
+        manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+
+        assert manager.get_credentials('a@gmail.com') is not None
+        assert manager._refresher is None
+
+    def test_refresher_exits_once_manager_collected(self, oauth_manager):
+        """Test the refresh thread does not keep its manager alive."""
+        manager = OAuthCredentialManager(oauth_manager.db, oauth_manager.cred)
+        manager.REFRESH_INTERVAL = 0.01
+        manager._start_refresher()
+        thread = manager._refresher
+
+        del manager
+        gc.collect()
+        thread.join(1)
+
+        assert not thread.is_alive()
+
+    @patch('src.email_client.gmail_oauth.Request')
+    def test_refresh_expiring_only_refreshes_near_expiry(self, mock_request, oauth_manager):
+        """Test the refresher only touches tokens inside the refresh margin."""
+        oauth_manager.store_oauth_tokens('soon@gmail.com', 'a1', 'r1', future_expiry(5))
+        oauth_manager.store_oauth_tokens('later@gmail.com', 'a2', 'r2', future_expiry(60))
+        soon = oauth_manager.get_credentials('soon@gmail.com')
+        later = oauth_manager.get_credentials('later@gmail.com')
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   autospec=True) as mock_refresh:
+            oauth_manager.refresh_expiring()
+
+        mock_refresh.assert_called_once()
+        assert mock_refresh.call_args[0][0] is soon
+        assert oauth_manager.get_credentials('later@gmail.com') is later
+
+    def test_refresh_expiring_logs_failures(self, oauth_manager):
+        """Test a failed background refresh does not propagate."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry(5))
+        with patch('src.email_client.gmail_oauth.Credentials.refresh'):
+            oauth_manager.get_credentials('a@gmail.com')
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   side_effect=Exception('network down')) as mock_refresh:
+            oauth_manager.refresh_expiring()  # Should not raise
+            oauth_manager.refresh_expiring()
+
+        mock_refresh.assert_called_once()
+        assert 'a@gmail.com' not in oauth_manager._creds_cache
+
+    def test_parse_expiry_normalizes_to_naive_utc(self):
+        """Test aware ISO timestamps are converted to naive UTC."""
+        parsed = OAuthCredentialManager._parse_expiry('2030-01-01T02:00:00+02:00')
+
+        assert parsed == datetime(2030, 1, 1, 0, 0, 0)
+        assert OAuthCredentialManager._parse_expiry(None) is None
+        assert OAuthCredentialManager._parse_expiry('garbage') is None
+
+    @patch('src.email_client.gmail_oauth.Request')
+    def test_get_credentials_force_refresh(self, mock_request, oauth_manager):
+        """Test force_refresh refreshes a token that still looks valid."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        oauth_manager.get_credentials('a@gmail.com')
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh') as mock_refresh:
+            oauth_manager.get_credentials('a@gmail.com', force_refresh=True)
+
+        mock_refresh.assert_called_once()
+
+    def test_failed_refresh_drops_cached_entry(self, oauth_manager):
+        """Test credentials whose refresh fails are not served from the cache again."""
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        oauth_manager.get_credentials('a@gmail.com')
+
+        with patch('src.email_client.gmail_oauth.Credentials.refresh',
+                   side_effect=Exception('invalid_grant')):
+            with pytest.raises(Exception, match='invalid_grant'):
+                oauth_manager.get_credentials('a@gmail.com', force_refresh=True)
+
+        assert 'a@gmail.com' not in oauth_manager._creds_cache
+        assert 'a@gmail.com' not in oauth_manager._tokens_cache
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_tokens_stored_by_another_manager_invalidate_cache(self, mock_refresh, oauth_manager):
+        """Test re-authorizing through another manager reaches this manager's cache."""
+        other = OAuthCredentialManager(oauth_manager.db, oauth_manager.cred)
+        other.gmail_oauth = oauth_manager.gmail_oauth
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        oauth_manager.get_credentials('a@gmail.com')
+
+        other.store_oauth_tokens('a@gmail.com', 'reauth', 'refresh2', future_expiry())
+
+        assert oauth_manager.get_credentials('a@gmail.com').token == 'reauth'
+        assert oauth_manager.get_oauth_tokens('a@gmail.com')['refresh_token'] == 'refresh2'
+
+    @patch('src.email_client.gmail_oauth.Credentials.refresh')
+    def test_tokens_deleted_by_another_manager_invalidate_cache(self, mock_refresh, oauth_manager):
+        """Test deleting tokens through another manager stops this one serving them."""
+        other = OAuthCredentialManager(oauth_manager.db, oauth_manager.cred)
+        oauth_manager.store_oauth_tokens('a@gmail.com', 'access', 'refresh', future_expiry())
+        oauth_manager.get_credentials('a@gmail.com')
+
+        other.delete_oauth_tokens('a@gmail.com')
+
+        assert oauth_manager.get_credentials('a@gmail.com') is None
@@ -0,0 +1,73 @@
+"""Unit tests for GmailOAuthStrategy."""
+
+import base64
+import imaplib
+import pytest
+from unittest.mock import Mock
+from google.auth.exceptions import RefreshError
+from src.email_client.auth.gmail_oauth_auth import GmailOAuthStrategy
+from src.email_client.gmail_oauth import GmailOAuthManager
+
+
+class TestGmailOAuthStrategy:
+    """Test cases for GmailOAuthStrategy."""
+
+    @pytest.fixture
+    def oauth_manager(self):
+        """Mock OAuth credential manager returning live credentials."""
+        manager = Mock()
+        manager.get_credentials.return_value = Mock(token='access')
+        manager.get_auth_string.side_effect = GmailOAuthManager().generate_oauth2_string
+        return manager
+
+    @pytest.fixture
+    def strategy(self, oauth_manager):
+        """Create strategy with mocked OAuth manager."""
+        return GmailOAuthStrategy(oauth_manager)
+
+    def test_authenticate_uses_cached_credentials(self, strategy, oauth_manager):
+        """Test the access token comes from get_credentials, not a stored string."""
+        imap = Mock()
+
+        assert strategy.authenticate(imap, 'a@gmail.com') is True
+
+        oauth_manager.get_credentials.assert_called_once_with('a@gmail.com')
+        oauth_manager.get_oauth_tokens.assert_not_called()
+        mechanism, callback = imap.authenticate.call_args[0]
+        assert mechanism == 'XOAUTH2'
+        decoded = base64.b64decode(callback(b'')).decode('ascii')
+        assert decoded == 'user=a@gmail.com\x01auth=Bearer access\x01\x01'
+
+    def test_authenticate_without_tokens(self, strategy, oauth_manager):
+        """Test missing tokens report a re-authorization message."""
+        oauth_manager.get_credentials.return_value = None
+
+        assert strategy.authenticate(Mock(), 'a@gmail.com') is False
+        assert 'not found' in strategy.get_error_message()
+
+    def test_authenticate_refresh_error(self, strategy, oauth_manager):
+        """Test a failed refresh reports a re-authorization message."""
+        oauth_manager.get_credentials.side_effect = RefreshError('revoked')
+
+        assert strategy.authenticate(Mock(), 'a@gmail.com') is False
+        assert 'Failed to refresh' in strategy.get_error_message()
+
+    def test_invalid_credentials_forces_refresh(self, strategy, oauth_manager):
+        """Test a server rejection retries once with force-refreshed credentials."""
+        imap = Mock()
+        imap.authenticate.side_effect = [
+            Exception('method 1 failed'),
+            imaplib.IMAP4.error('AUTHENTICATE failed: Invalid credentials'),
+            None
+        ]
+
+        assert strategy.authenticate(imap, 'a@gmail.com') is True
+        oauth_manager.get_credentials.assert_called_with('a@gmail.com', force_refresh=True)
+
+    def test_auth_string_built_for_current_token(self, strategy, oauth_manager):
+        """Test the XOAUTH2 string is requested for the token just obtained."""
+        oauth_manager.get_credentials.return_value = Mock(token='refreshed')
+
+        assert strategy.authenticate(Mock(), 'a@gmail.com') is True
+
+        oauth_manager.get_auth_string.assert_called_once_with('a@gmail.com', 'refreshed')
@@ -0,0 +1,632 @@
+"""Unit tests for IMAPClient."""
+
+import threading
+import pytest
+from unittest.mock import Mock, MagicMock, call
+from src.email_client.imap_client import (
+    IMAPClient, IMAPConnectionPool, HeaderRecord, _compress_ids, _decode_header, _extract_headers
+)
+
+
+class TestIMAPClient:
+    """Test cases for IMAPClient."""
+    
+    @pytest.fixture
+    def mock_imap(self):
+        """Create mock IMAP connection."""
+        return MagicMock()
+    
+    @pytest.fixture
+    def client(self, mock_imap):
+        """Create client wired to a mock connection manager and IMAP connection."""
+        connection_manager = Mock()
+        connection_manager.provider = 'gmail'
+        client = IMAPClient('test@gmail.com', connection_manager=connection_manager)
+        client.imap = mock_imap
+        return client
+    
+    def test_decode_header_plain_passthrough(self, client):
+        """Test headers without encoded-words are returned unchanged."""
+        assert client._decode_header_value('Weekly News') == 'Weekly News'
+    
+    def test_decode_header_base64_word(self, client):
+        """Test B-encoded words are decoded with their charset."""
+        header = '=?utf-8?B?V8O2cmxk?='
+        
+        assert client._decode_header_value(header) == 'Wörld'
+    
+    def test_decode_header_q_word_mixed(self, client):
+        """Test Q-encoded words keep surrounding literal text."""
+        header = 'Hello =?iso-8859-1?Q?caf=E9_bar?= today'
+        
+        assert client._decode_header_value(header) == 'Hello café bar today'
+    
+    def test_decode_header_adjacent_words_join(self, client):
+        """Test whitespace between adjacent encoded-words is dropped."""
+        header = '=?utf-8?Q?Big?= =?utf-8?Q?_Sale?='
+        
+        assert client._decode_header_value(header) == 'Big Sale'
+    
+    def test_decode_header_character_split_across_words(self, client):
+        """Test a multibyte character split over adjacent words decodes whole."""
+        header = '=?UTF-8?B?4oI=?= =?UTF-8?B?rA==?= off'
+        
+        assert client._decode_header_value(header) == '€ off'
+    
+    def test_decode_header_adjacent_words_different_charsets(self, client):
+        """Test adjacent words in different charsets are decoded separately."""
+        header = '=?utf-8?Q?caf?= =?iso-8859-1?Q?=E9?='
+        
+        assert client._decode_header_value(header) == 'café'
+    
+    def test_decode_header_unknown_charset_returns_raw(self, client):
+        """Test an undecodable header is returned as-is."""
+        _decode_header.cache_clear()
+        header = '=?x-unknown?Q?abc?='
+        
+        assert client._decode_header_value(header) == header
+    
+    def test_decode_header_slow_path_is_cached(self, client, monkeypatch):
+        """Test a header needing the email package fallback is decoded once."""
+        import src.email_client.imap_client as imap_client
+        _decode_header.cache_clear()
+        slow = Mock(return_value=[(b'abc', None)])
+        monkeypatch.setattr(imap_client, 'decode_header', slow)
+        header = '=?x-unknown?Q?abc?='
+        
+        assert client._decode_header_value(header) == 'abc'
+        assert client._decode_header_value(header) == 'abc'
+        slow.assert_called_once_with(header)
+        _decode_header.cache_clear()
+    
+    def test_compress_ids(self):
+        """Test IDs are sorted, de-duplicated and collapsed into ranges."""
+        ids = [b'9', b'1', b'2', b'3', b'7', b'10', b'3']
+        
+        assert _compress_ids(ids) == b'1:3,7,9:10'
+        assert _compress_ids([]) == b''
+    
+    def test_fetch_headers_single_fetch(self, client, mock_imap):
+        """Test headers for many IDs come from one FETCH, in input order."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (FLAGS (\\Seen) BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {40}',
+             b'From: A <a@x.com>\r\nSubject: One\r\n\r\n'),
+            b')',
+            (b'2 (BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {40}',
+             b'From: b@y.com\r\nSubject: =?utf-8?Q?Tw=C3=B6?=\r\n\r\n'),
+            b' FLAGS ())',
+        ])
+        
+        headers = client.fetch_headers([b'2', b'1', b'5'])
+        
+        mock_imap.fetch.assert_called_once_with(
+            b'1:2,5', '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)] FLAGS)'
+        )
+        assert [h.id for h in headers] == ['2', '1']
+        assert headers[0].subject == 'Twö'
+        assert headers[0].is_read is False
+        assert headers[1].sender == 'A <a@x.com>'
+        assert headers[1].is_read is True
+    
+    def test_header_record_as_dict(self):
+        """Test the legacy dict form keeps the original 'from' key."""
+        record = HeaderRecord('7', 'a@x.com', 'Hi', 'Mon, 1 Jan 2024', True)
+        
+        assert record.as_dict() == {
+            'id': '7', 'from': 'a@x.com', 'subject': 'Hi',
+            'date': 'Mon, 1 Jan 2024', 'is_read': True
+        }
+        assert not hasattr(record, '__dict__')
+    
+    def test_fetch_headers_ignores_interleaved_flag_updates(self, client, mock_imap):
+        """Test an unsolicited FLAGS response isn't applied to the previous message."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (RFC822.HEADER FLAGS () {20}', b'From: a@x.com\r\n\r\n'),
+            b')',
+            b'7 (FLAGS (\\Seen))',
+            (b'2 (FLAGS (\\Seen) BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {20}', b'From: b@x.com\r\n\r\n'),
+            b')',
+        ])
+        
+        headers = client.fetch_headers([b'1', b'2'])
+        
+        assert [(h.id, h.is_read) for h in headers] == [('1', False), ('2', True)]
+    
+    def test_fetch_headers_chunks_large_batches(self, client, mock_imap):
+        """Test FETCH commands are split into FETCH_CHUNK_SIZE groups."""
+        client.auth_strategy = None
+        mock_imap.fetch.return_value = ('OK', [])
+        ids = [str(i).encode() for i in range(1, IMAPClient.FETCH_CHUNK_SIZE + 2)]
+        
+        assert client.fetch_headers(ids) == []
+        assert mock_imap.fetch.call_count == 2
+    
+    def test_fetch_headers_on_chunk_stops_before_next_fetch(self, client, mock_imap, monkeypatch):
+        """Test on_chunk returning False stops a sequential fetch after the chunk."""
+        client.auth_strategy = None
+        monkeypatch.setattr(IMAPClient, 'FETCH_CHUNK_SIZE', 1)
+        mock_imap.fetch.return_value = ('OK', [])
+        on_chunk = Mock(return_value=False)
+        
+        assert client.fetch_headers([b'1', b'2'], on_chunk=on_chunk) == []
+        on_chunk.assert_called_once_with(1)
+        assert mock_imap.fetch.call_count == 1
+    
+    def test_header_batch_spans_one_chunk_per_pooled_session(self):
+        """Test scan batches are big enough to use every pooled connection."""
+        assert IMAPClient.HEADER_BATCH_SIZE == IMAPClient.FETCH_CHUNK_SIZE * IMAPClient.MAX_POOL_WORKERS
+    
+    def test_fetch_headers_spreads_chunks_over_pool(self, client, mock_imap):
+        """Test multi-chunk batches are fetched on pooled clients in chunk order."""
+        client.auth_strategy = Mock()
+        client.FETCH_CHUNK_SIZE = 2
+        pooled = [Mock(), Mock()]
+        for member in pooled:
+            member._fetch_header_chunk.side_effect = lambda chunk, cache: [
+                HeaderRecord(msg_id.decode(), '', '', '', False) for msg_id in chunk
+            ]
+        client._pool = MagicMock()
+        client._pool.acquire.return_value.__enter__.return_value = pooled
+        
+        headers = client.fetch_headers([b'1', b'2', b'3', b'4', b'5'])
+        
+        assert [h.id for h in headers] == ['1', '2', '3', '4', '5']
+        client._pool.acquire.assert_called_once_with(3)
+        pooled[0]._fetch_header_chunk.assert_has_calls(
+            [call([b'1', b'2'], None), call([b'5'], None)]
+        )
+        pooled[1]._fetch_header_chunk.assert_called_once_with([b'3', b'4'], None)
+        mock_imap.fetch.assert_not_called()
+        
+        # Disconnecting gives up this client's claim on the shared pool
+        pool = client._pool
+        client.disconnect()
+        pool.release.assert_called_once()
+        assert client._pool is None
+    
+    def test_fetch_headers_on_chunk_stops_pooled_sessions(self, client, mock_imap):
+        """Test each pooled session stops after its chunk once on_chunk returns False."""
+        client.auth_strategy = Mock()
+        client.FETCH_CHUNK_SIZE = 2
+        pooled = [Mock(), Mock()]
+        for member in pooled:
+            member._fetch_header_chunk.side_effect = lambda chunk, cache: [
+                HeaderRecord(msg_id.decode(), '', '', '', False) for msg_id in chunk
+            ]
+        client._pool = MagicMock()
+        client._pool.acquire.return_value.__enter__.return_value = pooled
+        on_chunk = Mock(return_value=False)
+        
+        headers = client.fetch_headers([b'1', b'2', b'3', b'4', b'5'], on_chunk=on_chunk)
+        
+        assert [h.id for h in headers] == ['1', '2', '3', '4']
+        assert on_chunk.call_count == 2
+        pooled[0]._fetch_header_chunk.assert_called_once_with([b'1', b'2'], None)
+    
+    def test_fetch_headers_cache_miss_downloads_and_stores(self, client, mock_imap):
+        """Test uncached UIDs are fetched once and written to the header cache."""
+        client.header_cache = Mock()
+        client.header_cache.get_headers.return_value = {}
+        mock_imap.untagged_responses = {'UIDVALIDITY': [b'42']}
+        mock_imap.fetch.side_effect = [
+            ('OK', [b'1 (UID 101 FLAGS ())', b'2 (UID 102 FLAGS (\\Seen))']),
+            ('OK', [
+                (b'1 (FLAGS () BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {40}',
+                 b'From: a@x.com\r\nSubject: One\r\n\r\n'),
+                b')',
+            ]),
+        ]
+        
+        headers = client.fetch_headers([b'1', b'2'])
+        
+        assert [h.id for h in headers] == ['1']
+        mock_imap.fetch.assert_has_calls([
+            call(b'1:2', '(UID FLAGS)'),
+            call(b'1:2', IMAPClient.HEADER_FETCH_ITEMS),
+        ])
+        client.header_cache.get_headers.assert_called_once_with('test@gmail.com', 42, [101, 102])
+        client.header_cache.store_headers.assert_called_once_with(
+            'test@gmail.com', 42, [(101, 'a@x.com', 'One', '')]
+        )
+    
+    def test_fetch_headers_cache_hit_uses_fresh_flags(self, client, mock_imap):
+        """Test cached headers skip the header FETCH but report current read state."""
+        client.header_cache = Mock()
+        client.header_cache.get_headers.return_value = {
+            101: ('a@x.com', 'One', 'Mon, 1 Jan 2024'),
+            102: ('b@x.com', 'Two', ''),
+        }
+        mock_imap.untagged_responses = {}
+        mock_imap.status.return_value = ('OK', [b'INBOX (UIDVALIDITY 42)'])
+        mock_imap.fetch.return_value = ('OK', [
+            b'1 (UID 101 FLAGS (\\Seen))', b'2 (FLAGS () UID 102)'
+        ])
+        
+        headers = client.fetch_headers([b'2', b'1'])
+        
+        assert [(h.id, h.subject, h.is_read) for h in headers] == [
+            ('2', 'Two', False), ('1', 'One', True)
+        ]
+        mock_imap.fetch.assert_called_once_with(b'1:2', '(UID FLAGS)')
+        client.header_cache.store_headers.assert_not_called()
+    
+    def test_mark_deleted_single_store(self, client, mock_imap):
+        """Test deletion flags are set with one STORE over a sequence set."""
+        client._mark_deleted([b'5', b'3', b'4', b'9'])
+        
+        mock_imap.uid.assert_called_once_with('STORE', b'3:5,9', '+FLAGS.SILENT', '(\\Deleted)')
+    
+    def test_mark_deleted_chunks_large_sets(self, client, mock_imap):
+        """Test very large deletes are split into STORE_CHUNK_SIZE groups."""
+        ids = [str(i).encode() for i in range(1, 2 * IMAPClient.STORE_CHUNK_SIZE, 2)]
+        ids.append(str(2 * IMAPClient.STORE_CHUNK_SIZE + 1).encode())
+        
+        client._mark_deleted(ids)
+        
+        assert mock_imap.uid.call_count == 2
+    
+    def test_extract_headers_unfolds_continuations(self):
+        """Test folded header lines are joined and first occurrence wins."""
+        raw = (b'Received: x\r\nfrom: News\r\n <news@x.com>\r\n'
+               b'Subject: Big\r\n\tSale\r\nDate: Mon, 1 Jan 2024 00:00:00 +0000\r\n'
+               b'Subject: ignored\r\n\r\n')
+        
+        assert _extract_headers(raw) == {
+            'From': 'News <news@x.com>',
+            'Subject': 'Big\tSale',
+            'Date': 'Mon, 1 Jan 2024 00:00:00 +0000'
+        }
+    
+    def test_extract_headers_falls_back_when_missing(self):
+        """Test missing fields fall back to the email parser defaults."""
+        assert _extract_headers(b'From: a@x.com\r\n\r\n') == {
+            'From': 'a@x.com', 'Subject': '', 'Date': ''
+        }
+    
+    def test_extract_headers_missing_field_skips_email_parser(self, monkeypatch):
+        """Test a header block lacking Subject is not re-parsed by the email package."""
+        import src.email_client.imap_client as imap_client
+        parse = Mock(side_effect=AssertionError("email parser should not run"))
+        monkeypatch.setattr(imap_client.email, 'message_from_bytes', parse)
+        
+        assert _extract_headers(b'From: a@x.com\r\nDate: Mon\r\n\r\n') == {
+            'From': 'a@x.com', 'Subject': '', 'Date': 'Mon'
+        }
+        assert _extract_headers(b'\r\n') == {'From': '', 'Subject': '', 'Date': ''}
+    
+    def test_fetch_body_uses_declared_charset(self, client, mock_imap):
+        """Test the body is decoded once with the Content-Type charset."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (BODY[HEADER.FIELDS (CONTENT-TYPE)] {40}',
+             b'Content-Type: text/plain; charset="iso-8859-1"\r\n\r\n'),
+            (b' BODY[TEXT] {4}', 'café'.encode('latin-1')),
+            b')',
+        ])
+        
+        body = client.fetch_body(b'1')
+        
+        assert body == {'id': '1', 'body_text': 'café', 'body_html': ''}
+    
+    def test_fetch_body_without_charset_detects_legacy_bytes(self, client, mock_imap):
+        """Test undeclared non-UTF-8 bodies are read as windows-1252."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (BODY[HEADER.FIELDS (CONTENT-TYPE)] {2}', b'\r\n'),
+            (b' BODY[TEXT] {6}', 'naïve'.encode('cp1252')),
+            b')',
+        ])
+        
+        assert client.fetch_body(b'1')['body_text'] == 'naïve'
+    
+    def test_iter_headers_fetches_lazily(self, client, mock_imap, monkeypatch):
+        """Test the next chunk is only fetched once the previous one is consumed."""
+        monkeypatch.setattr(IMAPClient, 'FETCH_CHUNK_SIZE', 1)
+        mock_imap.fetch.side_effect = [
+            ('OK', [(b'1 (FLAGS () BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {9}', b'Subject: a\r\n\r\n'), b')']),
+            ('OK', [(b'2 (FLAGS () BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {9}', b'Subject: b\r\n\r\n'), b')']),
+        ]
+        
+        headers = client.iter_headers([b'1', b'2'])
+        
+        assert next(headers).subject == 'a'
+        assert mock_imap.fetch.call_count == 1
+        assert [h.subject for h in headers] == ['b']
+    
+    def test_fetch_body_decodes_base64_transfer_encoding(self, client, mock_imap):
+        """Test base64 bodies are decoded before charset decoding."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (BODY[HEADER.FIELDS (CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] {80}',
+             b'Content-Type: text/html; charset=utf-8\r\n'
+             b'Content-Transfer-Encoding: base64\r\n\r\n'),
+            (b' BODY[TEXT] {26}', b'PGEgaHJlZj0ieCI+\r\nw6k8L2E+\r\n'),
+            b')',
+        ])
+        
+        assert client.fetch_body(b'1')['body_text'] == '<a href="x">é</a>'
+    
+    def test_fetch_body_decodes_quoted_printable(self, client, mock_imap):
+        """Test quoted-printable bodies are decoded, including soft breaks."""
+        mock_imap.fetch.return_value = ('OK', [
+            (b'1 (BODY[HEADER.FIELDS (CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] {60}',
+             b'Content-Type: text/plain; charset=utf-8\r\n'
+             b'Content-Transfer-Encoding: quoted-printable\r\n\r\n'),
+            (b' BODY[TEXT] {20}', b'caf=C3=A9 un=\r\nsubscribe'),
+            b')',
+        ])
+        
+        assert client.fetch_body(b'1')['body_text'] == 'café unsubscribe'
+    
+    def test_filter_by_sender_exact_address(self, client, mock_imap):
+        """Test substring search hits from other senders are dropped."""
+        mock_imap.uid.return_value = ('OK', [
+            (b'1 (UID 11 BODY[HEADER.FIELDS (FROM)] {30}', b'From: Bob <BOB@x.com>\r\n\r\n'),
+            b')',
+            (b'2 (UID 12 BODY[HEADER.FIELDS (FROM)] {30}', b'From: jimbob@x.com\r\n\r\n'),
+            b')',
+            (b'3 (UID 13 BODY[HEADER.FIELDS (FROM)] {30}', b'From: bob@x.com.evil\r\n\r\n'),
+            b')',
+            # UID reported after the literal
+            (b'4 (BODY[HEADER.FIELDS (FROM)] {30}', b'From: bob@x.com\r\n\r\n'),
+            b' UID 14)',
+        ])
+        
+        uids = [b'11', b'12', b'13', b'14']
+        assert client._filter_by_sender(uids, 'bob@x.com') == [b'11', b'14']
+        mock_imap.uid.assert_called_once_with(
+            'FETCH', b'11:14', '(UID BODY.PEEK[HEADER.FIELDS (FROM)])'
+        )
+    
+    def test_delete_emails_from_sender_only_exact_matches(self, client, mock_imap):
+        """Test deletion works on UIDs and only flags exact sender matches."""
+        mock_imap.select.return_value = ('OK', [b'4'])
+        mock_imap.capability.return_value = ('OK', [b'IMAP4rev1 UIDPLUS MOVE'])
+        fetched = ('OK', [
+            (b'1 (UID 40 BODY[HEADER.FIELDS (FROM)] {20}', b'From: a@x.com\r\n\r\n'),
+            b')',
+            (b'2 (UID 41 BODY[HEADER.FIELDS (FROM)] {20}', b'From: ba@x.com\r\n\r\n'),
+            b')',
+        ])
+        mock_imap.uid.side_effect = lambda command, *args: {
+            'SEARCH': ('OK', [b'40 41']), 'FETCH': fetched
+        }.get(command, ('OK', [None]))
+        
+        count, message = client.delete_emails_from_sender('a@x.com')
+        
+        assert count == 1
+        mock_imap.uid.assert_has_calls([
+            call('SEARCH', None, 'X-GM-RAW', '"from:a@x.com"'),
+            call('FETCH', b'40:41', '(UID BODY.PEEK[HEADER.FIELDS (FROM)])'),
+            call('STORE', b'40', '+FLAGS.SILENT', '(\\Deleted)'),
+            call('EXPUNGE', b'40'),
+        ])
+        mock_imap.expunge.assert_not_called()
+        mock_imap.search.assert_not_called()
+    
+    def test_search_by_sender_uses_standard_from_off_gmail(self, client, mock_imap):
+        """Test non-Gmail servers get a plain SEARCH FROM query."""
+        client.provider = 'outlook'
+        mock_imap.uid.return_value = ('OK', [b'3 7'])
+        
+        assert client._search_by_sender('a@x.com') == [b'3', b'7']
+        mock_imap.uid.assert_called_once_with('SEARCH', None, 'FROM "a@x.com"')
+    
+    def test_expunge_without_uidplus_falls_back(self, client, mock_imap):
+        """Test a plain EXPUNGE is used when the server lacks UIDPLUS."""
+        mock_imap.capability.return_value = ('OK', [b'IMAP4rev1 IDLE'])
+        
+        client._expunge([b'5'])
+        client._expunge([b'6'])
+        
+        mock_imap.uid.assert_not_called()
+        assert mock_imap.expunge.call_count == 2
+        mock_imap.capability.assert_called_once()
+    
+    def test_fetch_body_downloads_only_text_parts(self, client, mock_imap):
+        """Test BODYSTRUCTURE is used to fetch the plain and HTML parts only."""
+        structure = (
+            b'1 (BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "iso-8859-1") NIL NIL '
+            b'"QUOTED-PRINTABLE" 12 1 NIL NIL NIL)("TEXT" "HTML" ("CHARSET" "utf-8") '
+            b'NIL NIL "BASE64" 24 1 NIL NIL NIL) "ALTERNATIVE" ("BOUNDARY" "b1") NIL NIL)'
+            b'("APPLICATION" "PDF" ("NAME" "x.pdf") NIL NIL "BASE64" 90000 NIL '
+            b'("ATTACHMENT" ("FILENAME" "x.pdf")) NIL) "MIXED" ("BOUNDARY" "b0") NIL NIL))'
+        )
+        mock_imap.fetch.side_effect = [
+            ('OK', [structure]),
+            ('OK', [
+                (b'1 (BODY[1.1] {9}', b'caf=E9 ok'),
+                (b' BODY[1.2] {20}', b'PGI+w6k8L2I+'),
+                b')',
+            ]),
+        ]
+        
+        body = client.fetch_body(b'1')
+        
+        assert body == {'id': '1', 'body_text': 'café ok', 'body_html': '<b>é</b>'}
+        mock_imap.fetch.assert_called_with(b'1', '(BODY.PEEK[1.1] BODY.PEEK[1.2])')
+    
+    def test_fetch_body_single_part_uses_text_section(self, client, mock_imap):
+        """Test a non-multipart message fetches its TEXT section."""
+        mock_imap.fetch.side_effect = [
+            ('OK', [b'1 (BODYSTRUCTURE ("TEXT" "HTML" NIL NIL NIL "7BIT" 11 1 NIL NIL NIL))']),
+            ('OK', [(b'1 (BODY[TEXT] {11}', b'<p>hi</p>'), b')']),
+        ]
+        
+        body = client.fetch_body(b'1')
+        
+        assert body['body_html'] == '<p>hi</p>'
+        assert body['body_text'] == ''
+        mock_imap.fetch.assert_called_with(b'1', '(BODY.PEEK[TEXT])')
+    
+    def test_fetch_body_single_part_attachment_downloads_nothing(self, client, mock_imap):
+        """Test a message whose only part is a PDF gets empty bodies."""
+        mock_imap.fetch.return_value = ('OK', [
+            b'1 (BODYSTRUCTURE ("APPLICATION" "PDF" ("NAME" "x.pdf") NIL NIL "BASE64" 90000 NIL NIL NIL))'
+        ])
+        
+        body = client.fetch_body(b'1')
+        
+        assert body == {'id': '1', 'body_text': '', 'body_html': ''}
+        mock_imap.fetch.assert_called_once_with(b'1', '(BODYSTRUCTURE)')
+    
+    def test_fetch_body_attachments_only_multipart_downloads_nothing(self, client, mock_imap):
+        """Test a multipart message holding only an image and a PDF skips both."""
+        mock_imap.fetch.return_value = ('OK', [
+            b'1 (BODYSTRUCTURE (("IMAGE" "PNG" NIL NIL NIL "BASE64" 5000 NIL NIL NIL)'
+            b'("APPLICATION" "PDF" NIL NIL NIL "BASE64" 90000 NIL NIL NIL) "MIXED" NIL NIL NIL))'
+        ])
+        
+        body = client.fetch_body(b'1')
+        
+        assert body == {'id': '1', 'body_text': '', 'body_html': ''}
+        mock_imap.fetch.assert_called_once()
+    
+    def test_fetch_body_unparsable_structure_uses_text_fallback(self, client, mock_imap):
+        """Test a structure that can't be parsed still falls back to TEXT."""
+        mock_imap.fetch.side_effect = [
+            ('OK', [b'1 (BODYSTRUCTURE ("TEXT" "PLAIN"']),
+            ('OK', [(b'1 (BODY[TEXT] {2}', b'hi'), b')']),
+        ]
+        
+        assert client.fetch_body(b'1')['body_text'] == 'hi'
+        assert mock_imap.fetch.call_count == 2
+    
+    def test_keepalive_sends_noop_and_rearms(self, client, mock_imap):
+        """Test the keepalive timer pings an idle connection and schedules the next."""
+        client.keepalive(interval=60)
+        first = client._keepalive_timer
+        first.cancel()
+        client._send_keepalive(60)
+        
+        mock_imap.noop.assert_called_once()
+        assert client._keepalive_timer is not first
+        assert client._keepalive_timer.interval == 60
+        client.disconnect()
+        assert client._keepalive_timer is None
+    
+    def test_keepalive_skips_noop_while_command_in_flight(self, client, mock_imap):
+        """Test no NOOP is interleaved with a command running on another thread."""
+        started = threading.Event()
+        finish = threading.Event()
+        
+        def slow_fetch(*args):
+            started.set()
+            finish.wait(5)
+            return ('OK', [])
+        
+        mock_imap.search.side_effect = slow_fetch
+        worker = threading.Thread(target=client.fetch_email_ids)
+        worker.start()
+        started.wait(5)
+        
+        client._send_keepalive(60)
+        finish.set()
+        worker.join(5)
+        
+        mock_imap.noop.assert_not_called()
+        # The next timer is still armed for when the connection goes idle
+        assert client._keepalive_timer is not None
+        client.disconnect()
+
+
+class TestIMAPConnectionPool:
+    """Test cases for IMAPConnectionPool."""
+    
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        """Create a pool whose new members are mocks instead of real sessions."""
+        pool = IMAPConnectionPool('a@gmail.com', Mock(), 'gmail', size=2)
+        opened = []
+        
+        def open_member():
+            member = Mock()
+            member._command_lock = threading.RLock()
+            member.imap.noop.return_value = ('OK', [b''])
+            opened.append(member)
+            return member
+        
+        monkeypatch.setattr(pool, '_open', open_member)
+        pool.opened = opened
+        return pool
+    
+    def test_for_account_returns_shared_pool(self):
+        """Test one pool exists per account and close_all drops it."""
+        strategy = Mock()
+        first = IMAPConnectionPool.for_account('A@gmail.com', strategy, 'gmail', 2)
+        
+        assert IMAPConnectionPool.for_account('a@gmail.com', strategy, 'gmail', 2) is first
+        IMAPConnectionPool.close_all()
+        assert IMAPConnectionPool.for_account('a@gmail.com', strategy, 'gmail', 2) is not first
+        IMAPConnectionPool.close_all()
+    
+    def test_last_release_closes_pool(self, monkeypatch):
+        """Test the pool is closed and forgotten once every owner releases it."""
+        strategy = Mock()
+        pool = IMAPConnectionPool.for_account('a@gmail.com', strategy, 'gmail', 2)
+        IMAPConnectionPool.for_account('a@gmail.com', strategy, 'gmail', 2)
+        close = Mock()
+        monkeypatch.setattr(pool, 'close', close)
+        
+        pool.release()
+        close.assert_not_called()
+        pool.release()
+        
+        close.assert_called_once()
+        assert IMAPConnectionPool.for_account('a@gmail.com', strategy, 'gmail', 2) is not pool
+        IMAPConnectionPool.close_all()
+    
+    def test_new_strategy_retires_existing_sessions(self, pool):
+        """Test a pool asked for with new credentials stops reusing old sessions."""
+        IMAPConnectionPool._pools[('a@gmail.com', 'gmail')] = pool
+        with pool.acquire(2):
+            pass
+        with pool.acquire(1) as clients:
+            busy = clients[0]
+            idle = next(member for member in pool.opened if member is not busy)
+            new_strategy = Mock()
+            
+            assert IMAPConnectionPool.for_account('a@gmail.com', new_strategy, 'gmail', 2) is pool
+            
+            assert pool.auth_strategy is new_strategy
+            busy.disconnect.assert_not_called()
+        
+        # The idle session is closed at once, the busy one when checked in
+        idle.disconnect.assert_called_once()
+        busy.disconnect.assert_called_once()
+        with pool.acquire(1) as clients:
+            assert clients[0] not in (idle, busy)
+        IMAPConnectionPool.close_all()
+    
+    def test_acquire_reuses_released_sessions(self, pool):
+        """Test released members are handed out again without reconnecting."""
+        with pool.acquire(2) as clients:
+            first = list(clients)
+        with pool.acquire(3) as clients:
+            assert clients == first
+        
+        assert len(pool.opened) == 2
+        # Reused sessions are NOOPed so they see other sessions' expunges
+        for member in first:
+            member.imap.noop.assert_called_once()
+    
+    def test_acquire_replaces_dead_idle_session(self, pool):
+        """Test an idle member failing its NOOP check is dropped and replaced."""
+        with pool.acquire(1) as clients:
+            dead = clients[0]
+        dead.imap.noop.side_effect = OSError('connection reset')
+        
+        with pool.acquire(1) as clients:
+            assert clients[0] is not dead
+        
+        dead.disconnect.assert_called_once()
+        assert pool.clients == [pool.opened[1]]
+    
+    def test_close_disconnects_members(self, pool):
+        """Test close logs out every member and empties the pool."""
+        with pool.acquire(2):
+            pass
+        
+        pool.close()
+        
+        for member in pool.opened:
+            member.disconnect.assert_called_once()
+        with pool.acquire(1) as clients:
+            assert clients == [pool.opened[2]]
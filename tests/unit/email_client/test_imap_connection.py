@@ -3,7 +3,9 @@
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 import imaplib
-from src.email_client.imap_connection import IMAPConnectionManager
+from src.email_client.imap_connection import (
+    IMAPConnectionManager, ResumableIMAP4_SSL, detect_provider
+)
 from src.email_client.auth.auth_strategy import IMAPAuthStrategy
 
 
@@ -73,7 +75,20 @@ class TestIMAPConnectionManager:
         with pytest.raises(ValueError, match="Unsupported email provider"):
             connection_manager._detect_provider('test@unknown.com')
     
-    @patch('imaplib.IMAP4_SSL')
+    def test_detect_provider_case_insensitive(self, connection_manager):
+        """Test detection ignores domain case and needs an exact domain."""
+        assert connection_manager._detect_provider('Test@GMail.COM') == 'gmail'
+        with pytest.raises(ValueError):
+            connection_manager._detect_provider('test@notgmail.com')
+    
+    def test_detect_provider_single(self):
+        """Test single-address detection is case-insensitive on the domain."""
+        assert detect_provider('A@GoogleMail.COM') == 'gmail'
+        assert detect_provider('a@live.com') == 'outlook'
+        assert detect_provider('a@gmail.com.evil') is None
+        assert detect_provider('no-at-sign') is None
+    
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_connect_success(self, mock_imap_class, connection_manager, mock_auth_strategy):
         """Test successful connection."""
         mock_connection = MagicMock()
@@ -86,7 +101,30 @@ class TestIMAPConnectionManager:
         assert connection_manager.get_connection() == mock_connection
         mock_auth_strategy.authenticate.assert_called_once_with(mock_connection, 'test@gmail.com')
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
+    def test_connect_resumes_previous_tls_session(self, mock_imap_class, connection_manager):
+        """Test the stored TLS session for the server is offered on connect."""
+        session = Mock()
+        with patch.dict(IMAPConnectionManager._tls_sessions, {'imap.gmail.com': session}):
+            connection_manager.connect()
+        
+        mock_imap_class.assert_called_once_with('imap.gmail.com', 993, session=session)
+    
+    def test_resumable_socket_passes_session(self):
+        """Test the TLS wrap is given the session to resume."""
+        with patch('imaplib.IMAP4_SSL.__init__', return_value=None):
+            conn = ResumableIMAP4_SSL('imap.gmail.com', session='prev', ssl_context=Mock())
+        conn.host = 'imap.gmail.com'
+        conn.ssl_context = Mock()
+        
+        with patch('imaplib.IMAP4._create_socket', return_value='raw'):
+            conn._create_socket(None)
+        
+        conn.ssl_context.wrap_socket.assert_called_once_with(
+            'raw', server_hostname='imap.gmail.com', session='prev'
+        )
+    
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_connect_auth_failure(self, mock_imap_class, connection_manager, mock_auth_strategy):
         """Test connection with authentication failure."""
         mock_connection = MagicMock()
@@ -99,7 +137,7 @@ class TestIMAPConnectionManager:
         assert not connection_manager.is_connected()
         assert connection_manager.get_connection() is None
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_connect_network_error(self, mock_imap_class, connection_manager):
         """Test connection with network error."""
         mock_imap_class.side_effect = Exception("Network error")
@@ -155,7 +193,7 @@ class TestIMAPConnectionManager:
         """Test get_connection when not connected."""
         assert connection_manager.get_connection() is None
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_reconnect_success(self, mock_imap_class, connection_manager, mock_auth_strategy):
         """Test successful reconnection."""
         # Setup initial connection
@@ -170,7 +208,7 @@ class TestIMAPConnectionManager:
         assert connection_manager.get_connection() == mock_connection2
         mock_connection1.logout.assert_called_once()
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_reconnect_failure(self, mock_imap_class, connection_manager):
         """Test reconnection failure."""
         mock_imap_class.side_effect = Exception("Connection failed")
@@ -197,7 +235,7 @@ class TestIMAPConnectionManager:
                 auth_strategy=mock_auth_strategy
             )
     
-    @patch('imaplib.IMAP4_SSL')
+    @patch('src.email_client.imap_connection.ResumableIMAP4_SSL')
     def test_connect_with_unknown_provider_raises(self, mock_imap_class, mock_auth_strategy):
         """Test connection with unknown provider fails."""
         manager = IMAPConnectionManager(
@@ -0,0 +1,92 @@
+"""Unit tests for UnsubscribeAnalytics.
+
+Tests analytics logic including:
+- Strategy stats caching across report methods
+- Top failing senders
+- CSV export
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.scoring.analytics import UnsubscribeAnalytics
+
+
+class TestUnsubscribeAnalytics:
+    """Test suite for UnsubscribeAnalytics class."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create mock database manager with a few logged attempts."""
+        db = Mock()
+        db.get_strategy_stats.return_value = {
+            'total': 4,
+            'successful': 3,
+            'failed': 1,
+            'by_strategy': {
+                'list_unsubscribe': {'total': 3, 'successful': 3, 'failed': 0},
+                'http_link': {'total': 1, 'successful': 0, 'failed': 1},
+            }
+        }
+        db.get_top_failure_senders.return_value = []
+        db.get_failure_reasons_for.return_value = {}
+        db.get_failure_reasons.return_value = []
+        return db
+
+    @pytest.fixture
+    def analytics(self, mock_db):
+        """Create UnsubscribeAnalytics instance with mock DB."""
+        return UnsubscribeAnalytics(mock_db)
+
+    def test_stats_shared_across_methods(self, analytics, mock_db):
+        """Test one stats query serves report, effectiveness and success rate."""
+        report = analytics.generate_report()
+        effectiveness = analytics.get_strategy_effectiveness()
+        rate = analytics.get_success_rate()
+
+        assert report['success_rate'] == 75.0
+        assert effectiveness == {'list_unsubscribe': 100.0, 'http_link': 0.0}
+        assert rate == 75.0
+        mock_db.get_strategy_stats.assert_called_once()
+
+    def test_stats_refetched_after_ttl(self, analytics, mock_db, monkeypatch):
+        """Test cached stats expire after the TTL."""
+        analytics.get_success_rate()
+        analytics.get_success_rate()
+
+        monkeypatch.setattr(UnsubscribeAnalytics, 'STATS_CACHE_TTL', 0)
+        analytics.get_success_rate()
+
+        assert mock_db.get_strategy_stats.call_count == 2
+
+    def test_top_failures_stitches_counts_and_reasons(self, analytics, mock_db):
+        """Test top failures combine the SQL ranking with per-sender reasons."""
+        mock_db.get_top_failure_senders.return_value = [
+            {'sender_email': 'a@x.com', 'count': 4},
+            {'sender_email': 'b@x.com', 'count': 1},
+        ]
+        mock_db.get_failure_reasons_for.return_value = {'a@x.com': ['timeout 3', 'timeout 2']}
+
+        top = analytics.get_top_failures(limit=2)
+
+        assert top == [
+            {'sender': 'a@x.com', 'failure_count': 4, 'reasons': ['timeout 3', 'timeout 2']},
+            {'sender': 'b@x.com', 'failure_count': 1, 'reasons': []},
+        ]
+        mock_db.get_top_failure_senders.assert_called_once_with(2)
+        mock_db.get_failure_reasons_for.assert_called_once_with(
+            ['a@x.com', 'b@x.com'], per_sender=3
+        )
+        mock_db.get_action_history.assert_not_called()
+
+    def test_export_to_csv(self, analytics, mock_db, tmp_path):
+        """Test the CSV export contains every report section."""
+        mock_db.get_failure_reasons.return_value = [{'reason': 'timeout', 'count': 2}]
+        path = tmp_path / 'report.csv'
+
+        assert analytics.export_to_csv(str(path)) is True
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert 'Success Rate,75.0%' in lines
+        assert 'list_unsubscribe,3,3,0,100.0%' in lines
+        assert 'http_link,1,0,1,0.0%' in lines
+        assert lines[-1] == 'timeout,2'
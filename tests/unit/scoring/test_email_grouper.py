@@ -15,16 +15,27 @@ from src.scoring.scorer import EmailScorer
 from tests.fixtures.builders import EmailDataBuilder
 
 
+def mock_scorer_with_real_counts():
+    """Create a mock scorer whose score_counts is the real implementation.
+    
+    Lets tests assert calls while scores still follow the real rules:
+    +1 per unread email, +1 per email with links, frequency - 1 per email.
+    """
+    scorer = Mock(spec=EmailScorer)
+    scorer.preload_sender_flags.side_effect = lambda senders: {
+        sender: (False, 0) for sender in senders
+    }
+    scorer.score_counts.side_effect = EmailScorer(None).score_counts
+    return scorer
+
+
 class TestEmailGrouper:
     """Test suite for EmailGrouper class."""
     
     @pytest.fixture
     def mock_scorer(self):
         """Create mock scorer."""
-        scorer = Mock(spec=EmailScorer)
-        # Default: return score of 5 with basic breakdown
-        scorer.calculate_score.return_value = (5, {'total': 5, 'unread': 1})
-        return scorer
+        return mock_scorer_with_real_counts()
     
     @pytest.fixture
     def grouper(self, mock_scorer):
@@ -43,15 +54,13 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'is_unread': True}
         ]
         
-        mock_scorer.calculate_score.return_value = (3, {'total': 3, 'unread': 1})
-        
         result = grouper.group_by_sender(emails)
         
         assert len(result) == 1
         assert result[0]['sender'] == 'test@example.com'
         assert result[0]['total_count'] == 1
         assert result[0]['unread_count'] == 1
-        assert result[0]['total_score'] == 3
+        assert result[0]['total_score'] == 1  # unread
     
     def test_group_multiple_senders(self, grouper, mock_scorer):
         """Test grouping emails from multiple senders."""
@@ -61,8 +70,6 @@ class TestEmailGrouper:
             {'sender': 'sender3@example.com', 'is_unread': True}
         ]
         
-        mock_scorer.calculate_score.return_value = (2, {'total': 2})
-        
         result = grouper.group_by_sender(emails)
         
         assert len(result) == 3
@@ -79,35 +86,23 @@ class TestEmailGrouper:
             {'sender': 'repeat@example.com', 'is_unread': True}
         ]
         
-        mock_scorer.calculate_score.return_value = (3, {'total': 3})
-        
         result = grouper.group_by_sender(emails)
         
         assert len(result) == 1
         assert result[0]['sender'] == 'repeat@example.com'
         assert result[0]['total_count'] == 3
         assert result[0]['unread_count'] == 2
-        assert result[0]['total_score'] == 9  # 3 emails * score 3
+        assert result[0]['total_score'] == 8  # 3 emails * frequency 2 + 2 unread
     
     def test_sorted_by_total_score_descending(self, grouper, mock_scorer):
         """Test that results are sorted by total score descending."""
         emails = [
             {'sender': 'low@example.com', 'is_unread': False},
             {'sender': 'high@example.com', 'is_unread': True},
-            {'sender': 'medium@example.com', 'is_unread': True}
+            {'sender': 'medium@example.com', 'is_unread': True},
+            {'sender': 'high@example.com', 'is_unread': True}
         ]
         
-        # Configure scorer to return different scores per sender
-        def score_side_effect(email_data, frequency, sender):
-            if sender == 'high@example.com':
-                return (10, {'total': 10})
-            elif sender == 'medium@example.com':
-                return (5, {'total': 5})
-            else:
-                return (1, {'total': 1})
-        
-        mock_scorer.calculate_score.side_effect = score_side_effect
-        
         result = grouper.group_by_sender(emails)
         
         # Should be sorted by total_score descending
@@ -115,6 +110,21 @@ class TestEmailGrouper:
         assert result[1]['sender'] == 'medium@example.com'
         assert result[2]['sender'] == 'low@example.com'
     
+    def test_top_k_returns_highest_scoring_senders(self, grouper):
+        """Test top_k keeps only the best senders, in the same order as a full sort."""
+        emails = [
+            {'sender': f'sender{i}@example.com', 'is_unread': True}
+            for i in range(5)
+            for _ in range(i + 1)
+        ]
+        
+        full = grouper.group_by_sender(emails)
+        top = grouper.group_by_sender(emails, top_k=2)
+        
+        assert top == full[:2]
+        assert [r['sender'] for r in top] == ['sender4@example.com', 'sender3@example.com']
+        assert grouper.group_by_sender(emails, top_k=10) == full
+    
     def test_aggregate_unread_count(self, grouper, mock_scorer):
         """Test that unread count is correctly aggregated."""
         emails = [
@@ -124,8 +134,6 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'is_unread': True}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         assert result[0]['unread_count'] == 3
@@ -139,8 +147,6 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'unsubscribe_links': ['https://example.com/unsub3']}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         assert result[0]['has_unsubscribe'] is True
@@ -155,8 +161,6 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'unsubscribe_links': []}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         assert result[0]['has_unsubscribe'] is False
@@ -174,38 +178,48 @@ class TestEmailGrouper:
             ]}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         # Should have maximum 3 links
         assert len(result[0]['sample_links']) <= 3
     
+    def test_sample_links_stop_after_three_unique(self, grouper):
+        """Test link scanning stops as soon as three unique samples are kept."""
+        seen = []
+        
+        class Links(list):
+            def __iter__(self):
+                for link in list.__iter__(self):
+                    seen.append(link)
+                    yield link
+        
+        emails = [
+            {'sender': 'test@example.com', 'unsubscribe_links': Links(['u1', 'u1', 'u2'])},
+            {'sender': 'test@example.com', 'unsubscribe_links': Links(['u3', 'u4', 'u5'])},
+            {'sender': 'test@example.com', 'unsubscribe_links': Links(['u6'])}
+        ]
+        
+        result = grouper.group_by_sender(emails)
+        
+        assert result[0]['sample_links'] == ['u1', 'u2', 'u3']
+        assert seen == ['u1', 'u1', 'u2', 'u3']
+        assert result[0]['has_unsubscribe'] is True
+        assert result[0]['score_breakdown']['has_unsubscribe'] == 3
+    
     def test_calculate_average_score(self, grouper, mock_scorer):
         """Test that average score is calculated correctly."""
         emails = [
-            {'sender': 'test@example.com'},
-            {'sender': 'test@example.com'},
+            {'sender': 'test@example.com', 'is_unread': True},
+            {'sender': 'test@example.com', 'unsubscribe_links': ['https://x.com/u']},
             {'sender': 'test@example.com'}
         ]
         
-        # Configure scorer to return different scores
-        scores = [10, 5, 15]
-        score_index = [0]
-        
-        def score_side_effect(*args, **kwargs):
-            score = scores[score_index[0]]
-            score_index[0] += 1
-            return (score, {'total': score})
-        
-        mock_scorer.calculate_score.side_effect = score_side_effect
-        
         result = grouper.group_by_sender(emails)
         
-        # Average = (10 + 5 + 15) / 3 = 10
-        assert result[0]['average_score'] == 10.0
-        # Total = 10 + 5 + 15 = 30
-        assert result[0]['total_score'] == 30
+        # Total = 3 emails * frequency 2 + 1 unread + 1 with links = 8
+        assert result[0]['total_score'] == 8
+        # Average = 8 / 3
+        assert result[0]['average_score'] == pytest.approx(8 / 3)
     
     def test_last_email_date(self, grouper, mock_scorer):
         """Test that last email date is captured."""
@@ -215,30 +229,57 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'date': '2024-01-03'}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         # Should capture last email's date
         assert result[0]['last_email_date'] == '2024-01-03'
     
     def test_scorer_receives_correct_parameters(self, grouper, mock_scorer):
-        """Test that scorer receives correct frequency and sender."""
+        """Test that scorer receives correct frequency and sender flags."""
         emails = [
             {'sender': 'test@example.com', 'is_unread': True},
             {'sender': 'test@example.com', 'is_unread': False}
         ]
         
-        mock_scorer.calculate_score.return_value = (5, {'total': 5})
+        mock_scorer.preload_sender_flags.side_effect = None
+        mock_scorer.preload_sender_flags.return_value = {'test@example.com': (False, 5)}
         
         grouper.group_by_sender(emails)
         
-        # Scorer should be called with frequency=2 for this sender
-        calls = mock_scorer.calculate_score.call_args_list
-        for call in calls:
-            kwargs = call[1] if len(call) > 1 else call.kwargs
-            assert kwargs.get('frequency') == 2
-            assert kwargs.get('sender') == 'test@example.com'
+        # Sender flags are preloaded in bulk, then the sender is scored from counts
+        mock_scorer.preload_sender_flags.assert_called_once_with(['test@example.com'])
+        mock_scorer.get_sender_flags.assert_not_called()
+        mock_scorer.score_counts.assert_called_once_with(
+            2, unread=1, with_links=0, whitelisted=False, historical_bonus=5
+        )
+    
+    def test_whitelisted_sender_scores_minus_one_per_email(self, grouper, mock_scorer):
+        """Test whitelisted senders score -1 per email through score_counts."""
+        emails = [
+            {'sender': 'safe@example.com', 'is_unread': True},
+            {'sender': 'safe@example.com', 'unsubscribe_links': ['https://x.com/u']},
+            {'sender': 'spam@example.com', 'is_unread': True}
+        ]
+        mock_scorer.preload_sender_flags.side_effect = lambda senders: {
+            sender: (sender == 'safe@example.com', 0) for sender in senders
+        }
+        
+        result = grouper.group_by_sender(emails)
+        
+        safe = next(r for r in result if r['sender'] == 'safe@example.com')
+        assert safe['total_score'] == -2
+        assert safe['average_score'] == -1
+        assert safe['score_breakdown'] == {
+            'total': -2, 'unread': 0, 'frequency': 0,
+            'has_unsubscribe': 0, 'historical_unwanted': 0
+        }
+        assert result[-1] is safe
+        mock_scorer.score_counts.assert_any_call(
+            2, unread=1, with_links=1, whitelisted=True, historical_bonus=0
+        )
+        mock_scorer.score_counts.assert_any_call(
+            1, unread=1, with_links=0, whitelisted=False, historical_bonus=0
+        )
     
     def test_missing_sender_field(self, grouper, mock_scorer):
         """Test handling email missing sender field."""
@@ -247,8 +288,6 @@ class TestEmailGrouper:
             {'sender': 'test@example.com', 'is_unread': False}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         # Should use default sender for missing field
@@ -260,24 +299,89 @@ class TestEmailGrouper:
     def test_score_breakdown_aggregation(self, grouper, mock_scorer):
         """Test that score breakdowns are aggregated for sender."""
         emails = [
-            {'sender': 'test@example.com'},
-            {'sender': 'test@example.com'}
-        ]
-        
-        # Return different breakdowns for each email
-        breakdowns = [
-            (5, {'total': 5, 'unread': 1, 'frequency': 2}),
-            (7, {'total': 7, 'unread': 1, 'frequency': 2, 'has_unsubscribe': 1})
+            {'sender': 'test@example.com', 'is_unread': True},
+            {'sender': 'test@example.com', 'is_unread': True, 'unsubscribe_links': ['https://x.com/u']}
         ]
-        mock_scorer.calculate_score.side_effect = breakdowns
         
         result = grouper.group_by_sender(emails)
         
         # Breakdown should be aggregated
         breakdown = result[0]['score_breakdown']
-        assert breakdown['total'] == 12  # 5 + 7
+        assert breakdown['total'] == 5  # 2 frequency + 2 unread + 1 link
         assert breakdown['unread'] == 2  # 1 + 1
-        assert breakdown['frequency'] == 4  # 2 + 2
+        assert breakdown['frequency'] == 2  # 1 + 1
+        assert breakdown['has_unsubscribe'] == 1
+    
+    def test_accumulate_then_finalize_matches_group_by_sender(self, grouper):
+        """Test streaming emails into accumulators gives the same senders."""
+        emails = [
+            {'sender': 'a@example.com', 'is_unread': True, 'date': '2024-01-01'},
+            {'sender': 'b@example.com', 'unsubscribe_links': ['https://b.com/u']},
+            {'sender': 'a@example.com', 'unsubscribe_links': ['https://a.com/u'], 'date': '2024-01-02'}
+        ]
+        
+        accumulators = {}
+        for email in emails:
+            grouper.accumulate(accumulators, email)
+        
+        assert set(accumulators) == {'a@example.com', 'b@example.com'}
+        assert accumulators['a@example.com'].count == 2
+        assert grouper.finalize(accumulators) == grouper.group_by_sender(emails)
+    
+    def test_group_by_sender_single_pass_over_generator(self, grouper):
+        """Test emails are reduced in one pass without being stored."""
+        consumed = []
+        
+        def emails():
+            for i in range(6):
+                email = {'sender': f'sender{i % 2}@example.com', 'is_unread': i < 3}
+                consumed.append(i)
+                yield email
+        
+        result = grouper.group_by_sender(emails())
+        
+        assert consumed == list(range(6))
+        assert sorted((r['sender'], r['total_count'], r['unread_count']) for r in result) == [
+            ('sender0@example.com', 3, 2),
+            ('sender1@example.com', 3, 1)
+        ]
+    
+    def test_finalize_empty_accumulators(self, grouper, mock_scorer):
+        """Test finalizing with no emails skips the bulk sender lookup."""
+        assert grouper.finalize({}) == []
+        mock_scorer.preload_sender_flags.assert_not_called()
+    
+    def test_breakdown_with_real_scorer(self):
+        """Test the sender breakdown sums every component from batch scoring."""
+        grouper = EmailGrouper(EmailScorer(None))
+        emails = [
+            {'sender': 'test@example.com', 'is_unread': True, 'unsubscribe_links': ['https://x.com/u']},
+            {'sender': 'test@example.com', 'is_unread': False},
+        ]
+        
+        result = grouper.group_by_sender(emails)
+        
+        assert result[0]['score_breakdown'] == {
+            'total': 4, 'unread': 1, 'frequency': 2,
+            'has_unsubscribe': 1, 'historical_unwanted': 0
+        }
+        assert result[0]['average_score'] == 2.0
+    
+    def test_frequency_bonus_computed_once_per_sender(self, monkeypatch):
+        """Test the frequency term is worked out per sender, not per email."""
+        scorer = EmailScorer(None)
+        calls = []
+        original = scorer._calculate_frequency_score
+        monkeypatch.setattr(
+            scorer, '_calculate_frequency_score',
+            lambda frequency: calls.append(frequency) or original(frequency)
+        )
+        emails = [{'sender': 'a@example.com'}] * 4 + [{'sender': 'b@example.com'}] * 2
+        
+        result = EmailGrouper(scorer).group_by_sender(emails)
+        
+        assert sorted(calls) == [2, 4]
+        assert [r['score_breakdown']['frequency'] for r in result] == [12, 2]
 
 
 class TestEmailGrouperPerformance:
@@ -286,9 +390,7 @@ class TestEmailGrouperPerformance:
     @pytest.fixture
     def mock_scorer(self):
         """Create mock scorer."""
-        scorer = Mock(spec=EmailScorer)
-        scorer.calculate_score.return_value = (5, {'total': 5})
-        return scorer
+        return mock_scorer_with_real_counts()
     
     @pytest.fixture
     def grouper(self, mock_scorer):
@@ -310,8 +412,6 @@ class TestEmailGrouperPerformance:
                     'unsubscribe_links': [f'https://example.com/unsub{i}']
                 })
         
-        mock_scorer.calculate_score.return_value = (3, {'total': 3})
-        
         start_time = time.time()
         result = grouper.group_by_sender(emails)
         elapsed_time = time.time() - start_time
@@ -330,8 +430,6 @@ class TestEmailGrouperPerformance:
             for i in range(1000)
         ]
         
-        mock_scorer.calculate_score.return_value = (2, {'total': 2})
-        
         result = grouper.group_by_sender(emails)
         
         assert len(result) == 1000
@@ -344,9 +442,7 @@ class TestEmailGrouperEdgeCases:
     @pytest.fixture
     def mock_scorer(self):
         """Create mock scorer."""
-        scorer = Mock(spec=EmailScorer)
-        scorer.calculate_score.return_value = (5, {'total': 5})
-        return scorer
+        return mock_scorer_with_real_counts()
     
     @pytest.fixture
     def grouper(self, mock_scorer):
@@ -360,8 +456,6 @@ class TestEmailGrouperEdgeCases:
             {'sender': 'test@example.com'}  # No other fields
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         # Should handle gracefully
         result = grouper.group_by_sender(emails)
         
@@ -373,8 +467,6 @@ class TestEmailGrouperEdgeCases:
             {'sender': 'test@example.com', 'is_unread': None}  # Don't include None unsubscribe_links
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         assert len(result) == 1
@@ -387,30 +479,8 @@ class TestEmailGrouperEdgeCases:
             {'sender': '', 'is_unread': True}
         ]
         
-        mock_scorer.calculate_score.return_value = (1, {'total': 1})
-        
         result = grouper.group_by_sender(emails)
         
         # Should group by empty string
         assert len(result) == 1
         assert result[0]['sender'] == ''
-    
-    def test_aggregate_score_breakdowns_empty_list(self, grouper):
-        """Test aggregating empty breakdown list."""
-        result = grouper._aggregate_score_breakdowns([])
-        
-        assert result == {'total': 0}
-    
-    def test_aggregate_score_breakdowns_missing_keys(self, grouper):
-        """Test aggregating breakdowns with missing keys."""
-        breakdowns = [
-            {'total': 5},  # Missing other keys
-            {'total': 3, 'unread': 1}  # Has some keys
-        ]
-        
-        result = grouper._aggregate_score_breakdowns(breakdowns)
-        
-        assert result['total'] == 8
-        assert result['unread'] == 1
-        assert result['frequency'] == 0
-
@@ -171,6 +171,64 @@ class TestEmailScorer:
         assert score == 9
         assert breakdown['historical_unwanted'] == 5
     
+    def test_score_counts_matches_per_email_scoring(self, scorer):
+        """Test scoring from counts sums the per-email breakdowns."""
+        emails = [
+            {'is_unread': True, 'unsubscribe_links': ['https://example.com/unsub']},
+            {'is_unread': True},
+            {},
+        ]
+        
+        expected = [scorer.calculate_score_cached(e, 3, False, 5)[1] for e in emails]
+        components = scorer.score_counts(3, unread=2, with_links=1, whitelisted=False,
+                                         historical_bonus=5)
+        
+        for key in ('total', 'unread', 'frequency', 'has_unsubscribe', 'historical_unwanted'):
+            assert components[key] == sum(b.get(key, 0) for b in expected)
+        assert scorer.score_counts(3, 2, 1, True, 5)['total'] == -3
+    
+    def test_get_sender_flags(self, scorer, mock_db):
+        """Test sender flags resolve whitelist first and skip unwanted when protected."""
+        mock_db.check_unwanted.return_value = True
+        assert scorer.get_sender_flags('spam@example.com') == (False, 5)
+        
+        mock_db.check_whitelist.return_value = True
+        mock_db.check_unwanted.reset_mock()
+        assert scorer.get_sender_flags('friend@example.com') == (True, 0)
+        mock_db.check_unwanted.assert_not_called()
+        
+        assert scorer.get_sender_flags(None) == (False, 0)
+    
+    def test_preload_sender_flags(self, scorer, mock_db):
+        """Test bulk sender flags match get_sender_flags per sender."""
+        mock_db.get_whitelist_set.return_value = {'friend@example.com'}
+        mock_db.get_unwanted_set.return_value = {'spam@example.com', 'friend@example.com'}
+        
+        flags = scorer.preload_sender_flags(['friend@example.com', 'spam@example.com', 'new@example.com'])
+        
+        assert flags == {
+            'friend@example.com': (True, 0),
+            'spam@example.com': (False, 5),
+            'new@example.com': (False, 0),
+        }
+        mock_db.check_whitelist.assert_not_called()
+        mock_db.check_unwanted.assert_not_called()
+    
+    def test_calculate_score_cached_skips_db(self, scorer, mock_db):
+        """Test pre-resolved flags give the same score without DB lookups."""
+        email_data = {'is_unread': True}
+        
+        score, breakdown = scorer.calculate_score_cached(email_data, 3, False, 5)
+        
+        # 1 (unread) + 2 (frequency) + 5 (historical) = 8
+        assert score == 8
+        assert breakdown['historical_unwanted'] == 5
+        assert scorer.calculate_score_cached(email_data, 3, True, 0) == (
+            -1, {'whitelisted': True, 'total': -1}
+        )
+        mock_db.check_whitelist.assert_not_called()
+        mock_db.check_unwanted.assert_not_called()
+    
     def test_scoring_without_db_manager(self, scorer_no_db):
         """Test scoring works without database manager."""
         email_data = {
@@ -5,6 +5,7 @@ Tests the email deletion service with mocked dependencies to verify
 deletion orchestration, whitelist protection, progress reporting, and error handling.
 """
 
+import threading
 import pytest
 from unittest.mock import Mock
 from src.services.email_deletion_service import EmailDeletionService
@@ -17,6 +18,7 @@ class TestEmailDeletionService:
     def mock_client(self):
         """Create mock email client."""
         client = Mock()
+        client.MAX_CONCURRENT_DELETES = 1
         client.delete_emails_from_sender.return_value = (10, "Deleted 10 emails")
         return client
     
@@ -102,7 +104,9 @@ class TestEmailDeletionService:
         assert results['failed_senders'] == 1
         assert results['deleted_senders'] == 0
         # Should log the failure
-        mock_db.log_action.assert_called()
+        mock_db.log_actions_bulk.assert_called_once_with(
+            [('error@example.com', 'delete', False, 'Error: Network error')]
+        )
     
     def test_delete_with_progress_callback(self, service):
         """Test that progress callback is invoked."""
@@ -178,11 +182,12 @@ class TestEmailDeletionService:
         service.delete_from_senders(senders)
         
         # Should log the action
-        mock_db.log_action.assert_called()
-        call_args = mock_db.log_action.call_args[0]
-        assert call_args[0] == 'spam@example.com'
-        assert call_args[1] == 'delete'
-        assert call_args[2] is True  # success
+        mock_db.log_actions_bulk.assert_called_once()
+        rows = mock_db.log_actions_bulk.call_args[0][0]
+        assert len(rows) == 1
+        assert rows[0][0] == 'spam@example.com'
+        assert rows[0][1] == 'delete'
+        assert rows[0][2] is True  # success
     
     def test_delete_from_must_delete_list_success(self, service, mock_db, mock_client):
         """Test deleting from must-delete list."""
@@ -278,6 +283,33 @@ class TestEmailDeletionService:
         assert results1['deleted_senders'] == 1
         assert results2['deleted_senders'] == 1
     
+    def test_delete_logs_all_senders_in_one_batch(self, service, mock_client, mock_db):
+        """Test every sender's log row is written with one bulk call."""
+        mock_client.delete_emails_from_sender.side_effect = [
+            (2, "Deleted 2"),
+            Exception("Network error"),
+            (4, "Deleted 4"),
+        ]
+        senders = [{'sender': f'spam{i}@example.com'} for i in range(3)]
+        
+        service.delete_from_senders(senders)
+        
+        mock_db.log_action.assert_not_called()
+        mock_db.log_actions_bulk.assert_called_once_with([
+            ('spam0@example.com', 'delete', True, 'Deleted 2 emails'),
+            ('spam1@example.com', 'delete', False, 'Error: Network error'),
+            ('spam2@example.com', 'delete', True, 'Deleted 4 emails'),
+        ])
+    
+    def test_delete_log_flush_error_does_not_fail(self, service, mock_db):
+        """Test a failed bulk log write is reported without losing results."""
+        mock_db.log_actions_bulk.side_effect = Exception("database is locked")
+        
+        results = service.delete_from_senders([{'sender': 'spam@example.com'}])
+        
+        assert results['deleted_senders'] == 1
+        assert results['failed_senders'] == 0
+    
     def test_delete_with_must_delete_removal_error(self, service, mock_db, mock_client):
         """Test that must-delete removal errors are logged but don't stop processing."""
         mock_db.remove_from_must_delete.side_effect = Exception("Remove failed")
@@ -292,4 +324,56 @@ class TestEmailDeletionService:
         
         assert results['deleted_senders'] == 1
         assert results['failed_senders'] == 0
-
+    
+    def test_concurrent_deletion_aggregates_results(self, service, mock_client, mock_db):
+        """Test senders are deleted on worker threads when the client allows it."""
+        mock_client.MAX_CONCURRENT_DELETES = 4
+        mock_db.check_whitelist.side_effect = lambda email: email == 'safe@example.com'
+        threads = set()
+        
+        def delete(sender_email, db):
+            threads.add(threading.get_ident())
+            if sender_email == 'broken@example.com':
+                raise Exception("Network error")
+            return (3, "Deleted 3")
+        
+        mock_client.delete_emails_from_sender.side_effect = delete
+        senders = [{'sender': f'spam{i}@example.com'} for i in range(5)]
+        senders += [{'sender': 'safe@example.com'}, {'sender': 'broken@example.com'}]
+        calls = []
+        
+        results = service.delete_from_senders(
+            senders, lambda current, total, message: calls.append(current)
+        )
+        
+        assert results['deleted_senders'] == 5
+        assert results['total_emails_deleted'] == 15
+        assert results['skipped_senders'] == 1
+        assert results['failed_senders'] == 1
+        assert sorted(results['deleted_sender_emails']) == [f'spam{i}@example.com' for i in range(5)]
+        assert threading.get_ident() not in threads
+        # Progress after every sender, then the final update
+        assert calls == [1, 2, 3, 4, 5, 6, 7, 7]
+        mock_db.log_actions_bulk.assert_called_once()
+        assert len(mock_db.log_actions_bulk.call_args[0][0]) == 6
+    
+    def test_concurrent_deletion_cancellation(self, service, mock_client):
+        """Test cancelling stops senders that have not started yet."""
+        mock_client.MAX_CONCURRENT_DELETES = 2
+        senders = [{'sender': f'spam{i}@example.com'} for i in range(20)]
+        
+        # Only the first sender finishes before the cancel arrives
+        def delete(sender_email, db):
+            if sender_email != 'spam0@example.com':
+                service.cancel_event.wait(1)
+            return (1, "Deleted 1")
+        
+        mock_client.delete_emails_from_sender.side_effect = delete
+        
+        def progress(current, total, message):
+            service.cancel()
+        
+        results = service.delete_from_senders(senders, progress)
+        
+        assert results['deleted_senders'] < 20
+        assert mock_client.delete_emails_from_sender.call_count <= 3
@@ -17,8 +17,12 @@ class TestEmailScanService:
     def mock_client(self):
         """Create mock email client."""
         client = Mock()
+        client.HEADER_BATCH_SIZE = 100
         client.fetch_email_ids.return_value = ['id1', 'id2', 'id3']
-        client.fetch_headers.return_value = [{'sender': 'test@example.com', 'subject': 'Test'}]
+        # One header per requested ID, in request order
+        client.fetch_headers.side_effect = lambda ids, on_chunk=None: [
+            {'id': msg_id, 'sender': 'test@example.com', 'subject': 'Test'} for msg_id in ids
+        ]
         return client
     
     @pytest.fixture
@@ -47,7 +51,11 @@ class TestEmailScanService:
     def mock_grouper(self):
         """Create mock email grouper."""
         grouper = Mock()
-        grouper.group_by_sender.return_value = [
+        # Collect accumulated emails per sender so tests can inspect them
+        grouper.accumulate.side_effect = (
+            lambda accumulators, email: accumulators.setdefault(email['sender'], []).append(email)
+        )
+        grouper.finalize.return_value = [
             {
                 'sender': 'test@example.com',
                 'email_count': 3,
@@ -77,7 +85,41 @@ class TestEmailScanService:
         assert len(result) == 1
         assert result[0]['sender'] == 'test@example.com'
         assert result[0]['email_count'] == 3
-        mock_grouper.group_by_sender.assert_called_once()
+        assert mock_grouper.accumulate.call_count == 3
+        mock_grouper.finalize.assert_called_once()
+        mock_grouper.group_by_sender.assert_not_called()
+    
+    def test_scan_inbox_passes_top_k_to_grouper(self, service, mock_grouper):
+        """Test the requested number of top senders reaches finalize()."""
+        service.scan_inbox(top_k=50)
+        
+        assert mock_grouper.finalize.call_args[0][1] == 50
+    
+    def test_scan_inbox_fetches_headers_in_batches(self, service, mock_client, mock_parser):
+        """Test headers are requested one batch at a time, not per email."""
+        mock_client.HEADER_BATCH_SIZE = 2
+        mock_client.fetch_email_ids.return_value = ['id1', 'id2', 'id3', 'id4', 'id5']
+        
+        service.scan_inbox()
+        
+        batches = [c.args[0] for c in mock_client.fetch_headers.call_args_list]
+        assert batches == [['id1', 'id2'], ['id3', 'id4'], ['id5']]
+        parsed_ids = [c.args[0]['id'] for c in mock_parser.parse_email.call_args_list]
+        assert parsed_ids == ['id1', 'id2', 'id3', 'id4', 'id5']
+    
+    def test_scan_inbox_failed_batch_continues(self, service, mock_client, mock_grouper):
+        """Test a failed header batch is skipped and later batches still scanned."""
+        mock_client.HEADER_BATCH_SIZE = 2
+        mock_client.fetch_email_ids.return_value = ['id1', 'id2', 'id3']
+        mock_client.fetch_headers.side_effect = [
+            Exception("Connection reset"),
+            [{'id': 'id3', 'sender': 'test@example.com'}]
+        ]
+        
+        result = service.scan_inbox()
+        
+        assert len(result) == 1
+        assert mock_grouper.accumulate.call_count == 1
     
     def test_scan_inbox_empty_inbox(self, service, mock_client):
         """Test scanning empty inbox returns empty list."""
@@ -116,11 +158,12 @@ class TestEmailScanService:
         
         # Should still return grouped results (grouper was called)
         assert len(result) == 1
-        mock_grouper.group_by_sender.assert_called_once()
+        mock_grouper.finalize.assert_called_once()
         # Grouper should have received only the successful email
-        parsed_emails = mock_grouper.group_by_sender.call_args[0][0]
-        assert len(parsed_emails) == 1
-        assert parsed_emails[0]['sender'] == 'good@example.com'
+        accumulators = mock_grouper.finalize.call_args[0][0]
+        assert accumulators == {
+            'good@example.com': [{'sender': 'good@example.com', 'subject': 'Good'}]
+        }
     
     def test_scan_inbox_connection_error_propagates(self, service, mock_client):
         """Test that connection errors are propagated after logging."""
@@ -133,12 +176,13 @@ class TestEmailScanService:
     
     def test_scan_inbox_cancellation(self, service, mock_client):
         """Test that scan can be cancelled mid-operation."""
+        mock_client.HEADER_BATCH_SIZE = 1
         # Setup more emails to process
         mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(10)]
         
         # Cancel after processing first email
         call_count = [0]
-        def side_effect(ids):
+        def side_effect(ids, on_chunk=None):
             call_count[0] += 1
             if call_count[0] == 2:  # After first email
                 service.cancel()
@@ -173,9 +217,10 @@ class TestEmailScanService:
     
     def test_scan_inbox_returns_partial_results_on_cancel(self, service, mock_client, mock_parser, mock_grouper):
         """Test that cancellation returns partial results."""
+        mock_client.HEADER_BATCH_SIZE = 1
         mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(5)]
         mock_parser.parse_email.return_value = {'sender': 'test@example.com'}
-        mock_grouper.group_by_sender.return_value = [{'sender': 'test@example.com', 'count': 2}]
+        mock_grouper.finalize.return_value = [{'sender': 'test@example.com', 'count': 2}]
         
         # Cancel after 2 emails
         call_count = [0]
@@ -191,10 +236,12 @@ class TestEmailScanService:
         
         # Should return grouped results from partial scan
         assert len(result) == 1
-        mock_grouper.group_by_sender.assert_called_once()
+        mock_grouper.finalize.assert_called_once()
+        assert len(mock_grouper.finalize.call_args[0][0]['test@example.com']) == 2
     
     def test_scan_inbox_with_no_headers(self, service, mock_client, mock_parser):
         """Test handling when fetch_headers returns None."""
+        mock_client.fetch_headers.side_effect = None
         mock_client.fetch_headers.return_value = None
         
         result = service.scan_inbox()
@@ -202,10 +249,11 @@ class TestEmailScanService:
         # Should handle gracefully and return empty grouping
         mock_parser.parse_email.assert_not_called()
     
-    def test_scan_inbox_progress_updates_periodically(self, service, mock_client):
-        """Test that progress updates happen every 50 emails."""
-        # Create 150 emails
-        mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(150)]
+    def test_scan_inbox_progress_updates_periodically(self, service, mock_client, monkeypatch):
+        """Test that progress updates happen after each header batch."""
+        monkeypatch.setattr(EmailScanService, 'PROGRESS_INTERVAL', 0)
+        # Create 250 emails
+        mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(250)]
         
         calls = []
         def progress(current, total, message):
@@ -214,11 +262,63 @@ class TestEmailScanService:
         
         service.scan_inbox(progress)
         
-        # Should update at 0, 50, 100, 150
-        assert len(calls) >= 3
-        # Check that updates happen roughly every 50
-        assert any(c in [1, 50, 51] for c in calls)  # First update
-        assert any(c in [100, 101] for c in calls)  # Second update
+        # One update per batch of 100
+        assert calls == [100, 200, 250]
+    
+    def test_scan_inbox_progress_rate_limited(self, service, mock_client, monkeypatch):
+        """Test that batches finishing within the interval share one update."""
+        mock_client.HEADER_BATCH_SIZE = 10
+        monkeypatch.setattr(EmailScanService, 'PROGRESS_INTERVAL', 60)
+        mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(250)]
+        
+        calls = []
+        def progress(current, total, message):
+            calls.append(message)
+        
+        service.scan_inbox(progress)
+        
+        assert calls == ["Fetching email list...", "Analyzing senders..."]
+    
+    def test_scan_inbox_progress_and_cancel_within_batch(self, service, mock_client, monkeypatch):
+        """Test round trips inside one batch report progress and stop once cancelled."""
+        monkeypatch.setattr(EmailScanService, 'PROGRESS_INTERVAL', 0)
+        mock_client.HEADER_BATCH_SIZE = 6
+        mock_client.fetch_email_ids.return_value = [f'id{i}' for i in range(6)]
+        keep_going = []
+        
+        def fetch_headers(ids, on_chunk=None):
+            # Two IDs per round trip; the user cancels during the second
+            headers = []
+            for start in range(0, len(ids), 2):
+                headers.extend({'id': msg_id, 'sender': 'test@example.com'}
+                               for msg_id in ids[start:start + 2])
+                if start == 2:
+                    service.cancel()
+                keep_going.append(on_chunk(2))
+                if not keep_going[-1]:
+                    break
+            return headers
+        
+        mock_client.fetch_headers.side_effect = fetch_headers
+        calls = []
+        def progress(current, total, message):
+            if "Processing" in message:
+                calls.append(current)
+        
+        service.scan_inbox(progress)
+        
+        assert keep_going == [True, False]
+        assert calls == [2, 4]
+    
+    def test_scan_inbox_summarizes_parse_errors(self, service, mock_parser, caplog):
+        """Test parse errors are reported in one summary warning."""
+        mock_parser.parse_email.side_effect = Exception("Parse error")
+        
+        with caplog.at_level('WARNING', logger='src.services.email_scan_service'):
+            service.scan_inbox()
+        
+        warnings = [r.getMessage() for r in caplog.records if r.levelname == 'WARNING']
+        assert warnings == ["Failed to parse 3/3 emails"]
     
     def test_multiple_scans_with_same_service(self, service):
         """Test that the same service can be used for multiple scans."""
@@ -25,6 +25,7 @@ class TestUnsubscribeService:
         """Create mock database manager."""
         db = Mock()
         db.check_whitelist.return_value = False
+        db.get_whitelist_set.return_value = set()
         db.log_action.return_value = None
         return db
     
@@ -58,7 +59,7 @@ class TestUnsubscribeService:
     
     def test_unsubscribe_skips_whitelisted(self, service, mock_db, mock_chain):
         """Test that whitelisted senders are skipped."""
-        mock_db.check_whitelist.side_effect = lambda email: email == 'safe@example.com'
+        mock_db.get_whitelist_set.return_value = {'safe@example.com'}
         
         senders = [
             {'sender': 'safe@example.com', 'list_unsubscribe': '<https://ex.com/unsub>'},
@@ -85,7 +86,9 @@ class TestUnsubscribeService:
         assert results['skipped_count'] == 1
         assert results['success_count'] == 0
         # Should log the attempt
-        mock_db.log_action.assert_called_once()
+        mock_db.log_actions_bulk.assert_called_once_with(
+            [('noreply@example.com', 'unsubscribe', False, 'No unsubscribe method available')]
+        )
         assert mock_chain.execute.call_count == 0
     
     def test_unsubscribe_mixed_results(self, service, mock_chain):
@@ -175,7 +178,7 @@ class TestUnsubscribeService:
         assert results['failed_count'] == 1
         assert results['success_count'] == 0
         # Should log the error
-        mock_db.log_action.assert_called()
+        mock_db.log_actions_bulk.assert_called_once()
     
     def test_unsubscribe_with_unsubscribe_links(self, service, mock_chain):
         """Test that unsubscribe_links field is also checked."""
@@ -243,4 +246,47 @@ class TestUnsubscribeService:
         
         assert results1['success_count'] == 1
         assert results2['success_count'] == 1
-
+    
+    def test_whitelist_loaded_once_per_run(self, service, mock_db):
+        """Test the whitelist is fetched in one query instead of per sender."""
+        senders = [{'sender': f'spam{i}@example.com', 'list_unsubscribe': '<https://ex.com/unsub>'}
+                   for i in range(5)]
+        
+        service.unsubscribe_from_senders(senders)
+        
+        mock_db.get_whitelist_set.assert_called_once_with([s['sender'] for s in senders])
+        mock_db.check_whitelist.assert_not_called()
+    
+    def test_whitelist_falls_back_to_per_sender_check(self, service, mock_db, mock_chain):
+        """Test whitelisted senders are still skipped if the bulk lookup fails."""
+        mock_db.get_whitelist_set.side_effect = Exception("Database locked")
+        mock_db.check_whitelist.side_effect = lambda email: email == 'safe@example.com'
+        
+        senders = [
+            {'sender': 'safe@example.com', 'list_unsubscribe': '<https://ex.com/unsub>'},
+            {'sender': 'spam@example.com', 'list_unsubscribe': '<https://ex.com/unsub>'},
+        ]
+        
+        results = service.unsubscribe_from_senders(senders)
+        
+        assert results['skipped_count'] == 1
+        assert results['successful_senders'] == ['spam@example.com']
+        assert mock_chain.execute.call_count == 1
+    
+    def test_failed_attempts_logged_in_one_batch(self, service, mock_db):
+        """Test all failure rows are written together after the loop."""
+        senders = [{'sender': 'a@example.com'}, {'sender': 'b@example.com'}]
+        
+        service.unsubscribe_from_senders(senders)
+        
+        mock_db.log_action.assert_not_called()
+        rows = mock_db.log_actions_bulk.call_args[0][0]
+        assert [row[0] for row in rows] == ['a@example.com', 'b@example.com']
+    
+    def test_log_flush_error_does_not_fail_run(self, service, mock_db):
+        """Test a failed history write is logged rather than raised."""
+        mock_db.log_actions_bulk.side_effect = Exception("Disk full")
+        
+        results = service.unsubscribe_from_senders([{'sender': 'a@example.com'}])
+        
+        assert results['skipped_count'] == 1
@@ -0,0 +1,287 @@
+"""
+Unit tests for FilterableTreeview filtering logic.
+
+Uses a fake Treeview so no Tkinter root is needed.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from src.ui.filterable_treeview import FilterableTreeview
+from src.ui.noreply_table import NoReplyTable
+
+
+class FakeVar:
+    """Stand-in for tk.StringVar."""
+    
+    def __init__(self, value=''):
+        self.value = value
+    
+    def get(self):
+        """Return the current text."""
+        return self.value
+    
+    def set(self, value):
+        """Replace the current text."""
+        self.value = value
+
+
+class FakeTree:
+    """Stand-in for ttk.Treeview tracking which rows are attached."""
+    
+    def __init__(self, columns=('sender', 'count', 'status')):
+        self.columns = columns
+        self.rows = {}
+        self.children = []
+        self.selected = []
+        self.scheduled = {}
+    
+    def __getitem__(self, key):
+        return self.columns
+    
+    def insert(self, parent, index, values=(), tags=()):
+        item_id = f"I{len(self.rows) + 1}"
+        self.rows[item_id] = values
+        self.children.append(item_id)
+        return item_id
+    
+    def get_children(self, item=''):
+        return tuple(self.children)
+    
+    def detach(self, *items):
+        self.children = [i for i in self.children if i not in items]
+    
+    def reattach(self, item, parent, index):
+        if item not in self.rows:
+            raise KeyError(item)
+        self.children = [i for i in self.children if i != item] + [item]
+    
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+        self.children = [i for i in self.children if i not in items]
+    
+    def selection(self):
+        return tuple(self.selected)
+    
+    def selection_remove(self, *items):
+        self.selected = [i for i in self.selected if i not in items]
+    
+    def after(self, ms, callback):
+        timer_id = f"after#{len(self.scheduled)}"
+        self.scheduled[timer_id] = callback
+        return timer_id
+    
+    def after_cancel(self, timer_id):
+        del self.scheduled[timer_id]
+    
+    def run_scheduled(self):
+        """Fire every pending after() callback."""
+        callbacks, self.scheduled = list(self.scheduled.values()), {}
+        for callback in callbacks:
+            callback()
+
+
+class SenderRows(FilterableTreeview):
+    """Minimal table using the mixin with sender/count/status columns."""
+    
+    def __init__(self):
+        FilterableTreeview.__init__(self)
+        self.tree = FakeTree()
+        self.tree_ref = self.tree
+        self.sender_data = {}
+        self.filter_vars = {col: FakeVar() for col in ('sender', 'count', 'status')}
+        self.to_values_calls = 0
+    
+    def populate(self, senders):
+        """Insert rows the way the real tables do, then store them."""
+        for sender in senders:
+            item_id = self.tree.insert('', 'end', values=self._data_to_values(sender))
+            self.sender_data[item_id] = sender
+        self.to_values_calls = 0
+        self.store_all_items()
+    
+    def _data_to_values(self, data):
+        self.to_values_calls += 1
+        return (data['sender'], data['count'], data.get('status', 'Ready'))
+
+
+class TestFilterableTreeview:
+    """Test suite for FilterableTreeview.apply_filters."""
+    
+    @pytest.fixture
+    def table(self):
+        """Create a table holding three senders."""
+        table = SenderRows()
+        table.populate([
+            {'sender': 'News@Example.com', 'count': 12},
+            {'sender': 'deals@shop.com', 'count': 3},
+            {'sender': 'alerts@example.com', 'count': 120, 'status': 'Done'},
+        ])
+        return table
+    
+    def shown(self, table):
+        """Senders currently attached to the tree, in display order."""
+        return [table.sender_data[item_id]['sender'] for item_id in table.tree.get_children()]
+    
+    def test_filters_match_case_insensitive_substrings(self, table):
+        """Test every active filter must match its own column."""
+        table.filter_vars['sender'].set('EXAMPLE')
+        table.apply_filters()
+        assert self.shown(table) == ['News@Example.com', 'alerts@example.com']
+        
+        table.filter_vars['count'].set('12')
+        table.apply_filters()
+        assert self.shown(table) == ['News@Example.com', 'alerts@example.com']
+        
+        table.filter_vars['status'].set('done')
+        table.apply_filters()
+        assert self.shown(table) == ['alerts@example.com']
+    
+    def test_row_values_cached_between_keystrokes(self, table):
+        """Test rows are formatted once until items are stored again."""
+        for text in ('e', 'ex', 'exa'):
+            table.filter_vars['sender'].set(text)
+            table.apply_filters()
+        
+        assert table.to_values_calls == 3
+        
+        table.invalidate_filter_cache()
+        table.all_items[1]['status'] = 'Unsubscribed'
+        table.filter_vars['sender'].set('')
+        table.filter_vars['status'].set('unsub')
+        table.apply_filters()
+        
+        assert self.shown(table) == ['deals@shop.com']
+    
+    def test_filtering_reuses_item_ids(self, table):
+        """Test rows are detached and reattached instead of re-inserted."""
+        item_ids = set(table.tree.rows)
+        
+        table.filter_vars['sender'].set('shop')
+        table.apply_filters()
+        assert self.shown(table) == ['deals@shop.com']
+        
+        table.clear_filters()
+        assert self.shown(table) == ['News@Example.com', 'deals@shop.com', 'alerts@example.com']
+        assert set(table.tree.rows) == item_ids
+        assert len(table.sender_data) == 3
+    
+    def test_filter_deselects_hidden_rows(self, table):
+        """Test rows hidden by a filter are removed from the selection."""
+        table.tree.selected = list(table.tree.rows)
+        
+        table.filter_vars['sender'].set('shop')
+        table.apply_filters()
+        
+        assert [table.sender_data[i]['sender'] for i in table.tree.selection()] == ['deals@shop.com']
+    
+    def test_store_all_items_keeps_detached_rows(self, table):
+        """Test storing while filtered still tracks the hidden rows."""
+        table.filter_vars['sender'].set('shop')
+        table.apply_filters()
+        table.store_all_items()
+        
+        table.clear_filters()
+        assert sorted(self.shown(table)) == ['News@Example.com', 'alerts@example.com', 'deals@shop.com']
+    
+    def test_filter_changes_are_debounced(self, table, mocker):
+        """Test a burst of keystrokes schedules a single filter pass."""
+        apply_filters = mocker.spy(table, 'apply_filters')
+        for text in ('s', 'sh', 'sho', 'shop'):
+            table.filter_vars['sender'].set(text)
+            table._on_filter_change('sender')
+        
+        assert apply_filters.call_count == 0
+        assert len(table.tree.scheduled) == 1
+        
+        table.tree.run_scheduled()
+        
+        assert apply_filters.call_count == 1
+        assert self.shown(table) == ['deals@shop.com']
+    
+    def test_clear_filters_cancels_pending_filter(self, table):
+        """Test clearing filters drops a filter still waiting to run."""
+        table.filter_vars['sender'].set('shop')
+        table._on_filter_change('sender')
+        
+        table.clear_filters()
+        
+        assert table.tree.scheduled == {}
+        assert len(self.shown(table)) == 3
+    
+    def test_narrowing_filter_rechecks_previous_matches_only(self, table, mocker):
+        """Test typing more text only scans rows that matched before."""
+        table.filter_vars['sender'].set('example')
+        table.apply_filters()
+        
+        get_rows = mocker.spy(table, '_get_filter_rows')
+        table.filter_vars['sender'].set('example.com')
+        table.filter_vars['count'].set('12')
+        table.apply_filters()
+        
+        assert get_rows.call_count == 0
+        assert self.shown(table) == ['News@Example.com', 'alerts@example.com']
+        
+        # Loosening a filter goes back to every row
+        table.filter_vars['count'].set('')
+        table.filter_vars['sender'].set('com')
+        table.apply_filters()
+        
+        assert get_rows.call_count == 1
+        assert self.shown(table) == ['News@Example.com', 'deals@shop.com', 'alerts@example.com']
+    
+    def test_cache_invalidation_resets_narrowing(self, table):
+        """Test a row whose data changed can match a narrower filter."""
+        table.filter_vars['status'].set('do')
+        table.apply_filters()
+        assert self.shown(table) == ['alerts@example.com']
+        
+        table.all_items[1]['status'] = 'Done'
+        table.invalidate_filter_cache()
+        table.filter_vars['status'].set('don')
+        table.apply_filters()
+        
+        assert self.shown(table) == ['deals@shop.com', 'alerts@example.com']
+    
+    def test_restore_does_not_reformat_rows(self, table):
+        """Test clearing and re-applying filters reuses the formatted rows."""
+        table.filter_vars['sender'].set('shop')
+        table.apply_filters()
+        table.clear_filters()
+        table.filter_vars['count'].set('1')
+        table.apply_filters()
+        table.clear_filters()
+        
+        assert table.to_values_calls == 3
+    
+    def test_visible_items_exclude_filtered_rows(self, table):
+        """Test only rows left attached by the filter are reported."""
+        table.filter_vars['sender'].set('example')
+        table.apply_filters()
+        
+        assert [d['sender'] for d in table.get_visible_items()] == [
+            'News@Example.com', 'alerts@example.com'
+        ]
+        assert len(table.sender_data) == 3
+
+
+class TestNoReplyTableFiltering:
+    """Test NoReplyTable.get_all honours active filters."""
+    
+    def test_get_all_skips_rows_hidden_by_filter(self):
+        """Test "delete all" only sees senders the filter leaves visible."""
+        table = NoReplyTable.__new__(NoReplyTable)
+        FilterableTreeview.__init__(table)
+        table.tree = FakeTree(columns=('sender', 'count', 'unread', 'score'))
+        table.sender_data = {}
+        table.logger = MagicMock()
+        table.filter_vars = {'sender': FakeVar()}
+        table.populate([
+            {'sender': 'noreply@shop.com', 'total_count': 4},
+            {'sender': 'no-reply@bank.com', 'total_count': 2},
+        ])
+        
+        table.filter_vars['sender'].set('shop')
+        table.apply_filters()
+        
+        assert [s['sender'] for s in table.get_all()] == ['noreply@shop.com']
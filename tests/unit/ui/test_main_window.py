@@ -71,4 +71,21 @@ class TestMainWindowServiceFactoryInjection:
         # Verify factory's db reference matches MainWindow's db
         assert window.service_factory.db is window.db
         assert window.service_factory.db is mock_db
-
+    
+    @patch('src.ui.main_window.MainWindow._create_menu_bar')
+    @patch('src.ui.main_window.MainWindow._create_main_content')
+    @patch('src.ui.main_window.MainWindow._create_status_bar')
+    @patch('src.ui.main_window.MainWindow._center_window')
+    def test_close_stops_token_refresher(self, mock_center, mock_status, mock_content, mock_menu):
+        """Test closing the window stops the OAuth background refresher."""
+        from src.ui.main_window import MainWindow
+        
+        mock_root = Mock()
+        window = MainWindow(mock_root, Mock())
+        window.oauth_manager = Mock()
+        
+        mock_root.protocol.assert_called_once_with("WM_DELETE_WINDOW", window._on_close)
+        window._on_close()
+        
+        window.oauth_manager.stop_refresher.assert_called_once()
+        mock_root.destroy.assert_called_once()